@@ -0,0 +1,250 @@
+from abc import ABC
+import abc
+import asyncio
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Generic, List, Optional, TypeVar
+
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import (
+    ET,
+    BulkWriteResult,
+    Filter,
+    InMemorySearchableRepository,
+    SearchableRepositoryInterface,
+    SearchParams,
+    SearchResult
+)
+from __seedwork.domain.value_objects import UniqueEntityId
+
+Input = TypeVar('Input')
+Output = TypeVar('Output')
+Result = TypeVar('Result')
+
+
+class AsyncRepositoryInterface(Generic[ET], ABC):
+
+    @abc.abstractmethod
+    async def insert(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def find_all(self) -> List[ET]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def update(self, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def delete(self, entity_id: str | UniqueEntityId) -> None:
+        raise NotImplementedError()
+
+    async def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        try:
+            await self.find_by_id(entity_id)
+        except NotFoundException:
+            return False
+
+        return True
+
+    async def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        for entity in entities:
+            await self.insert(entity)
+        return BulkWriteResult(succeeded=len(entities))
+
+    async def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        errors = {}
+        for position, entity in enumerate(entities):
+            try:
+                await self.update(entity)
+            except NotFoundException as error:
+                errors[position] = error
+        return BulkWriteResult(succeeded=len(entities) - len(errors), errors=errors)
+
+    async def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        errors = {}
+        for position, entity_id in enumerate(entity_ids):
+            try:
+                await self.delete(entity_id)
+            except NotFoundException as error:
+                errors[position] = error
+        return BulkWriteResult(succeeded=len(entity_ids) - len(errors), errors=errors)
+
+
+class AsyncSearchableRepositoryInterface(
+    Generic[ET, Input, Output],
+    AsyncRepositoryInterface[ET],
+    ABC
+):
+    sortable_fields: List[str] = []
+
+    @abc.abstractmethod
+    async def search(self, input_params: Input) -> Output:
+        raise NotImplementedError()
+
+    async def count(self, filter_param: Optional[Any] = None) -> int:
+        params_class = getattr(self, 'SearchParams', SearchParams)
+        return (await self.search(params_class(filter=filter_param, per_page=1))).total
+
+    async def iter_all(self) -> AsyncIterator[ET]:
+        for entity in await self.find_all():
+            yield entity
+
+    async def iter_search(self, input_params: Input) -> AsyncIterator[ET]:
+        for entity in (await self.search(input_params)).items:
+            yield entity
+
+
+@dataclass(slots=True)
+class AsyncInMemorySearchableRepository(
+    Generic[ET, Filter],
+    AsyncSearchableRepositoryInterface[
+        ET,
+        SearchParams[Filter],
+        SearchResult[ET, Filter]
+    ]
+):
+
+    # the entities live in the wrapped repository, whose writes and lookups
+    # run without awaiting; searches are driven one chunk at a time and give
+    # the event loop back in between, writes wait for running searches and
+    # searches starting while a write waits queue behind it
+    repository: InMemorySearchableRepository[ET, Filter]
+    _searches: int = field(default=0, init=False, repr=False, compare=False)
+    _writers: int = field(default=0, init=False, repr=False, compare=False)
+    # made by the running loop on first use, see _condition
+    _idle: Optional[asyncio.Condition] = field(
+        default=None, init=False, repr=False, compare=False)
+    _loop: Optional[asyncio.AbstractEventLoop] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    async def insert(self, entity: ET) -> None:
+        await self._write(self.repository.insert, entity)
+
+    async def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        return self.repository.find_by_id(entity_id)
+
+    async def find_all(self) -> List[ET]:
+        return self.repository.find_all()
+
+    async def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return self.repository.exists(entity_id)
+
+    async def update(self, entity: ET) -> None:
+        await self._write(self.repository.update, entity)
+
+    async def delete(self, entity_id: str | UniqueEntityId) -> None:
+        await self._write(self.repository.delete, entity_id)
+
+    async def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        return await self._write(self.repository.insert_many, entities)
+
+    async def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        return await self._write(self.repository.update_many, entities)
+
+    async def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        return await self._write(self.repository.delete_many, entity_ids)
+
+    async def search(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
+        idle = self._condition()
+        if self._writers:
+            async with idle:
+                await idle.wait_for(lambda: not self._writers)
+
+        steps = self.repository.search_steps(input_params)
+        self._searches += 1
+        try:
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as stop:
+                    return stop.value
+                await asyncio.sleep(0)
+        finally:
+            self._searches -= 1
+            if not self._searches:
+                async with idle:
+                    idle.notify_all()
+
+    async def count(self, filter_param: Optional[Filter] = None) -> int:
+        # a count only walks indexes or a filter over the items, like a
+        # lookup it runs without giving the event loop back
+        return self.repository.count(filter_param)
+
+    async def _write(self, write: Callable[..., Result], *args) -> Result:
+        idle = self._condition()
+        self._writers += 1
+        try:
+            async with idle:
+                await idle.wait_for(lambda: not self._searches)
+                return write(*args)
+        finally:
+            self._writers -= 1
+            if not self._writers:
+                async with idle:
+                    idle.notify_all()
+
+    def _condition(self) -> asyncio.Condition:
+        # a condition belongs to the loop it is first awaited in, so one is
+        # made for each loop the repository is used from
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._idle = asyncio.Condition()
+            self._loop = loop
+
+        return self._idle
+
+
+@dataclass(slots=True)
+class ExecutorSearchableRepository(
+    Generic[ET, Input, Output],
+    AsyncSearchableRepositoryInterface[ET, Input, Output]
+):
+
+    # every call runs on the executor, the default one of the loop when
+    # None, so the wrapped repository must be safe to call from several
+    # threads at once
+    repository: SearchableRepositoryInterface[ET, Input, Output]
+    executor: Optional[Executor] = None
+
+    async def insert(self, entity: ET) -> None:
+        await self._run(self.repository.insert, entity)
+
+    async def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        return await self._run(self.repository.find_by_id, entity_id)
+
+    async def find_all(self) -> List[ET]:
+        return await self._run(self.repository.find_all)
+
+    async def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return await self._run(self.repository.exists, entity_id)
+
+    async def update(self, entity: ET) -> None:
+        await self._run(self.repository.update, entity)
+
+    async def delete(self, entity_id: str | UniqueEntityId) -> None:
+        await self._run(self.repository.delete, entity_id)
+
+    async def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        return await self._run(self.repository.insert_many, entities)
+
+    async def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        return await self._run(self.repository.update_many, entities)
+
+    async def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        return await self._run(self.repository.delete_many, entity_ids)
+
+    async def search(self, input_params: Input) -> Output:
+        return await self._run(self.repository.search, input_params)
+
+    async def count(self, filter_param: Optional[Any] = None) -> int:
+        return await self._run(self.repository.count, filter_param)
+
+    async def _run(self, call: Callable[..., Result], *args) -> Result:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, call, *args)
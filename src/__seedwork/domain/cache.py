@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import time
+from typing import Any, Callable, Generic, Hashable, Iterator, Optional, Tuple, TypeVar
+
+Key = TypeVar('Key', bound=Hashable)
+Value = TypeVar('Value')
+
+_MISSING = object()
+
+
+@dataclass(frozen=True, slots=True)
+class CacheInfo:
+    hits: int
+    misses: int
+    max_size: int
+    size: int
+    evictions: int = 0
+    expirations: int = 0
+    # estimated bytes held by the values, 0 when the cache has no size_of
+    memory: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(slots=True)
+class LRUCache(Generic[Key, Value]):
+
+    max_size: int = 128
+    # seconds an entry is served for, None keeps it until it is evicted
+    ttl: Optional[float] = None
+    size_of: Optional[Callable[[Value], int]] = field(default=None, repr=False)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    expirations: int = field(default=0, init=False)
+    memory: int = field(default=0, init=False)
+    # every value is kept with its expiry time and its size
+    _entries: 'OrderedDict[Key, Tuple[Value, float, int]]' = field(
+        default_factory=OrderedDict, init=False, repr=False)
+
+    def get(self, key: Key, default: Any = None) -> Value | Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Key, default: Any = None) -> Value | Any:
+        # a lookup that is neither counted nor makes the entry recent
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING or (entry[1] and entry[1] <= time.monotonic()):
+            return default
+
+        return entry[0]
+
+    def set(self, key: Key, value: Value) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else 0.0
+        size = self.size_of(value) if self.size_of is not None else 0
+        self._entries[key] = (value, expires_at, size)
+        self.memory += size
+        if len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def pop(self, key: Key, default: Any = None) -> Value | Any:
+        if key not in self._entries:
+            return default
+
+        return self._remove(key)
+
+    def items(self) -> Iterator[Tuple[Key, Value]]:
+        # a snapshot, so entries can be popped while going through it
+        return iter([(key, entry[0]) for key, entry in self._entries.items()])
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.memory = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            max_size=self.max_size,
+            size=len(self._entries),
+            evictions=self.evictions,
+            expirations=self.expirations,
+            memory=self.memory
+        )
+
+    def _remove(self, key: Key) -> Value:
+        value, _, size = self._entries.pop(key)
+        self.memory -= size
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
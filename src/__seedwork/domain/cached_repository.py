@@ -0,0 +1,292 @@
+import copy
+from dataclasses import dataclass, field, fields
+import sys
+from typing import Any, Dict, Generic, Iterable, Iterator, List, Optional, Tuple
+
+from __seedwork.domain.cache import CacheInfo, LRUCache
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import (
+    ET,
+    RELEVANCE_SORT,
+    BulkWriteResult,
+    Filter,
+    SearchableRepositoryInterface,
+    SearchParams,
+    SearchResult
+)
+from __seedwork.domain.value_objects import UniqueEntityId
+
+# the state before a write when the cache has no copy of it to trust
+_UNKNOWN: Any = object()
+
+
+def _entity_size(entity: ET) -> int:
+    return sys.getsizeof(entity) + sum(
+        sys.getsizeof(getattr(entity, entity_field.name)) for entity_field in fields(entity))
+
+
+def _row_size(row: Dict[str, Any]) -> int:
+    return sys.getsizeof(row) + sum(map(sys.getsizeof, row.values()))
+
+
+def _search_size(entry: Tuple[SearchResult, Optional[Dict[str, Any]]]) -> int:
+    result, page_states = entry
+    if result.items and isinstance(result.items[0], dict):
+        items_size = sum(map(_row_size, result.items))
+    else:
+        # the items and the copies of their states
+        items_size = 2 * sum(map(_entity_size, result.items))
+    return sys.getsizeof(result) + sys.getsizeof(result.items) + \
+        sys.getsizeof(page_states) + items_size
+
+
+@dataclass(slots=True)
+class CachedSearchableRepository(
+    Generic[ET, Filter],
+    SearchableRepositoryInterface[
+        ET,
+        SearchParams[Filter],
+        SearchResult[ET, Filter]
+    ]
+):
+
+    # find_by_id and search are served from bounded LRU caches in front of
+    # the wrapped repository. A write made through here drops the entry of
+    # its id and the cached pages it can change: every page whose filter
+    # matches the entity before or after the write, or, for an update that
+    # keeps both the match and the sort values, only the pages holding it;
+    # pages ranked by relevance are dropped on every write.
+    # Writes made to the wrapped repository directly are only seen once
+    # the entries expire. Entities are copied in and out of the id cache,
+    # and the cached pages keep a copy of the entities they hold, so a
+    # caller changing one of them in place cannot change what the cache
+    # knows they were
+    repository: SearchableRepositoryInterface[ET, SearchParams[Filter], SearchResult[ET, Filter]]
+    max_entities: int = 10_000
+    max_searches: int = 1_000
+    ttl: Optional[float] = 60.0
+    _entities: LRUCache[str, ET] = field(init=False, repr=False)
+    # cached pages with the states of the entities they hold by id, the
+    # states are None for projections and the whole mapping is None for
+    # projections without id
+    _searches: LRUCache[tuple, Tuple[SearchResult[ET, Filter], Optional[Dict[str, Any]]]] = \
+        field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._entities = LRUCache(self.max_entities, self.ttl, _entity_size)
+        self._searches = LRUCache(self.max_searches, self.ttl, _search_size)
+
+    @property
+    def sortable_fields(self) -> List[str]:
+        return self.repository.sortable_fields
+
+    def insert(self, entity: ET) -> None:
+        self.repository.insert(entity)
+        self._invalidate([(None, entity)])
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        id_str = str(entity_id)
+        entity = self._entities.get(id_str)
+        if entity is None:
+            entity = self.repository.find_by_id(entity_id)
+            self._entities.set(id_str, copy.copy(entity))
+            return entity
+
+        return copy.copy(entity)
+
+    def find_all(self) -> List[ET]:
+        return self.repository.find_all()
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return self._entities.peek(str(entity_id)) is not None or \
+            self.repository.exists(entity_id)
+
+    def update(self, entity: ET) -> None:
+        old = self._cached_or_found(entity.id, entity) if self._searches else None
+        self.repository.update(entity)
+        self._invalidate([(old, entity)], entity_ids=[entity.id])
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        id_str = str(entity_id)
+        old = self._cached_or_found(id_str) if self._searches else None
+        self.repository.delete(entity_id)
+        self._invalidate([(old, None)], entity_ids=[id_str])
+
+    def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        result = self.repository.insert_many(entities)
+        self._invalidate([(None, entity) for entity in entities])
+        return result
+
+    def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        id_strs = [entity.id for entity in entities]
+        olds = self._known_states(id_strs)
+        result = self.repository.update_many(entities)
+        self._invalidate(
+            [
+                (olds.get(entity.id, _UNKNOWN), entity)
+                for position, entity in enumerate(entities) if position not in result.errors
+            ],
+            entity_ids=id_strs
+        )
+        return result
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        id_strs = list(map(str, entity_ids))
+        olds = self._known_states(id_strs)
+        result = self.repository.delete_many(entity_ids)
+        self._invalidate(
+            [
+                (olds.get(entity_id, _UNKNOWN), None)
+                for position, entity_id in enumerate(id_strs) if position not in result.errors
+            ],
+            entity_ids=id_strs
+        )
+        return result
+
+    def search(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
+        key = self._search_key(input_params)
+        entry = self._searches.get(key)
+        if entry is None:
+            result = self.repository.search(input_params)
+            entry = (result, self._page_states(input_params, result))
+            self._searches.set(key, entry)
+
+        return entry[0]
+
+    def count(self, filter_param: Optional[Filter] = None) -> int:
+        return self.repository.count(filter_param)
+
+    def iter_all(self) -> Iterator[ET]:
+        return self.repository.iter_all()
+
+    def iter_search(self, input_params: SearchParams[Filter]) -> Iterator[ET]:
+        return self.repository.iter_search(input_params)
+
+    def entity_cache_info(self) -> CacheInfo:
+        return self._entities.info()
+
+    def search_cache_info(self) -> CacheInfo:
+        return self._searches.info()
+
+    def clear_cache(self) -> None:
+        self._entities.clear()
+        self._searches.clear()
+
+    def _matches_filter(self, filter_param: Optional[Filter], entity: ET) -> bool:
+        # whether an entity is a result of a search with this filter; the
+        # default cannot tell, so every cached page is dropped on writes
+        return True
+
+    def _cached_or_found(self, entity_id: str, new: Optional[ET] = None) -> Optional[ET]:
+        # the version the cached pages may have been built from, None when
+        # the entity does not exist and the write is about to fail
+        olds = self._known_states([entity_id])
+        if entity_id in olds:
+            return olds[entity_id]
+
+        try:
+            found = self.repository.find_by_id(entity_id)
+        except NotFoundException:
+            return None
+
+        # a repository keeping its entities in memory hands back the one
+        # being written, changed in place, which tells nothing of before
+        return _UNKNOWN if found is new else copy.copy(found)
+
+    def _known_states(self, entity_ids: List[str]) -> Dict[str, ET]:
+        # the copies the cache holds of these entities, from the id cache
+        # or from the cached pages, in a single pass over the pages
+        if not self._searches:
+            return {}
+
+        wanted = set(entity_ids)
+        states = {}
+        for _, (_, page_states) in self._searches.items():
+            if not page_states:
+                continue
+
+            for entity_id in wanted.intersection(page_states):
+                state = page_states[entity_id]
+                if state is not None:
+                    states[entity_id] = state
+
+        for entity_id in wanted:
+            entity = self._entities.peek(entity_id)
+            if entity is not None:
+                states[entity_id] = entity
+        return states
+
+    def _invalidate(
+            self,
+            changes: Iterable[Tuple[Optional[ET], Optional[ET]]],
+            entity_ids: Iterable[str] = ()
+        ) -> None:
+        for entity_id in entity_ids:
+            self._entities.pop(entity_id)
+
+        if not self._searches:
+            return
+
+        sortable_fields = self.sortable_fields
+        changed = []
+        for old, new in changes:
+            if old is _UNKNOWN:
+                # any cached page may have counted the entity before
+                self._searches.clear()
+                return
+
+            # an update keeping every sort value keeps the entity in place,
+            # only the page holding it changes unless a filter match changes
+            in_place = old is not None and new is not None and all(
+                getattr(old, name) == getattr(new, name) for name in sortable_fields)
+            changed.append((old, new, in_place))
+
+        if not changed:
+            return
+
+        for key, (_, page_states) in self._searches.items():
+            filter_param = key[0]
+            if key[3] == RELEVANCE_SORT:
+                # every write changes how rare the words are, and so the
+                # scores of every ranked page
+                self._searches.pop(key)
+                continue
+
+            for old, new, in_place in changed:
+                old_matches = old is not None and self._matches_filter(filter_param, old)
+                new_matches = new is not None and self._matches_filter(filter_param, new)
+                if in_place and old_matches == new_matches:
+                    if page_states is None or new.id in page_states:
+                        self._searches.pop(key)
+                        break
+                    continue
+
+                if old_matches or new_matches:
+                    self._searches.pop(key)
+                    break
+
+    @staticmethod
+    def _page_states(
+            input_params: SearchParams[Filter],
+            result: SearchResult[ET, Filter]
+        ) -> Optional[Dict[str, Any]]:
+        if input_params.fields is None:
+            return {item.id: copy.copy(item) for item in result.items}
+
+        if 'id' in input_params.fields:
+            return dict.fromkeys(row['id'] for row in result.items)
+
+        return None
+
+    @staticmethod
+    def _search_key(input_params: SearchParams[Filter]) -> tuple:
+        return (
+            input_params.filter,
+            input_params.page,
+            input_params.per_page,
+            input_params.sort,
+            input_params.sort_dir,
+            input_params.after,
+            input_params.before,
+            input_params.fields
+        )
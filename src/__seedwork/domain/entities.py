@@ -1,6 +1,8 @@
 from abc import ABC
-from dataclasses import asdict, dataclass, field
-from typing import Any
+from dataclasses import asdict, dataclass, field, fields
+import functools
+from operator import attrgetter
+from typing import Any, Callable, Dict, Sequence, Tuple
 
 from __seedwork.domain.value_objects import UniqueEntityId
 
@@ -21,8 +23,58 @@ class Entity(ABC):
         object.__setattr__(self, name, value)
         return self
 
+    def _change(self, **values: Any) -> None:
+        # how mutators write: only the fields changed are validated, and none
+        # is set unless all of them are valid; construction keeps checking
+        # the whole entity
+        self._validate_fields(values)
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def _validate_fields(self, values: Dict[str, Any]) -> None:
+        # entities with rules check the changed values here
+        pass
+
     def to_dict(self):
         entity_dict = asdict(self)
         entity_dict.pop('unique_entity_id')
         entity_dict['id'] = self.id
         return entity_dict
+
+    @classmethod
+    def projected_fields(cls, field_names: Sequence[str]) -> Tuple[str, ...]:
+        # the names to_dict would return among the ones asked for, in the
+        # order asked; unknown names are left out
+        return _projected_fields(cls, tuple(field_names))
+
+    @classmethod
+    def projection(cls, field_names: Sequence[str]) -> Callable[['Entity'], Dict[str, Any]]:
+        # a function reading just these fields of an entity into a dict,
+        # without the deep copy of to_dict
+        return _projection(cls, tuple(field_names))
+
+
+@functools.lru_cache(maxsize=256)
+def _projected_fields(entity_class: type, field_names: Tuple[str, ...]) -> Tuple[str, ...]:
+    known = {entity_field.name for entity_field in fields(entity_class)}
+    known.discard('unique_entity_id')
+    known.add('id')
+    return tuple(name for name in dict.fromkeys(field_names) if name in known)
+
+
+@functools.lru_cache(maxsize=256)
+def _projection(
+        entity_class: type,
+        field_names: Tuple[str, ...]
+    ) -> Callable[[Entity], Dict[str, Any]]:
+    names = _projected_fields(entity_class, field_names)
+    if not names:
+        return lambda entity: {}
+
+    if len(names) == 1:
+        name = names[0]
+        getter = attrgetter(name)
+        return lambda entity: {name: getter(entity)}
+
+    getter = attrgetter(*names)
+    return lambda entity: dict(zip(names, getter(entity)))
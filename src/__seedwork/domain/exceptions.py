@@ -1,5 +1,5 @@
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
 
 if TYPE_CHECKING:
@@ -21,3 +21,11 @@ class EntityValidationException(Exception):
 
 class NotFoundException(Exception):
     pass
+
+class UndoFailedException(Exception):
+    # raised from the error that failed a commit when some of the writes it
+    # had applied could not be undone
+    errors: List[Exception]
+    def __init__(self, errors: List[Exception]) -> None:
+        self.errors = errors
+        super().__init__('Failed to undo the writes of a failed commit')
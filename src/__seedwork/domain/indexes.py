@@ -0,0 +1,490 @@
+from abc import ABC
+import abc
+import bisect
+from dataclasses import dataclass, field
+import functools
+import heapq
+from itertools import chain, dropwhile, groupby
+import math
+from operator import itemgetter
+import re
+from typing import (
+    AbstractSet, Any, Dict, FrozenSet, Generic, Iterable, Iterator, List, Optional, Set, Tuple,
+    TypeVar
+)
+import unicodedata
+
+from __seedwork.domain.entities import Entity
+
+ET = TypeVar('ET', bound=Entity)
+
+
+class EntityIndex(Generic[ET], ABC):
+
+    @abc.abstractmethod
+    def rebuild(self, ids: List[str], items: List[ET]) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def add(self, entity_id: str, entity: ET) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def remove(self, entity_id: str) -> None:
+        raise NotImplementedError()
+
+    def replace(self, entity_id: str, entity: ET) -> None:
+        self.remove(entity_id)
+        self.add(entity_id, entity)
+
+
+@dataclass(slots=True)
+class SortedIndex(EntityIndex[ET]):
+
+    field_name: str
+    # (value, sequence, entity): the insertion sequence breaks ties the same
+    # way a stable sort over the repository items does
+    entries: List[Tuple[Any, int, ET]] = field(default_factory=lambda: [])
+    keys: Dict[str, Tuple[Any, int]] = field(default_factory=lambda: {})
+    next_sequence: int = 0
+
+    def rebuild(self, ids: List[str], items: List[ET]) -> None:
+        field_name = self.field_name
+        self.entries = sorted(
+            (getattr(item, field_name), sequence, item)
+            for sequence, item in enumerate(items)
+        )
+        self.keys = {
+            ids[sequence]: (value, sequence) for value, sequence, _ in self.entries
+        }
+        self.next_sequence = len(items)
+
+    def add(self, entity_id: str, entity: ET) -> None:
+        self._insert(entity_id, entity, self.next_sequence)
+        self.next_sequence += 1
+
+    def remove(self, entity_id: str) -> None:
+        key = self.keys.pop(entity_id)
+        del self.entries[bisect.bisect_left(self.entries, key)]
+
+    def replace(self, entity_id: str, entity: ET) -> None:
+        key = self.keys[entity_id]
+        entry = self.entries[bisect.bisect_left(self.entries, key)]
+        self.remove(entity_id)
+        try:
+            self._insert(entity_id, entity, key[1])
+        except TypeError:
+            # a value that does not compare with the others keeps the old entry
+            bisect.insort(self.entries, entry)
+            self.keys[entity_id] = key
+            raise
+
+    def iter_entities(self, descending: bool = False) -> Iterator[ET]:
+        if not descending:
+            return map(itemgetter(2), self.entries)
+
+        return self._flip_runs(reversed(self.entries))
+
+    def iter_from(
+            self,
+            key: Tuple[Any, int],
+            descending: bool = False,
+            forward: bool = True
+        ) -> Iterator[ET]:
+        # yields the entities after the (value, sequence) key in display
+        # order, or the ones before it starting from the closest when not
+        # forward; only index ranges are built, so deep keys cost the same
+        entries = self.entries
+        pair = itemgetter(0, 1)
+        if not descending:
+            if forward:
+                start = bisect.bisect_right(entries, key, key=pair)
+                return self._at(range(start, len(entries)))
+
+            end = bisect.bisect_left(entries, key, key=pair)
+            return self._at(range(end - 1, -1, -1))
+
+        run_start = bisect.bisect_left(entries, key[0], key=itemgetter(0))
+        run_end = bisect.bisect_right(entries, key[0], key=itemgetter(0))
+        if forward:
+            ties = range(bisect.bisect_right(entries, key, key=pair), run_end)
+            rest = range(run_start - 1, -1, -1)
+        else:
+            ties = range(bisect.bisect_left(entries, key, key=pair) - 1, run_start - 1, -1)
+            rest = range(run_end, len(entries))
+
+        return chain(self._at(ties), self._flip_runs(map(entries.__getitem__, rest)))
+
+    def between(self, low: Any = None, high: Any = None) -> List[Tuple[Any, int, ET]]:
+        # the entries whose value lies in [low, high], None leaving a side open
+        start, end = self._bounds(low, high)
+        return self.entries[start:end]
+
+    def count_between(self, low: Any = None, high: Any = None) -> int:
+        start, end = self._bounds(low, high)
+        return max(end - start, 0)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _bounds(self, low: Any, high: Any) -> Tuple[int, int]:
+        value = itemgetter(0)
+        start = 0 if low is None else bisect.bisect_left(self.entries, low, key=value)
+        end = len(self.entries) if high is None else \
+            bisect.bisect_right(self.entries, high, key=value)
+        return start, end
+
+    def _insert(self, entity_id: str, entity: ET, sequence: int) -> None:
+        value = getattr(entity, self.field_name)
+        bisect.insort(self.entries, (value, sequence, entity))
+        self.keys[entity_id] = (value, sequence)
+
+    def _at(self, positions: range) -> Iterator[ET]:
+        entries = self.entries
+        return (entries[position][2] for position in positions)
+
+    @staticmethod
+    def _flip_runs(entries: Iterator[Tuple[Any, int, ET]]) -> Iterator[ET]:
+        # walking backwards reverses ties too, so each run of equal values
+        # is flipped back to keep the insertion order a stable sort keeps
+        return (
+            entry[2]
+            for _, run in groupby(entries, key=itemgetter(0))
+            for entry in reversed(list(run))
+        )
+
+
+@dataclass(slots=True)
+class NgramIndex(EntityIndex[ET]):
+
+    field_name: str
+    size: int = 3
+    grams: Dict[str, Set[str]] = field(default_factory=lambda: {})
+    # lowered the same way the case-insensitive filters lower their terms
+    values: Dict[str, str] = field(default_factory=lambda: {})
+
+    def rebuild(self, ids: List[str], items: List[ET]) -> None:
+        self.grams = {}
+        self.values = {}
+        for entity_id, item in zip(ids, items):
+            self.add(entity_id, item)
+
+    def add(self, entity_id: str, entity: ET) -> None:
+        value = getattr(entity, self.field_name).lower()
+        self.values[entity_id] = value
+        for gram in self._split(value):
+            self.grams.setdefault(gram, set()).add(entity_id)
+
+    def remove(self, entity_id: str) -> None:
+        for gram in self._split(self.values.pop(entity_id)):
+            bucket = self.grams[gram]
+            bucket.discard(entity_id)
+            if not bucket:
+                del self.grams[gram]
+
+    def estimate(self, term: str) -> Optional[int]:
+        # an upper bound of what search finds, the entities of its rarest gram
+        term = term.lower()
+        if len(term) < self.size:
+            return None
+
+        return min(len(self.grams.get(gram, ())) for gram in self._split(term))
+
+    def search(self, term: str) -> Optional[Set[str]]:
+        # terms shorter than a gram cannot be looked up, None tells the
+        # caller to scan instead
+        term = term.lower()
+        if len(term) < self.size:
+            return None
+
+        buckets = sorted(
+            (self.grams.get(gram, set()) for gram in self._split(term)),
+            key=len
+        )
+        candidates = buckets[0].intersection(*buckets[1:])
+        return {
+            entity_id for entity_id in candidates if term in self.values[entity_id]
+        }
+
+    def _split(self, value: str) -> Set[str]:
+        size = self.size
+        return {value[start:start + size] for start in range(len(value) - size + 1)}
+
+
+@dataclass(slots=True)
+class HashIndex(EntityIndex[ET]):
+
+    # the ids of the entities holding each value of a field
+    field_name: str
+    buckets: Dict[Any, Set[str]] = field(default_factory=lambda: {})
+    values: Dict[str, Any] = field(default_factory=lambda: {})
+
+    def rebuild(self, ids: List[str], items: List[ET]) -> None:
+        self.buckets = {}
+        self.values = {}
+        for entity_id, item in zip(ids, items):
+            self.add(entity_id, item)
+
+    def add(self, entity_id: str, entity: ET) -> None:
+        value = getattr(entity, self.field_name)
+        self.values[entity_id] = value
+        self.buckets.setdefault(value, set()).add(entity_id)
+
+    def remove(self, entity_id: str) -> None:
+        value = self.values.pop(entity_id)
+        bucket = self.buckets[value]
+        bucket.discard(entity_id)
+        if not bucket:
+            del self.buckets[value]
+
+    def search(self, value: Any) -> Set[str]:
+        return self.buckets.get(value, set())
+
+
+_TOKEN = re.compile(r'\w+')
+
+
+@functools.lru_cache(maxsize=65_536)
+def _fold(token: str) -> str:
+    decomposed = unicodedata.normalize('NFKD', token)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _common(buckets: List[Dict[str, Any]]) -> List[str]:
+    # the ids every bucket holds, found from the smallest one
+    buckets = sorted(buckets, key=len)
+    common: Iterable[str] = buckets[0]
+    for bucket in buckets[1:]:
+        common = filter(bucket.__contains__, common)
+
+    return list(common)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    # words are case and accent folded, so 'Ação' and 'acao' are one term
+    if not text:
+        return []
+
+    return list(map(_fold, _TOKEN.findall(text.casefold())))
+
+
+def _with_sequences(ids: Iterable[str], group: Dict[str, int]) -> Iterator[Tuple[str, int]]:
+    # a function rather than a generator expression, so each run reads the
+    # sequences of its own group
+    return ((entity_id, group[entity_id]) for entity_id in ids)
+
+
+@dataclass(slots=True)
+class FullTextIndex(EntityIndex[ET]):
+
+    # an inverted index scored with BM25, every field counting its weight
+    # for each occurrence of a term and towards the document length. The
+    # postings of a term are also grouped by frequency and length: entities
+    # sharing both share their score, so a ranking walks the best groups
+    # and never scores the entities one by one
+    field_weights: Dict[str, float]
+    k1: float = 1.2
+    b: float = 0.75
+    postings: Dict[str, Dict[str, float]] = field(default_factory=lambda: {})
+    # term -> (frequency, length) -> {entity id: sequence}, in sequence
+    # order unless the group is listed in _unordered
+    groups: Dict[str, Dict[Tuple[float, float], Dict[str, int]]] = field(
+        default_factory=lambda: {})
+    documents: Dict[str, Tuple[Dict[str, float], float]] = field(default_factory=lambda: {})
+    # the insertion sequence breaks score ties, as in SortedIndex
+    sequences: Dict[str, int] = field(default_factory=lambda: {})
+    next_sequence: int = 0
+    total_length: float = 0.0
+    _unordered: Set[Tuple[str, Tuple[float, float]]] = field(
+        default_factory=lambda: set(), repr=False)
+    _counts: Dict[FrozenSet[str], int] = field(default_factory=lambda: {}, repr=False)
+
+    def rebuild(self, ids: List[str], items: List[ET]) -> None:
+        self.postings = {}
+        self.groups = {}
+        self.documents = {}
+        self.sequences = {}
+        self.next_sequence = 0
+        self.total_length = 0.0
+        self._unordered = set()
+        self._counts = {}
+        for entity_id, item in zip(ids, items):
+            self.add(entity_id, item)
+
+    def add(self, entity_id: str, entity: ET) -> None:
+        self._insert(entity_id, entity, self.next_sequence)
+        self.next_sequence += 1
+
+    def remove(self, entity_id: str) -> None:
+        terms, length = self.documents.pop(entity_id)
+        del self.sequences[entity_id]
+        self._counts.clear()
+        self.total_length -= length
+        for term, frequency in terms.items():
+            bucket = self.postings[term]
+            del bucket[entity_id]
+            term_groups = self.groups[term]
+            group = term_groups[(frequency, length)]
+            del group[entity_id]
+            if not group:
+                del term_groups[(frequency, length)]
+                self._unordered.discard((term, (frequency, length)))
+            if not bucket:
+                del self.postings[term]
+                del self.groups[term]
+
+    def replace(self, entity_id: str, entity: ET) -> None:
+        sequence = self.sequences[entity_id]
+        self.remove(entity_id)
+        self._insert(entity_id, entity, sequence)
+
+    def count(self, query: str) -> int:
+        # how many entities hold all the query terms; intersecting postings
+        # costs their size, so counts are kept until the next write
+        terms = frozenset(tokenize(query))
+        buckets = self._buckets(terms)
+        if len(buckets) < 2:
+            return len(buckets[0]) if buckets else 0
+
+        if (total := self._counts.get(terms)) is None:
+            total = self._counts[terms] = len(_common(buckets))
+
+        return total
+
+    def ranked(
+            self,
+            query: str,
+            descending: bool = False,
+            start: Optional[Tuple[float, int]] = None
+        ) -> Iterator[Tuple[float, int, str]]:
+        # (score, sequence, entity id) of the entities holding all the query
+        # terms, best score first and ties in sequence order, or the other
+        # way around when descending; start is a (score, sequence) position
+        # the walk begins strictly after
+        terms = set(tokenize(query))
+        if not self._buckets(terms):
+            return iter(())
+
+        levels = sorted(self._combinations(terms), key=itemgetter(0), reverse=not descending)
+        return chain.from_iterable(
+            self._walk_level(score, [groups for _, groups in combinations], descending, start)
+            for score, combinations in groupby(levels, key=itemgetter(0))
+            if start is None or (score <= start[0] if not descending else score >= start[0])
+        )
+
+    def score(self, query: str, entity_id: str) -> Optional[float]:
+        # the score ranked gives the entity for the query as the index is
+        # now, None when it does not hold every query term
+        terms = set(tokenize(query))
+        document = self.documents.get(entity_id)
+        if not terms or document is None or not terms.issubset(document[0]):
+            return None
+
+        held, length = document
+        total = len(self.documents)
+        norm_base = self.k1 * (1 - self.b)
+        norm_scale = self.k1 * self.b * total / self.total_length
+        score = 0.0
+        # summed in the order _combinations sums them, so ties compare equal
+        for term in sorted(terms):
+            frequency = held[term]
+            score += self._term_weight(term, total) * frequency / (
+                frequency + norm_base + norm_scale * length)
+        return score
+
+    def _buckets(self, terms: AbstractSet[str]) -> List[Dict[str, float]]:
+        # the postings of every term, empty when one of them has none
+        buckets = [self.postings.get(term) for term in terms]
+        return [] if not buckets or None in buckets else buckets
+
+    def _combinations(self, terms: Set[str]) -> List[Tuple[float, List[Dict[str, int]]]]:
+        # every way the terms can be held at a same document length, with
+        # its score and the groups whose common entities hold it that way
+        total = len(self.documents)
+        k1 = self.k1
+        norm_base = k1 * (1 - self.b)
+        norm_scale = k1 * self.b * total / self.total_length
+        # length -> [(score so far, groups)]
+        combinations: Optional[Dict[float, List[Tuple[float, List[Dict[str, int]]]]]] = None
+        for term in sorted(terms):
+            weight = self._term_weight(term, total)
+            held: Dict[float, List[Tuple[float, List[Dict[str, int]]]]] = {}
+            for (frequency, length), group in self._ordered_groups(term).items():
+                previous = [(0.0, [])] if combinations is None else combinations.get(length)
+                if not previous:
+                    continue
+
+                term_score = weight * frequency / (frequency + norm_base + norm_scale * length)
+                held.setdefault(length, []).extend(
+                    (score + term_score, [*groups, group]) for score, groups in previous)
+            combinations = held
+
+        return list(chain.from_iterable(combinations.values()))
+
+    def _term_weight(self, term: str, total: int) -> float:
+        documents = len(self.postings[term])
+        return math.log(1 + (total - documents + 0.5) / (documents + 0.5)) * (self.k1 + 1)
+
+    def _ordered_groups(self, term: str) -> Dict[Tuple[float, float], Dict[str, int]]:
+        # groups an update put out of sequence order are sorted once read
+        term_groups = self.groups[term]
+        if self._unordered:
+            for key in [key for key in term_groups if (term, key) in self._unordered]:
+                term_groups[key] = dict(sorted(term_groups[key].items(), key=itemgetter(1)))
+                self._unordered.discard((term, key))
+
+        return term_groups
+
+    def _walk_level(
+            self,
+            score: float,
+            combinations: List[List[Dict[str, int]]],
+            descending: bool,
+            start: Optional[Tuple[float, int]]
+        ) -> Iterator[Tuple[float, int, str]]:
+        runs = []
+        for groups in combinations:
+            smallest = min(groups, key=len)
+            if len(groups) == 1:
+                runs.append(reversed(smallest.items()) if descending else iter(smallest.items()))
+                continue
+
+            # walked in the order of the smallest group, keeping what the
+            # others hold as well, and only as far as the ranking is read
+            ids: Iterable[str] = reversed(smallest) if descending else iter(smallest)
+            for group in groups:
+                if group is not smallest:
+                    ids = filter(group.__contains__, ids)
+            runs.append(_with_sequences(ids, smallest))
+
+        members = runs[0] if len(runs) == 1 else heapq.merge(
+            *runs, key=itemgetter(1), reverse=descending)
+        if start is not None and score == start[0]:
+            sequence = start[1]
+            members = dropwhile(
+                (lambda member: member[1] >= sequence) if descending
+                else (lambda member: member[1] <= sequence),
+                members
+            )
+
+        return ((score, member_sequence, entity_id) for entity_id, member_sequence in members)
+
+    def _insert(self, entity_id: str, entity: ET, sequence: int) -> None:
+        terms: Dict[str, float] = {}
+        length = 0.0
+        for field_name, weight in self.field_weights.items():
+            tokens = tokenize(getattr(entity, field_name))
+            length += weight * len(tokens)
+            for token in tokens:
+                terms[token] = terms.get(token, 0.0) + weight
+
+        self.documents[entity_id] = (terms, length)
+        self.sequences[entity_id] = sequence
+        self._counts.clear()
+        self.total_length += length
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[entity_id] = frequency
+            group = self.groups.setdefault(term, {}).setdefault((frequency, length), {})
+            if group and next(reversed(group.values())) > sequence:
+                self._unordered.add((term, (frequency, length)))
+            group[entity_id] = sequence
@@ -0,0 +1,366 @@
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import struct
+import threading
+from typing import (
+    Any, BinaryIO, Callable, Generic, Iterable, Iterator, List, Optional, Tuple, Type
+)
+import zlib
+
+from __seedwork.domain.repository import (
+    ET,
+    BulkWriteResult,
+    Filter,
+    InMemorySearchableRepository,
+    SearchableRepositoryInterface,
+    SearchParams,
+    SearchResult
+)
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrator
+
+_SNAPSHOT_FILE = 'snapshot.bin'
+_SNAPSHOT_MAGIC = b'ETSNAP02'
+# magic and the generation of the first log the snapshot does not cover,
+# followed by the entities as the codec writes them
+_SNAPSHOT_HEADER = struct.Struct('<8sQ')
+# payload length and crc32 of every log record
+_RECORD_HEADER = struct.Struct('<II')
+
+_INSERT = 'insert'
+_UPDATE = 'update'
+_DELETE = 'delete'
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$datetime': value.isoformat()}
+
+    raise TypeError(f'{type(value).__name__} values cannot be journaled')
+
+
+def _decode_object(value: dict) -> Any:
+    if value.keys() == {'$datetime'}:
+        return datetime.fromisoformat(value['$datetime'])
+
+    return value
+
+
+def _dumps(value: Any) -> bytes:
+    # plain JSON with tagged datetimes: unlike pickle, reading a journal
+    # back never runs code it holds
+    return json.dumps(
+        value, default=_encode_value, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+def _loads(data: bytes) -> Any:
+    return json.loads(data, object_hook=_decode_object)
+
+
+@dataclass(frozen=True, slots=True)
+class EntityCodec(Generic[ET]):
+
+    # turns entities into tuples of their field values and back; the tuples
+    # were written from valid entities, so they are hydrated without
+    # running the entity validation again
+    entity_class: Type[ET]
+    field_names: Tuple[str, ...] = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'field_names', tuple(
+            entity_field.name for entity_field in fields(self.entity_class)
+            if entity_field.name != 'unique_entity_id'
+        ))
+
+    def to_record(self, entity: ET) -> tuple:
+        return (entity.id, *map(entity.__getattribute__, self.field_names))
+
+    def from_record(self, record: tuple) -> ET:
+        return hydrator(self.entity_class)(record[0], dict(zip(self.field_names, record[1:])))
+
+    def write_snapshot(self, file: BinaryIO, entities: Iterable[ET]) -> None:
+        # one JSON record per line; codecs of entities with a binary
+        # snapshot format of their own override both snapshot methods
+        for record in map(self.to_record, entities):
+            file.write(_dumps(record))
+            file.write(b'\n')
+
+    def read_snapshot(self, path: str, offset: int) -> List[ET]:
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            return [self.from_record(_loads(line)) for line in file]
+
+
+@dataclass(slots=True)
+class RepositoryJournal(Generic[ET]):
+
+    # pylint: disable=too-many-instance-attributes
+    # writes are appended to journal-<generation>.log and handed to the
+    # operating system at once, so they survive the process crashing; they
+    # are made durable with one fsync per sync_every records, or by a timer
+    # sync_interval seconds after the first record left unsynced, so a
+    # machine crash loses at most the records of that interval.
+    # Every snapshot_every records the whole repository is written to
+    # snapshot.bin and a new log generation is started
+    directory: str
+    codec: EntityCodec[ET]
+    sync_every: int = 64
+    sync_interval: float = 0.05
+    snapshot_every: int = 100_000
+    _generation: int = field(default=0, init=False, repr=False)
+    _log: Optional[BinaryIO] = field(default=None, init=False, repr=False)
+    _unsynced: int = field(default=0, init=False, repr=False)
+    _timer: Optional[threading.Timer] = field(default=None, init=False, repr=False)
+    # the timer syncs from its own thread
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+    _since_snapshot: int = field(default=0, init=False, repr=False)
+
+    def restore(self, repository: InMemorySearchableRepository[ET, Any]) -> None:
+        path = Path(self.directory)
+        path.mkdir(parents=True, exist_ok=True)
+        self._generation = 0
+        snapshot = path / _SNAPSHOT_FILE
+        if snapshot.exists():
+            self._generation, entities = self._read_snapshot(snapshot)
+            repository.insert_many(entities)
+
+        for generation, log in self._logs():
+            if generation < self._generation:
+                # already covered by the snapshot
+                log.unlink()
+                continue
+
+            self._replay(log, repository)
+            self._generation = generation
+
+        # the log stays open for appends until close
+        self._log = open(  # pylint: disable=consider-using-with
+            self._log_path(self._generation), 'ab')
+
+    def log_insert(self, entities: Iterable[ET]) -> None:
+        self._append(_INSERT, list(map(self.codec.to_record, entities)))
+
+    def log_update(self, entities: Iterable[ET]) -> None:
+        self._append(_UPDATE, list(map(self.codec.to_record, entities)))
+
+    def log_delete(self, entity_ids: Iterable[str | UniqueEntityId]) -> None:
+        self._append(_DELETE, list(map(str, entity_ids)))
+
+    def should_snapshot(self) -> bool:
+        return self._since_snapshot >= self.snapshot_every
+
+    def snapshot(self, entities: Iterable[ET]) -> None:
+        # the records logged so far are covered by the snapshot, so later
+        # writes go to a new generation; until the snapshot replaces the old
+        # one, a restart still finds every record in the older logs
+        with self._lock:
+            self.sync()
+            self._log.close()
+            self._generation += 1
+            self._log = open(  # pylint: disable=consider-using-with
+                self._log_path(self._generation), 'ab')
+
+        path = Path(self.directory)
+        temporary = path / f'{_SNAPSHOT_FILE}.tmp'
+        with open(temporary, 'wb') as snapshot:
+            snapshot.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, self._generation))
+            self.codec.write_snapshot(snapshot, entities)
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temporary, path / _SNAPSHOT_FILE)
+        self._sync_directory()
+
+        for generation, log in self._logs():
+            if generation < self._generation:
+                log.unlink()
+        self._since_snapshot = 0
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._log is None:
+                return
+
+            self._log.flush()
+            if self._unsynced:
+                os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._log is None:
+                return
+
+            self.sync()
+            self._log.close()
+            self._log = None
+
+    def _append(self, operation: str, values: list) -> None:
+        if not values:
+            return
+
+        payload = _dumps([operation, values])
+        with self._lock:
+            self._log.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+            self._log.write(payload)
+            self._log.flush()
+            self._unsynced += 1
+            self._since_snapshot += 1
+            if self._unsynced >= self.sync_every:
+                self.sync()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.sync_interval, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _replay(self, log: Path, repository: InMemorySearchableRepository[ET, Any]) -> None:
+        with open(log, 'rb') as file:
+            data = file.read()
+
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+
+            operation, values = _loads(payload)
+            if operation == _INSERT:
+                repository.insert_many(list(map(self.codec.from_record, values)))
+            elif operation == _UPDATE:
+                repository.update_many(list(map(self.codec.from_record, values)))
+            else:
+                repository.delete_many(values)
+            offset = start + length
+
+        if offset < len(data):
+            # a record torn by a crash is dropped, so later appends do not
+            # land behind it
+            with open(log, 'r+b') as file:
+                file.truncate(offset)
+
+    def _read_snapshot(self, snapshot: Path) -> Tuple[int, List[ET]]:
+        with open(snapshot, 'rb') as file:
+            header = file.read(_SNAPSHOT_HEADER.size)
+            if len(header) < _SNAPSHOT_HEADER.size:
+                raise ValueError(f"'{snapshot}' is not a repository snapshot")
+
+            magic, generation = _SNAPSHOT_HEADER.unpack(header)
+            if magic != _SNAPSHOT_MAGIC:
+                raise ValueError(f"'{snapshot}' is not a repository snapshot")
+
+        return generation, self.codec.read_snapshot(str(snapshot), _SNAPSHOT_HEADER.size)
+
+    def _logs(self) -> List[Tuple[int, Path]]:
+        logs = []
+        for log in Path(self.directory).glob('journal-*.log'):
+            try:
+                logs.append((int(log.stem.removeprefix('journal-')), log))
+            except ValueError:
+                continue
+
+        return sorted(logs)
+
+    def _log_path(self, generation: int) -> Path:
+        return Path(self.directory) / f'journal-{generation:08d}.log'
+
+    def _sync_directory(self) -> None:
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+
+        descriptor = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+@dataclass(slots=True)
+class JournaledSearchableRepository(
+    Generic[ET, Filter],
+    SearchableRepositoryInterface[
+        ET,
+        SearchParams[Filter],
+        SearchResult[ET, Filter]
+    ]
+):
+
+    # the wrapped repository is rebuilt from the journal on creation, and
+    # every write that changes it is logged once it has been applied
+    journal: RepositoryJournal[ET]
+    repository: InMemorySearchableRepository[ET, Filter]
+
+    def __post_init__(self):
+        self.journal.restore(self.repository)
+
+    def insert(self, entity: ET) -> None:
+        self.repository.insert(entity)
+        self._logged(self.journal.log_insert, [entity])
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        return self.repository.find_by_id(entity_id)
+
+    def find_all(self) -> List[ET]:
+        return self.repository.find_all()
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return self.repository.exists(entity_id)
+
+    def update(self, entity: ET) -> None:
+        self.repository.update(entity)
+        self._logged(self.journal.log_update, [entity])
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        self.repository.delete(entity_id)
+        self._logged(self.journal.log_delete, [entity_id])
+
+    def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        result = self.repository.insert_many(entities)
+        self._logged(self.journal.log_insert, entities)
+        return result
+
+    def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        result = self.repository.update_many(entities)
+        self._logged(self.journal.log_update, self._succeeded(entities, result))
+        return result
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        result = self.repository.delete_many(entity_ids)
+        self._logged(self.journal.log_delete, self._succeeded(entity_ids, result))
+        return result
+
+    def search(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
+        return self.repository.search(input_params)
+
+    def count(self, filter_param: Optional[Filter] = None) -> int:
+        return self.repository.count(filter_param)
+
+    def iter_all(self) -> Iterator[ET]:
+        return self.repository.iter_all()
+
+    def iter_search(self, input_params: SearchParams[Filter]) -> Iterator[ET]:
+        return self.repository.iter_search(input_params)
+
+    def checkpoint(self) -> None:
+        self.journal.snapshot(self.repository.find_all())
+
+    def close(self) -> None:
+        self.journal.close()
+
+    def _logged(self, log: Callable[[list], None], values: list) -> None:
+        log(values)
+        if self.journal.should_snapshot():
+            self.checkpoint()
+
+    @staticmethod
+    def _succeeded(values: list, result: BulkWriteResult) -> list:
+        if not result.errors:
+            return values
+
+        return [value for position, value in enumerate(values) if position not in result.errors]
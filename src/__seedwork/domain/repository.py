@@ -1,15 +1,38 @@
 from abc import ABC
 import abc
+import base64
+import binascii
+import bisect
 from dataclasses import dataclass, field
+from datetime import datetime
+import heapq
+from itertools import islice
+import json
 import math
-from typing import Any, Generic, List, Optional, TypeVar
+from operator import attrgetter
+from typing import (
+    Any, ClassVar, Dict, Generator, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+)
 
+from __seedwork.domain.cache import CacheInfo, LRUCache
 from __seedwork.domain.entities import Entity
 from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.indexes import EntityIndex, FullTextIndex, SortedIndex
 from __seedwork.domain.value_objects import UniqueEntityId
 
 ET = TypeVar('ET', bound=Entity)
 
+# the sort that ranks full-text matches of the filter, best first
+RELEVANCE_SORT = 'relevance'
+
+
+@dataclass(frozen=True, slots=True)
+class BulkWriteResult:
+    succeeded: int = 0
+    # failures keyed by the position of the entity or id in the batch
+    errors: Dict[int, Exception] = field(default_factory=lambda: {})
+
+
 class RepositoryInterface(Generic[ET], ABC):
 
     @abc.abstractmethod
@@ -32,6 +55,41 @@ class RepositoryInterface(Generic[ET], ABC):
     def delete(self, entity_id: str | UniqueEntityId) -> None:
         raise NotImplementedError()
 
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        # repositories override it to answer without building the entity
+        try:
+            self.find_by_id(entity_id)
+        except NotFoundException:
+            return False
+
+        return True
+
+    def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        for entity in entities:
+            self.insert(entity)
+
+        return BulkWriteResult(succeeded=len(entities))
+
+    def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        errors = {}
+        for position, entity in enumerate(entities):
+            try:
+                self.update(entity)
+            except NotFoundException as exception:
+                errors[position] = exception
+
+        return BulkWriteResult(succeeded=len(entities) - len(errors), errors=errors)
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        errors = {}
+        for position, entity_id in enumerate(entity_ids):
+            try:
+                self.delete(entity_id)
+            except NotFoundException as exception:
+                errors[position] = exception
+
+        return BulkWriteResult(succeeded=len(entity_ids) - len(errors), errors=errors)
+
 
 Input = TypeVar('Input')
 Output = TypeVar('Output')
@@ -39,11 +97,53 @@ Output = TypeVar('Output')
 class SearchableRepositoryInterface(Generic[ET, Input, Output], RepositoryInterface[ET], ABC):
 
     sortable_fields: List[str] = []
+    # the sort of a search asking for none
+    sort_default: Optional[str] = None
+    # the type a cursor value must have for each sortable field listed
+    sort_value_types: Dict[str, type] = {}
 
     @abc.abstractmethod
     def search(self, input_params: Input) -> Output:
         raise NotImplementedError()
 
+    def count(self, filter_param: Optional[Any] = None) -> int:
+        # repositories override it to count without building entities, the
+        # fallback reads the total of a one entity page
+        params_class = getattr(self, 'SearchParams', SearchParams)
+        return self.search(params_class(filter=filter_param, per_page=1)).total
+
+    def iter_all(self) -> Iterator[ET]:
+        yield from self.find_all()
+
+    def iter_search(self, input_params: Input) -> Iterator[ET]:
+        yield from self.search(input_params).items
+
+    def _effective_sort(self, sort: Optional[str]) -> Optional[str]:
+        # the sort a search is run with, None when the field is not sortable
+        if sort is None:
+            sort = self.sort_default
+
+        return sort if sort in self.sortable_fields else None
+
+    def _decode_cursor(self, token: Optional[str], sort: Optional[str]) -> Optional['SearchCursor']:
+        # a cursor made for another sort, or holding a value the sort field
+        # cannot be compared with, is ignored as an unreadable one is
+        cursor = SearchCursor.decode(token) if token else None
+        if cursor is None or cursor.sort != sort:
+            return None
+
+        value_type = self.sort_value_types.get(sort) if sort else None
+        if value_type is not None and not isinstance(cursor.value, value_type):
+            return None
+
+        return cursor if not sort or self._cursor_value_fits(sort, cursor.value) else None
+
+    def _cursor_value_fits(self, sort: str, value: Any) -> bool:
+        # repositories storing values a cursor of the right type still cannot
+        # be compared with, such as datetimes of another awareness, refuse it
+        # pylint: disable=unused-argument
+        return True
+
 
 Filter = TypeVar('Filter', str, Any)
 
@@ -54,6 +154,11 @@ class SearchParams(Generic[Filter]):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    after: Optional[str] = None
+    before: Optional[str] = None
+    # when given, the result items are dicts holding only these fields
+    # rather than entities; a string lists them separated by commas
+    fields: Optional[Tuple[str, ...]] = None
 
     def __post_init__(self):
         self._normalize_page()
@@ -61,6 +166,8 @@ class SearchParams(Generic[Filter]):
         self._normalize_sort()
         self._normalize_sort_dir()
         self._normalize_filter()
+        self._normalize_cursors()
+        self._normalize_fields()
 
     def _normalize_page(self):
         page = self._convert_to_int(self.page)
@@ -90,6 +197,15 @@ class SearchParams(Generic[Filter]):
     def _normalize_filter(self):
         self.filter = None if self.filter in ['', None] else str(self.filter)
 
+    def _normalize_cursors(self):
+        self.after = None if self.after in ['', None] else str(self.after)
+        self.before = None if self.before in ['', None] else str(self.before)
+
+    def _normalize_fields(self):
+        field_names = self.fields.split(',') if isinstance(self.fields, str) else self.fields or ()
+        names = (str(name).strip() for name in field_names)
+        self.fields = tuple(dict.fromkeys(name for name in names if name)) or None
+
     def _convert_to_int(self, value: Any, default=0) -> int:
         try:
             return int(value)
@@ -103,6 +219,7 @@ class SearchParams(Generic[Filter]):
 
 @dataclass(slots=True, kw_only=True, frozen=True)
 class SearchResult(Generic[ET, Filter]):
+    # dicts of the projected fields when the search asked for fields
     items: List[ET]
     total: int
     current_page: int
@@ -111,6 +228,10 @@ class SearchResult(Generic[ET, Filter]):
     sort: Optional[str] = None
     sort_dir: Optional[str] = None
     filter: Optional[Filter] = None
+    # navigation tokens only, results holding the same page are equal
+    # whatever cursors they carry
+    next_cursor: Optional[str] = field(default=None, compare=False)
+    prev_cursor: Optional[str] = field(default=None, compare=False)
 
     def __post_init__(self):
         object.__setattr__(
@@ -128,17 +249,70 @@ class SearchResult(Generic[ET, Filter]):
             'last_page': self.last_page,
             'sort': self.sort,
             'sort_dir': self.sort_dir,
-            'filter': self.filter
+            'filter': self.filter,
+            'next_cursor': self.next_cursor,
+            'prev_cursor': self.prev_cursor
         }
 
 
+@dataclass(frozen=True, slots=True)
+class SearchCursor:
+    # the sort value and id of the entity a page stands after or before;
+    # every repository resumes right past the cursor's (value, insertion
+    # order) position, so one whose entity was deleted meanwhile repeats
+    # its ties rather than skipping them
+    sort: Optional[str]
+    value: Any
+    entity_id: str
+
+    def encode(self) -> str:
+        value = self.value
+        if isinstance(value, datetime):
+            value = {'datetime': value.isoformat()}
+
+        payload = json.dumps([self.sort, value, self.entity_id], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def decode(token: str) -> Optional['SearchCursor']:
+        try:
+            sort, value, entity_id = json.loads(base64.urlsafe_b64decode(token.encode()))
+            if isinstance(value, dict):
+                value = datetime.fromisoformat(value['datetime'])
+        except (binascii.Error, KeyError, TypeError, ValueError):
+            return None
+
+        return SearchCursor(sort=sort, value=value, entity_id=str(entity_id))
+
+
 @dataclass(slots=True)
 class InMemoryRepository(RepositoryInterface[ET], ABC):
 
     items: List[ET] = field(default_factory=lambda: [])
+    _ids: List[str] = field(
+        default_factory=lambda: [], init=False, repr=False, compare=False)
+    _positions: Dict[str, int] = field(
+        default_factory=lambda: {}, init=False, repr=False, compare=False)
+    _deleted_positions: List[int] = field(
+        default_factory=lambda: [], init=False, repr=False, compare=False)
+    _indexed_items: Optional[List[ET]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _indexes: Dict[str, EntityIndex[ET]] = field(
+        default_factory=lambda: {}, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
 
     def insert(self, entity: ET) -> None:
+        self._sync_index()
+        entity_id = entity.id
+        if entity_id in self._positions:
+            self._indexes = {}
+        else:
+            self._index_add(entity_id, entity)
+            self._positions[entity_id] = len(self.items) + len(self._deleted_positions)
+
         self.items.append(entity)
+        self._ids.append(entity_id)
+        self._version += 1
 
     def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
         id_str = str(entity_id)
@@ -147,25 +321,231 @@ class InMemoryRepository(RepositoryInterface[ET], ABC):
     def find_all(self) -> List[ET]:
         return self.items
 
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        self._sync_index()
+        return str(entity_id) in self._positions
+
     def update(self, entity: ET) -> None:
-        entity_found = self._get(entity.id)
-        index = self.items.index(entity_found)
-        self.items[index] = entity
+        entity_id = entity.id
+        position = self._position(entity_id)
+        self._index_replace(entity_id, entity, self.items[position])
+        self.items[position] = entity
+        self._version += 1
 
     def delete(self, entity_id: str | UniqueEntityId):
         id_str = str(entity_id)
-        entity_found = self._get(id_str)
-        self.items.remove(entity_found)
+        position = self._position(id_str)
+        duplicated = len(self._positions) < len(self._ids)
+        del self.items[position]
+        del self._ids[position]
+        bisect.insort(self._deleted_positions, self._positions.pop(id_str))
+        for index in self._indexes.values():
+            index.remove(id_str)
+        self._version += 1
+        if duplicated:
+            # another copy of the id may remain, positions and indexes are
+            # rebuilt so it is found from now on
+            self._indexed_items = None
+            return
+
+        if len(self._deleted_positions) > max(1024, math.isqrt(len(self.items))):
+            self._renumber_positions()
+
+    def insert_many(self, entities: List[ET]) -> BulkWriteResult:
+        self._sync_index()
+        entity_ids = [entity.id for entity in entities]
+        rebuild_indexes = self._rebuilds_indexes_for(len(entities))
+        total = len(self.items)
+        next_position = total + len(self._deleted_positions)
+        added = []
+        try:
+            for entity_id, entity in zip(entity_ids, entities):
+                if entity_id in self._positions:
+                    self._indexes = {}
+                    continue
+
+                if not rebuild_indexes:
+                    self._index_add(entity_id, entity)
+                self._positions[entity_id] = next_position
+                next_position += 1
+                added.append(entity_id)
+
+            self.items.extend(entities)
+            self._ids.extend(entity_ids)
+            if rebuild_indexes and self._indexes:
+                self._rebuild_indexes()
+        except Exception:
+            # a batch the indexes refuse is not written at all
+            del self.items[total:]
+            del self._ids[total:]
+            for entity_id in added:
+                del self._positions[entity_id]
+                if not rebuild_indexes:
+                    for index in self._indexes.values():
+                        index.remove(entity_id)
+            if rebuild_indexes:
+                self._rebuild_indexes()
+            raise
+
+        self._version += 1
+        return BulkWriteResult(succeeded=len(entities))
+
+    def update_many(self, entities: List[ET]) -> BulkWriteResult:
+        self._sync_index()
+        errors = {}
+        rebuild_indexes = self._rebuilds_indexes_for(len(entities))
+        replaced: Dict[int, ET] = {}
+        try:
+            for batch_position, entity in enumerate(entities):
+                entity_id = entity.id
+                try:
+                    position = self._position(entity_id)
+                except NotFoundException as exception:
+                    errors[batch_position] = exception
+                    continue
+
+                if not rebuild_indexes:
+                    self._index_replace(entity_id, entity, self.items[position])
+                replaced.setdefault(position, self.items[position])
+                self.items[position] = entity
+
+            if rebuild_indexes and self._indexes:
+                self._rebuild_indexes()
+        except Exception:
+            # a batch the indexes refuse is not written at all
+            for position, entity in replaced.items():
+                if not rebuild_indexes:
+                    self._index_replace(self._ids[position], entity, self.items[position])
+                self.items[position] = entity
+            if rebuild_indexes:
+                self._rebuild_indexes()
+            raise
+
+        self._version += 1
+        return BulkWriteResult(succeeded=len(entities) - len(errors), errors=errors)
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        self._sync_index()
+        errors = {}
+        removed_positions = {}
+        for batch_position, entity_id in enumerate(entity_ids):
+            id_str = str(entity_id)
+            try:
+                position = self._position(id_str)
+            except NotFoundException as exception:
+                errors[batch_position] = exception
+                continue
+
+            if position in removed_positions:
+                errors[batch_position] = NotFoundException(
+                    f"Entity not found using ID '{id_str}'")
+                continue
+
+            removed_positions[position] = id_str
+
+        if removed_positions:
+            duplicated = len(self._positions) < len(self._ids)
+            # the list is rebuilt once instead of shifting it for every id
+            self.items[:] = [
+                item for position, item in enumerate(self.items)
+                if position not in removed_positions
+            ]
+            self._ids[:] = [
+                entity_id for position, entity_id in enumerate(self._ids)
+                if position not in removed_positions
+            ]
+            total = len(self._ids)
+            self._positions = dict(zip(reversed(self._ids), range(total - 1, -1, -1)))
+            self._deleted_positions = []
+            if duplicated or self._rebuilds_indexes_for(len(removed_positions)):
+                self._rebuild_indexes()
+            else:
+                for index in self._indexes.values():
+                    for id_str in removed_positions.values():
+                        index.remove(id_str)
+
+        self._version += 1
+        return BulkWriteResult(succeeded=len(removed_positions), errors=errors)
 
     def _get(self, entity_id: str) -> ET:
-        if entity := next(
-            filter(lambda item: item.id == entity_id, self.items), None
-        ):
-            return entity
+        return self.items[self._position(entity_id)]
+
+    def _position(self, entity_id: str) -> int:
+        self._sync_index()
+        position = self._positions.get(entity_id)
+        if position is None:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        # positions are kept as they were before the pending deletes, each
+        # delete recorded before an entity moves it one slot to the left
+        if self._deleted_positions:
+            position -= bisect.bisect_left(self._deleted_positions, position)
+
+        return position
+
+    def _sync_index(self) -> None:
+        # items is public and may be reassigned directly, so the index is
+        # rebuilt whenever it no longer describes the current list
+        if self._indexed_items is self.items and len(self._ids) == len(self.items):
+            return
 
-        raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+        self._ids = [item.id for item in self.items]
+        total = len(self._ids)
+        # reversed so the first occurrence wins for duplicated ids
+        self._positions = dict(zip(reversed(self._ids), range(total - 1, -1, -1)))
+        self._deleted_positions = []
+        self._indexed_items = self.items
+        self._version += 1
+        self._rebuild_indexes()
+
+    def _index_add(self, entity_id: str, entity: ET) -> None:
+        # every index takes the entity or none does, so a value one of them
+        # cannot order leaves the repository as it was
+        added = []
+        try:
+            for index in self._indexes.values():
+                index.add(entity_id, entity)
+                added.append(index)
+        except Exception:
+            for index in added:
+                index.remove(entity_id)
+            raise
+
+    def _index_replace(self, entity_id: str, entity: ET, previous: ET) -> None:
+        replaced = []
+        try:
+            for index in self._indexes.values():
+                index.replace(entity_id, entity)
+                replaced.append(index)
+        except Exception:
+            for index in replaced:
+                index.replace(entity_id, previous)
+            raise
+
+    def _rebuild_indexes(self) -> None:
+        # secondary indexes key entities by id, so they are left out while
+        # items holds the same id more than once
+        self._indexes = {}
+        if len(self._positions) == len(self._ids):
+            self._indexes = self._create_indexes()
+            for index in self._indexes.values():
+                index.rebuild(self._ids, self.items)
+
+    def _rebuilds_indexes_for(self, batch_size: int) -> bool:
+        # every bisect insert or removal shifts the tail of a sorted index,
+        # past this size one rebuild costs less than shifting per entity
+        return batch_size > min(1024, len(self.items) // 8)
+
+    def _create_indexes(self) -> Dict[str, EntityIndex[ET]]:
+        return {}
+
+    def _renumber_positions(self) -> None:
+        start = self._deleted_positions[0]
+        self._positions.update(zip(self._ids[start:], range(start, len(self._ids))))
+        self._deleted_positions = []
 
 
+@dataclass(slots=True)
 class InMemorySearchableRepository(
     Generic[ET, Filter],
     InMemoryRepository[ET],
@@ -176,12 +556,103 @@ class InMemorySearchableRepository(
     ],
     ABC
 ):
+
+    # fields searched with sort='relevance' and the weight of each of them,
+    # no full-text search is offered while it is empty
+    full_text_fields: ClassVar[Dict[str, float]] = {}
+    # filter and sort passes over more items than this are split in chunks
+    search_chunk_size: ClassVar[int] = 10_000
+
+    # results are reused until the next write, entities changed in place
+    # without calling update are not seen by cached searches
+    _search_cache: LRUCache[tuple, SearchResult[ET, Filter]] = field(
+        default_factory=lambda: LRUCache(max_size=128),
+        init=False, repr=False, compare=False)
+    _search_cache_version: int = field(
+        default=-1, init=False, repr=False, compare=False)
+
     def search(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
-        items_filtered = self._apply_filter(self.items, input_params.filter)
-        items_sorted = self._apply_sort(
+        steps = self.search_steps(input_params)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+
+    def search_steps(
+            self,
+            input_params: SearchParams[Filter]
+        ) -> Generator[None, None, SearchResult[ET, Filter]]:
+        # search split at chunk boundaries: the generator yields between
+        # chunks of work and returns the result, so async callers can hand
+        # the event loop back while a long filter or sort is running; the
+        # items must not be written to before it is exhausted
+        self._sync_index()
+        if self._search_cache_version != self._version:
+            self._search_cache.clear()
+            self._search_cache_version = self._version
+
+        cache_key = self._search_cache_key(input_params)
+        if (result := self._search_cache.get(cache_key)) is not None:
+            return result
+
+        result = yield from self._search_steps(input_params)
+        self._search_cache.set(cache_key, result)
+        return result
+
+    def search_cache_info(self) -> CacheInfo:
+        return self._search_cache.info()
+
+    def count(self, filter_param: Optional[Filter] = None) -> int:
+        self._sync_index()
+        if filter_param is None:
+            return len(self.items)
+
+        return sum(1 for _ in self._iter_filter(self.items, filter_param))
+
+    def iter_all(self) -> Iterator[ET]:
+        yield from self.items
+
+    def iter_search(self, input_params: SearchParams[Filter]) -> Iterator[ET]:
+        # yields the same entities as search(input_params).items without
+        # building the filtered and sorted lists, while a sort index exists
+        self._sync_index()
+        sort = self._effective_sort(input_params.sort)
+        if input_params.after or input_params.before or self._ranks_by_relevance(input_params) or (
+                sort and f'sort:{sort}' not in self._indexes):
+            yield from self.search(input_params).items
+            return
+
+        entities = self.items
+        if sort:
+            entities = self._indexes[f'sort:{sort}'].iter_entities(
+                descending=input_params.sort_dir == 'desc')
+
+        start = (input_params.page - 1) * input_params.per_page
+        yield from islice(
+            self._iter_filter(entities, input_params.filter),
+            start,
+            start + input_params.per_page
+        )
+
+    def _search_steps(
+            self,
+            input_params: SearchParams[Filter]
+        ) -> Generator[None, None, SearchResult[ET, Filter]]:
+        if self._ranks_by_relevance(input_params):
+            return self._search_by_relevance(input_params)
+
+        items_filtered = yield from self._filter_steps(self.items, input_params.filter)
+        cursor = self._decode_cursor(
+            input_params.after or input_params.before, self._effective_sort(input_params.sort))
+        if cursor:
+            return self._search_by_cursor(input_params, items_filtered, cursor)
+
+        items_sorted = yield from self._sort_steps(
             items_filtered,
             input_params.sort,
-            input_params.sort_dir
+            input_params.sort_dir,
+            input_params.page * input_params.per_page
         )
         items_paginated = self._apply_paginate(
             items_sorted,
@@ -189,24 +660,294 @@ class InMemorySearchableRepository(
             input_params.per_page
         )
 
+        start = (input_params.page - 1) * input_params.per_page
+        has_next = start + len(items_paginated) < len(items_filtered)
+        has_prev = start > 0
+        return self._build_search_result(
+            input_params, items_paginated, len(items_filtered), has_next, has_prev)
+
+    def _filter_steps(
+            self,
+            items: List[ET],
+            filter_param: Filter | None
+        ) -> Generator[None, None, List[ET]]:
+        if filter_param is None:
+            return self._apply_filter(items, filter_param)
+
+        matches = self._iter_filter(items, filter_param)
+        items_filtered = []
+        while chunk := list(islice(matches, self.search_chunk_size)):
+            items_filtered.extend(chunk)
+            yield
+
+        return items_filtered
+
+    def _sort_steps(
+            self,
+            items: List[ET],
+            sort: str | None,
+            sort_dir: str | None,
+            limit: int
+        ) -> Generator[None, None, List[ET]]:
+        chunk_size = self.search_chunk_size
+        effective_sort = self._effective_sort(sort)
+        if not effective_sort or len(items) <= chunk_size or self._can_walk_sort_index(
+                items, effective_sort, limit):
+            return self._apply_sort(items, sort, sort_dir, limit)
+
+        # each chunk keeps its first limit items, merging the runs in chunk
+        # order resolves ties the way a stable sort of all the items does
+        key = attrgetter(effective_sort)
+        is_reverse = sort_dir == 'desc'
+        select = heapq.nlargest if is_reverse else heapq.nsmallest
+        runs = []
+        for start in range(0, len(items), chunk_size):
+            runs.append(select(limit, items[start:start + chunk_size], key=key))
+            yield
+
+        return list(islice(heapq.merge(*runs, key=key, reverse=is_reverse), limit))
+
+    def _ranks_by_relevance(self, input_params: SearchParams[Filter]) -> bool:
+        # only a text filter is ranked, without one every entity scores the
+        # same and the search falls back to the insertion order
+        return input_params.sort == RELEVANCE_SORT and bool(self.full_text_fields) \
+            and isinstance(input_params.filter, str)
+
+    def _search_by_relevance(self, input_params: SearchParams[Filter]) -> SearchResult[ET, Filter]:
+        # the filter is a full-text query matching the entities that hold all
+        # its words, ranked by score with ties kept in insertion order; desc
+        # turns the ranking around. The index hands the ranking out lazily,
+        # so a page costs its position rather than the number of matches.
+        # Every write changes the scores, so a cursor only names the entity
+        # it stands after and is placed by the score it has now; one whose
+        # entity no longer matches is ignored
+        index = self._full_text_index()
+        query = str(input_params.filter)
+        is_reverse = input_params.sort_dir == 'desc'
+        per_page = input_params.per_page
+        total = index.count(query)
+        position = None
+        cursor = self._decode_cursor(input_params.after or input_params.before, RELEVANCE_SORT)
+        if cursor is not None:
+            score = index.score(query, cursor.entity_id)
+            if score is not None:
+                position = (score, index.sequences[cursor.entity_id])
+
+        if position is None:
+            start = (input_params.page - 1) * per_page
+            window = list(islice(index.ranked(query, is_reverse), start, start + per_page))
+            has_next = start + len(window) < total
+            has_prev = start > 0
+        else:
+            # a page before the cursor is walked backwards from it and flipped
+            forward = input_params.after is not None
+            window = list(islice(
+                index.ranked(query, is_reverse == forward, position), per_page + 1))
+            has_more = len(window) > per_page
+            window = window[:per_page]
+            if forward:
+                has_next, has_prev = has_more, True
+            else:
+                window.reverse()
+                has_next, has_prev = True, has_more
+
         return SearchResult(
-            items=items_paginated,
-            total=len(items_filtered),
+            items=self._project(
+                [self._get(entity_id) for _, _, entity_id in window], input_params.fields),
+            total=total,
+            current_page=input_params.page,
+            per_page=per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            next_cursor=self._relevance_cursor(window[-1]) if window and has_next else None,
+            prev_cursor=self._relevance_cursor(window[0]) if window and has_prev else None
+        )
+
+    def _full_text_index(self) -> FullTextIndex[ET]:
+        index = self._indexes.get('fulltext')
+        if index is None:
+            # left out of the indexes while items holds an id more than once
+            index = FullTextIndex(self.full_text_fields)
+            index.rebuild(self._ids, self.items)
+
+        return index
+
+    @staticmethod
+    def _relevance_cursor(entry: tuple) -> str:
+        return SearchCursor(sort=RELEVANCE_SORT, value=None, entity_id=entry[2]).encode()
+
+    def _cursor_value_fits(self, sort: str, value: Any) -> bool:
+        # datetimes only compare with ones of the same awareness, the stored
+        # ones are ordered together so the first item tells which it is
+        if not isinstance(value, datetime) or not self.items:
+            return True
+
+        stored = getattr(self.items[0], sort, None)
+        return not isinstance(stored, datetime) or \
+            (stored.utcoffset() is None) == (value.utcoffset() is None)
+
+    def _search_by_cursor(
+            self,
+            input_params: SearchParams[Filter],
+            items_filtered: List[ET],
+            cursor: SearchCursor
+        ) -> SearchResult[ET, Filter]:
+        # after wins when both cursors are sent; a page before the cursor is
+        # walked backwards from it and flipped into display order
+        forward = input_params.after is not None
+        entities = self._iter_from_cursor(
+            items_filtered,
+            cursor,
+            input_params.sort_dir == 'desc',
+            forward
+        )
+        window = list(islice(entities, input_params.per_page + 1))
+        items_page = window[:input_params.per_page]
+        has_more = len(window) > input_params.per_page
+        if forward:
+            return self._build_search_result(
+                input_params, items_page, len(items_filtered), has_more, True)
+
+        items_page.reverse()
+        return self._build_search_result(
+            input_params, items_page, len(items_filtered), True, has_more)
+
+    def _iter_from_cursor(
+            self,
+            items: List[ET],
+            cursor: SearchCursor,
+            is_reverse: bool,
+            forward: bool
+        ) -> Iterator[ET]:
+        sort = cursor.sort
+        if sort and f'sort:{sort}' in self._indexes:
+            index: SortedIndex[ET] = self._indexes[f'sort:{sort}']
+            # entities keep their insertion sequence as tie-breaker
+            _, sequence = index.keys.get(cursor.entity_id, (None, -1))
+            entities = index.iter_from(
+                (cursor.value, sequence), descending=is_reverse, forward=forward)
+            if items is not self.items:
+                wanted = set(map(id, items))
+                entities = (entity for entity in entities if id(entity) in wanted)
+
+            return entities
+
+        # the cursor sort is already resolved, None keeps the items order
+        ordered = self._apply_sort(items, sort, 'desc' if is_reverse else 'asc') if sort else items
+        before, after = self._cursor_bounds(ordered, cursor, is_reverse)
+        if forward:
+            return map(ordered.__getitem__, range(after, len(ordered)))
+
+        return map(ordered.__getitem__, range(before - 1, -1, -1))
+
+    def _cursor_bounds(
+            self,
+            items: List[ET],
+            cursor: SearchCursor,
+            is_reverse: bool
+        ) -> Tuple[int, int]:
+        # where the items before the cursor end and the ones after it start;
+        # a cursor whose entity is gone stands before the first item that
+        # reaches its value, as in the sort index, and without a sort before
+        # the first item
+        entity_id = cursor.entity_id
+        if items is self.items and entity_id in self._positions:
+            position = self._position(entity_id)
+            return position, position + 1
+
+        position = next(
+            (position for position, item in enumerate(items) if item.id == entity_id), None)
+        if position is not None:
+            return position, position + 1
+
+        if not cursor.sort:
+            return 0, 0
+
+        value = attrgetter(cursor.sort)
+        if is_reverse:
+            reached = (position for position, item in enumerate(items)
+                       if value(item) <= cursor.value)
+        else:
+            reached = (position for position, item in enumerate(items)
+                       if value(item) >= cursor.value)
+        position = next(reached, len(items))
+        return position, position
+
+    def _build_search_result(
+            self,
+            input_params: SearchParams[Filter],
+            items: List[ET],
+            total: int,
+            has_next: bool,
+            has_prev: bool
+        ) -> SearchResult[ET, Filter]:
+        sort = self._effective_sort(input_params.sort)
+        return SearchResult(
+            items=self._project(items, input_params.fields),
+            total=total,
             current_page=input_params.page,
             per_page=input_params.per_page,
             sort=input_params.sort,
             sort_dir=input_params.sort_dir,
-            filter=input_params.filter
+            filter=input_params.filter,
+            next_cursor=self._cursor_for(items[-1], sort) if items and has_next else None,
+            prev_cursor=self._cursor_for(items[0], sort) if items and has_prev else None
+        )
+
+    def _cursor_for(self, entity: ET, sort: Optional[str]) -> str:
+        value = getattr(entity, sort) if sort else None
+        return SearchCursor(sort=sort, value=value, entity_id=entity.id).encode()
+
+    @staticmethod
+    def _project(items: List[ET], field_names: Optional[Tuple[str, ...]]) -> list:
+        if field_names is None or not items:
+            return items
+
+        return list(map(type(items[0]).projection(field_names), items))
+
+    def _search_cache_key(self, input_params: SearchParams[Filter]) -> tuple:
+        return (type(input_params),) + tuple(
+            getattr(input_params, field_name)
+            for field_name in input_params.__dataclass_fields__
         )
 
     @abc.abstractmethod
     def _apply_filter(self, items: List[ET], filter_param: Filter | None) -> List[ET]:
         raise NotImplementedError()
 
-    def _apply_sort(self, items: List[ET], sort: str | None, sort_dir: str | None) -> List[ET]:
-        if sort and sort in self.sortable_fields:
+    def _iter_filter(self, items: Iterable[ET], filter_param: Filter | None) -> Iterator[ET]:
+        # repositories override it to filter lazily, the fallback collects
+        # the items for _apply_filter
+        if filter_param is None:
+            return iter(items)
+
+        return iter(self._apply_filter(list(items), filter_param))
+
+    def _apply_sort(
+            self,
+            items: List[ET],
+            sort: str | None = None,
+            sort_dir: str | None = None,
+            limit: Optional[int] = None
+        ) -> List[ET]:
+        # when limit is given only the first limit items are returned; search
+        # passes it along with items taken from this repository, which allows
+        # the sorted index of the field to be walked instead of sorting
+        sort = self._effective_sort(sort)
+        if sort:
             is_reverse = sort_dir == 'desc'
-            return sorted(items, key=lambda item: getattr(item, sort), reverse=is_reverse)
+            if limit is not None and self._can_walk_sort_index(items, sort, limit):
+                return self._walk_sort_index(items, sort, is_reverse, limit)
+
+            key = attrgetter(sort)
+            # nsmallest and nlargest match sorted(...)[:limit] including ties,
+            # but only pay off while the page end is small next to the items
+            if limit is not None and limit * 4 < len(items):
+                select = heapq.nlargest if is_reverse else heapq.nsmallest
+                return select(limit, items, key=key)
+
+            return sorted(items, key=key, reverse=is_reverse)
 
         return items
 
@@ -214,3 +955,39 @@ class InMemorySearchableRepository(
         start = (page -1) * per_page
         limit = start + per_page
         return items[slice(start, limit)]
+
+    def _create_indexes(self) -> Dict[str, EntityIndex[ET]]:
+        indexes: Dict[str, EntityIndex[ET]] = {
+            f'sort:{field_name}': SortedIndex(field_name)
+            for field_name in self.sortable_fields
+        }
+        if self.full_text_fields:
+            indexes['fulltext'] = FullTextIndex(self.full_text_fields)
+
+        return indexes
+
+    def _can_walk_sort_index(self, items: List[ET], sort: str, limit: int) -> bool:
+        if f'sort:{sort}' not in self._indexes:
+            return False
+
+        if items is self.items:
+            return True
+
+        # a filtered subset is walked only when finding limit matching
+        # entries in the index is expected to be cheaper than sorting it
+        expected_walk = limit * len(self.items) / max(len(items), 1)
+        return expected_walk <= len(items) * math.log2(len(items) + 1)
+
+    def _walk_sort_index(
+            self,
+            items: List[ET],
+            sort: str,
+            is_reverse: bool,
+            limit: int
+        ) -> List[ET]:
+        entities = self._indexes[f'sort:{sort}'].iter_entities(descending=is_reverse)
+        if items is not self.items:
+            wanted = set(map(id, items))
+            entities = (entity for entity in entities if id(entity) in wanted)
+
+        return list(islice(entities, limit))
@@ -0,0 +1,145 @@
+import copy
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Callable, Dict, Generic, List
+
+from __seedwork.domain.exceptions import NotFoundException, UndoFailedException
+from __seedwork.domain.repository import ET, BulkWriteResult, RepositoryInterface
+from __seedwork.domain.value_objects import UniqueEntityId
+
+
+@dataclass(slots=True)
+class UnitOfWork(Generic[ET]):
+
+    # writes are kept per id until commit and merged, so every entity
+    # reaches the repository at most once, through its bulk operations:
+    # insert then update is one insert, insert then delete is nothing,
+    # delete then insert is one update. A failed commit keeps them, so they
+    # can be fixed and committed again or rolled back
+    repository: RepositoryInterface[ET]
+    _new: Dict[str, ET] = field(default_factory=lambda: {}, init=False, repr=False)
+    _dirty: Dict[str, ET] = field(default_factory=lambda: {}, init=False, repr=False)
+    _removed: Dict[str, str | UniqueEntityId] = field(
+        default_factory=lambda: {}, init=False, repr=False)
+
+    def __enter__(self) -> 'UnitOfWork[ET]':
+        return self
+
+    def __exit__(self, exc_type, *args) -> None:
+        if exc_type is not None:
+            self.rollback()
+            return
+
+        try:
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self._new or self._dirty or self._removed)
+
+    def insert(self, entity: ET) -> None:
+        entity_id = entity.id
+        if self._removed.pop(entity_id, None) is not None or entity_id in self._dirty:
+            self._dirty[entity_id] = entity
+        else:
+            self._new[entity_id] = entity
+
+    def update(self, entity: ET) -> None:
+        entity_id = entity.id
+        if entity_id in self._removed:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        if entity_id in self._new:
+            self._new[entity_id] = entity
+        else:
+            self._dirty[entity_id] = entity
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        id_str = str(entity_id)
+        if id_str in self._removed:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        if self._new.pop(id_str, None) is None:
+            self._dirty.pop(id_str, None)
+            self._removed[id_str] = entity_id
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> ET:
+        # reads see the writes still waiting for the commit; stored entities
+        # are copied, an in-memory repository would hand out its own and
+        # changing them would bypass the unit of work
+        id_str = str(entity_id)
+        if id_str in self._removed:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        entity = self._new.get(id_str) or self._dirty.get(id_str)
+        return entity if entity is not None else copy.copy(self.repository.find_by_id(entity_id))
+
+    def rollback(self) -> None:
+        self._new = {}
+        self._dirty = {}
+        self._removed = {}
+
+    def commit(self) -> None:
+        new = list(self._new.values())
+        dirty = list(self._dirty.values())
+        removed = list(self._removed.values())
+
+        # the entities about to change are read first, a missing one fails
+        # the commit before anything is written and the rest are what a
+        # failed write is undone with, copied so changes made in place to
+        # the stored entities do not reach them
+        originals = {
+            str(entity_id): copy.copy(self.repository.find_by_id(entity_id))
+            for entity_id in chain((entity.id for entity in dirty), removed)
+        }
+
+        undo: List[Callable[[], BulkWriteResult]] = []
+        try:
+            if new:
+                result = self.repository.insert_many(new)
+                inserted = self._succeeded(new, result)
+                undo.append(lambda: self.repository.delete_many(
+                    [entity.id for entity in inserted]))
+                self._raise_errors(result)
+
+            if dirty:
+                result = self.repository.update_many(dirty)
+                updated = self._succeeded(dirty, result)
+                undo.append(lambda: self.repository.update_many(
+                    [originals[entity.id] for entity in updated]))
+                self._raise_errors(result)
+
+            if removed:
+                result = self.repository.delete_many(removed)
+                deleted = self._succeeded(removed, result)
+                # deleted entities come back at the end of the insertion order
+                undo.append(lambda: self.repository.insert_many(
+                    [originals[str(entity_id)] for entity_id in deleted]))
+                self._raise_errors(result)
+        except Exception as error:
+            undo_errors = []
+            for action in reversed(undo):
+                try:
+                    action()
+                except Exception as undo_error:  # pylint: disable=broad-except
+                    undo_errors.append(undo_error)
+            if undo_errors:
+                raise UndoFailedException(undo_errors) from error
+            raise
+
+        self.rollback()
+
+    @staticmethod
+    def _succeeded(values: list, result: BulkWriteResult) -> list:
+        if not result.errors:
+            return values
+
+        return [value for position, value in enumerate(values) if position not in result.errors]
+
+    @staticmethod
+    def _raise_errors(result: BulkWriteResult) -> None:
+        if result.errors:
+            raise next(iter(result.errors.values()))
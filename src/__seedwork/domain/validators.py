@@ -1,14 +1,27 @@
 from abc import ABC
 import abc
-from dataclasses import dataclass
-from typing import Any, Dict, Generic, List, TypeVar
-from rest_framework.fields import BooleanField, CharField
+from collections.abc import Collection as CollectionABC, Mapping
+from datetime import datetime
+import functools
+import keyword
+import numbers
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Collection, Dict, Generic, List, Optional, Tuple, Type, TypeVar
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import (
+    BooleanField, CharField, DateTimeField, SkipField, empty, get_error_detail
+)
 from rest_framework.serializers import Serializer
+from rest_framework.settings import api_settings
 from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 
-from __seedwork.domain.exceptions import ValidationException
+from __seedwork.domain.exceptions import EntityValidationException, ValidationException
 
-if not settings.configured:
+# the domain runs without a Django project, unless one is set up
+if not settings.configured and 'DJANGO_SETTINGS_MODULE' not in os.environ:
     settings.configure(USE_I18N=False)
 
 @dataclass(frozen=True, slots=True)
@@ -48,6 +61,103 @@ class ValidatorRules:
 ErrorFields = Dict[str, List[str]]
 PropsValidated = TypeVar('PropsValidated')
 
+
+# the condition failing each rule and its message, as ValidatorRules checks
+# and words them
+_RULE_CONDITIONS = {
+    'required': "value is None or value == ''",
+    'string': 'value is not None and not isinstance(value, str)',
+    'max_length': 'value is not None and len(value) > {arg}',
+    'boolean': 'value is not None and value not in (True, False)',
+}
+_RULE_MESSAGES = {
+    'required': 'The {prop} is required',
+    'string': 'The {prop} must be a string',
+    'max_length': 'The {prop} must be less than {arg} characters',
+    'boolean': 'The {prop} must be a boolean',
+}
+
+
+@dataclass(frozen=True, slots=True)
+class FieldRules:
+    # the rules of one field in the order they are checked, the first one
+    # failing is the error of the field
+    checks: Tuple[Tuple[str, Any], ...] = ()
+
+    def required(self) -> 'FieldRules':
+        return FieldRules(self.checks + (('required', None),))
+
+    def string(self) -> 'FieldRules':
+        return FieldRules(self.checks + (('string', None),))
+
+    def max_length(self, max_length: int) -> 'FieldRules':
+        return FieldRules(self.checks + (('max_length', int(max_length)),))
+
+    def boolean(self) -> 'FieldRules':
+        return FieldRules(self.checks + (('boolean', None),))
+
+
+def required() -> FieldRules:
+    return FieldRules().required()
+
+
+def string() -> FieldRules:
+    return FieldRules().string()
+
+
+def max_length(length: int) -> FieldRules:
+    return FieldRules().max_length(length)
+
+
+def boolean() -> FieldRules:
+    return FieldRules().boolean()
+
+
+@dataclass(frozen=True, slots=True)
+class RuleSchema:
+
+    # {'name': required().string().max_length(255), ...} compiled once into
+    # a single generated function that reads every field of an entity and
+    # collects their errors, with no object built per field or rule
+    rules: Dict[str, FieldRules]
+    _check: Callable[[Any], ErrorFields] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, '_check', _compile_rules(self.rules))
+
+    def errors(self, entity: Any) -> ErrorFields:
+        return self._check(entity)
+
+    def validate(self, entity: Any) -> None:
+        if errors := self._check(entity):
+            raise EntityValidationException(errors)
+
+
+def _compile_rules(rules: Dict[str, FieldRules]) -> Callable[[Any], ErrorFields]:
+    # messages and arguments are handed to the code as constants, only
+    # checked identifiers are written into the source
+    constants = {}
+    lines = ['def check(entity):', '    errors = {}']
+    for prop, field_rules in rules.items():
+        if not prop.isidentifier() or keyword.iskeyword(prop):
+            raise ValueError(f'The {prop!r} field cannot be read as an attribute')
+
+        branch = 'if'
+        lines.append(f'    value = entity.{prop}')
+        for rule, arg in field_rules.checks:
+            arg_name = f'_arg{len(constants)}'
+            message_name = f'_message{len(constants)}'
+            constants[arg_name] = arg
+            constants[message_name] = _RULE_MESSAGES[rule].format(prop=prop, arg=arg)
+            lines.append(f'    {branch} {_RULE_CONDITIONS[rule].format(arg=arg_name)}:')
+            lines.append(f'        errors[{prop!r}] = [{message_name}]')
+            branch = 'elif'
+    lines.append('    return errors')
+
+    namespace = dict(constants)
+    exec('\n'.join(lines), namespace)  # pylint: disable=exec-used
+    return namespace['check']
+
 @dataclass(slots=True)
 class ValidatorFieldsInterface(ABC, Generic[PropsValidated]):
     errors: ErrorFields = None
@@ -99,3 +209,129 @@ class StrictBooleanField(BooleanField):
             pass
 
         self.fail('invalid', input=data)
+
+
+_SURROGATES = re.compile('[\ud800-\udfff]')
+# a check answering the validated value of the input it accepts, or
+# _UNCHECKED to send the input through the DRF field; it may raise the
+# errors of the field
+_UNCHECKED = object()
+_FastCheck = Callable[[Any], Any]
+# values with no fields to read, refused as a Serializer refuses what is not
+# a dict
+_PLAIN_VALUES = (str, bytes, bytearray, numbers.Number, CollectionABC)
+
+
+class CompiledDRFValidator(ValidatorFieldsInterface[PropsValidated], ABC):
+
+    # the fields of serializer_class are built once per process and run one
+    # by one on the data, a dict or an object such as an entity read with
+    # getattr, with no Serializer instanced per validation. Common valid
+    # values of the strict fields are accepted by plain checks; anything
+    # else goes through the DRF field, so the errors are the ones
+    # DRFValidator gives. Only field rules are run, serializers with
+    # validate hooks are refused
+    serializer_class: ClassVar[Type[Serializer]]
+
+    def validate(self, data: Any, field_names: Optional[Collection[str]] = None) -> bool:
+        # field_names limits the validation to those fields, the others are
+        # neither checked nor required
+        if data is None:
+            data = {}
+        if isinstance(data, Mapping):
+            read = data.get
+        elif isinstance(data, _PLAIN_VALUES):
+            message = Serializer.default_error_messages['invalid']
+            self.errors = {
+                api_settings.NON_FIELD_ERRORS_KEY: [message.format(datatype=type(data).__name__)]
+            }
+            return False
+        else:
+            read = functools.partial(getattr, data)
+
+        errors: ErrorFields = {}
+        validated_data = {}
+        for name, drf_field, fast_check in _compile_serializer(self.serializer_class):
+            if field_names is not None and name not in field_names:
+                continue
+
+            value = read(name, empty)
+            try:
+                if fast_check is None or (validated := fast_check(value)) is _UNCHECKED:
+                    validated = drf_field.run_validation(value)
+            except ValidationError as exception:
+                errors[name] = [str(error) for error in exception.detail]
+            except DjangoValidationError as exception:
+                errors[name] = [str(error) for error in get_error_detail(exception)]
+            except SkipField:
+                pass
+            else:
+                validated_data[name] = validated
+
+        if errors:
+            self.errors = errors
+            return False
+
+        self.validated_data = validated_data
+        return True
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_serializer(
+        serializer_class: Type[Serializer]
+    ) -> Tuple[Tuple[str, Any, Optional[_FastCheck]], ...]:
+    drf_fields = serializer_class().fields
+    if serializer_class.validate is not Serializer.validate or any(
+            hasattr(serializer_class, f'validate_{name}') for name in drf_fields):
+        raise TypeError(f'{serializer_class.__name__} has validate hooks, use DRFValidator')
+
+    return tuple(
+        (name, drf_field, _fast_check(drf_field))
+        for name, drf_field in drf_fields.items()
+    )
+
+
+def _fast_check(drf_field: Any) -> Optional[_FastCheck]:
+    # custom validators or a source other than the field name leave the
+    # field to DRF
+    if drf_field.source != drf_field.field_name:
+        return None
+
+    if type(drf_field) is StrictBooleanField and not drf_field.validators:
+        return lambda value: value if value is True or value is False else _UNCHECKED
+
+    if type(drf_field) is StrictCharField:
+        return _char_check(drf_field)
+
+    if type(drf_field) is DateTimeField and not drf_field.validators:
+        # what DateTimeField.to_internal_value does with a datetime
+        enforce_timezone = drf_field.enforce_timezone
+        return lambda value: enforce_timezone(value) if type(value) is datetime else _UNCHECKED
+
+    return None
+
+
+def _char_check(drf_field: StrictCharField) -> Optional[_FastCheck]:
+    # CharField adds the length, null character and surrogate validators
+    expected = 2 + (drf_field.max_length is not None) + (drf_field.min_length is not None)
+    if len(drf_field.validators) != expected:
+        return None
+
+    max_length = drf_field.max_length
+    min_length = drf_field.min_length or 0
+    trim_whitespace = drf_field.trim_whitespace
+
+    def check(value: Any) -> Any:
+        # blank and whitespace only values are left to the field
+        if type(value) is not str or not value.strip():
+            return _UNCHECKED
+
+        internal = value.strip() if trim_whitespace else value
+        if (max_length is not None and len(internal) > max_length) or \
+                len(internal) < min_length or '\x00' in internal or \
+                (not internal.isascii() and _SURROGATES.search(internal)):
+            return _UNCHECKED
+
+        return internal
+
+    return check
@@ -0,0 +1,57 @@
+from dataclasses import fields
+import functools
+from types import MemberDescriptorType
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.value_objects import UniqueEntityId
+
+T = TypeVar('T', bound=Entity)
+
+
+def hydrate(entity_class: Type[T], entity_id: str, **values: Any) -> T:
+    # for repositories only: rebuilds an entity from values a valid one
+    # was stored with, every field given, without running the validation
+    # or parsing the id again
+    return hydrator(entity_class)(entity_id, values)
+
+
+def _setter(cls: type, name: str) -> Callable[[Any, Any], None]:
+    # the slot descriptor writes straight into the instance, skipping the
+    # __setattr__ a frozen dataclass guards itself with
+    descriptor = getattr(cls, name, None)
+    if isinstance(descriptor, MemberDescriptorType):
+        return descriptor.__set__
+
+    return lambda instance, value: object.__setattr__(instance, name, value)
+
+
+_set_unique_entity_id = _setter(UniqueEntityId, 'id')
+
+
+@functools.lru_cache(maxsize=None)
+def hydrator(entity_class: Type[T]) -> Callable[[str, Dict[str, Any]], T]:
+    # hydrate for one entity class, taking the values as a dict; loops
+    # rebuilding many rows call it directly
+    setters = tuple(
+        (entity_field.name, _setter(entity_class, entity_field.name))
+        for entity_field in fields(entity_class) if entity_field.name != 'unique_entity_id'
+    )
+    set_unique_entity_id = _setter(entity_class, 'unique_entity_id')
+
+    def hydrate_values(entity_id: str, values: Dict[str, Any]) -> T:
+        unique_entity_id = object.__new__(UniqueEntityId)
+        _set_unique_entity_id(unique_entity_id, entity_id)
+        entity = object.__new__(entity_class)
+        set_unique_entity_id(entity, unique_entity_id)
+        try:
+            for name, setter in setters:
+                setter(entity, values[name])
+        except KeyError as error:
+            raise TypeError(f'{entity_class.__name__} needs every field') from error
+        if len(values) != len(setters):
+            raise TypeError(f'{entity_class.__name__} got unknown fields')
+
+        return entity
+
+    return hydrate_values
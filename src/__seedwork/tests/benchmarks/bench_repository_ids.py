@@ -0,0 +1,75 @@
+"""
+Compares id lookups, updates and deletes of InMemoryRepository against the
+previous linear scan implementation.
+
+Run from the src folder:
+    python -m __seedwork.tests.benchmarks.bench_repository_ids [sizes...]
+"""
+from dataclasses import dataclass
+import random
+import sys
+import timeit
+from typing import List
+
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import InMemoryRepository
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+OPERATIONS = 20
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class BenchEntity(Entity):
+    name: str
+
+
+class IndexedRepository(InMemoryRepository[BenchEntity]):
+    pass
+
+
+class LinearRepository(InMemoryRepository[BenchEntity]):
+
+    def insert(self, entity: BenchEntity) -> None:
+        self.items.append(entity)
+
+    def update(self, entity: BenchEntity) -> None:
+        entity_found = self._get(entity.id)
+        index = self.items.index(entity_found)
+        self.items[index] = entity
+
+    def delete(self, entity_id):
+        entity_found = self._get(str(entity_id))
+        self.items.remove(entity_found)
+
+    def _get(self, entity_id: str) -> BenchEntity:
+        if entity := next(
+            filter(lambda item: item.id == entity_id, self.items), None
+        ):
+            return entity
+
+        raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+
+def measure(repo: InMemoryRepository, entities: List[BenchEntity], sample: List[BenchEntity]):
+    repo.items = list(entities)
+    repo.find_by_id(entities[0].id)
+
+    find = timeit.timeit(lambda: [repo.find_by_id(e.id) for e in sample], number=1)
+    update = timeit.timeit(lambda: [repo.update(e) for e in sample], number=1)
+    delete = timeit.timeit(lambda: [repo.delete(e.id) for e in sample], number=1)
+    return [value / len(sample) * 1_000_000 for value in (find, update, delete)]
+
+
+def main(sizes: List[int]):
+    print(f"{'size':>10} {'backend':>8} {'find (us)':>12} {'update (us)':>12} {'delete (us)':>12}")
+    for size in sizes:
+        entities = [BenchEntity(name=f'entity {i}') for i in range(size)]
+        sample = random.Random(size).sample(entities, OPERATIONS)
+        for name, repo in (('linear', LinearRepository()), ('indexed', IndexedRepository())):
+            find, update, delete = measure(repo, entities, sample)
+            print(f'{size:>10} {name:>8} {find:>12.2f} {update:>12.2f} {delete:>12.2f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
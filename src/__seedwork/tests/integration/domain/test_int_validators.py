@@ -1,7 +1,12 @@
 import unittest
 
 from rest_framework import serializers
-from __seedwork.domain.validators import DRFValidator, StrictBooleanField, StrictCharField
+from __seedwork.domain.validators import (
+    CompiledDRFValidator,
+    DRFValidator,
+    StrictBooleanField,
+    StrictCharField
+)
 
 # pylint: disable=abstract-method
 class StubSerializer(serializers.Serializer):
@@ -37,6 +42,71 @@ class TestDRFValidatorIntegration(unittest.TestCase):
             }
         )
 
+# pylint: disable=abstract-method
+class StrictStubSerializer(serializers.Serializer):
+    name = StrictCharField(max_length=5, min_length=2)
+    code = StrictCharField(allow_blank=True, trim_whitespace=False, required=False)
+    tag = StrictCharField(required=False, validators=[lambda value: None])
+    is_active = StrictBooleanField(required=False)
+    price = serializers.IntegerField(required=False)
+
+
+class StrictStubValidator(CompiledDRFValidator):
+    serializer_class = StrictStubSerializer
+
+
+class TestCompiledDRFValidatorIntegration(unittest.TestCase):
+
+    def test_errors_and_validated_data_match_drf_validator(self):
+        arrange = [
+            None,
+            {},
+            {'name': 'ab'},
+            {'name': ' ab  ', 'code': ' x ', 'tag': ' t ', 'is_active': False, 'price': '5'},
+            {'name': 'a'},
+            {'name': '   a  '},
+            {'name': 'abcdef'},
+            {'name': 'ab\x00'},
+            {'name': 'ab\ud800'},
+            {'name': 'ação'},
+            {'name': '  ', 'code': '  '},
+            {'name': 5, 'code': '', 'tag': None, 'is_active': 1, 'price': 'x'},
+            {'name': None, 'is_active': None},
+            {'name': True, 'tag': '', 'is_active': 'true'},
+        ]
+        for data in arrange:
+            expected = DRFValidator()
+            expected_is_valid = expected.validate(StrictStubSerializer(
+                data=data if data is not None else {}))
+            validator = StrictStubValidator()
+            self.assertEqual(validator.validate(data), expected_is_valid, data)
+            self.assertEqual(validator.errors, expected.errors, data)
+            self.assertEqual(list(validator.errors or []), list(expected.errors or []), data)
+            self.assertEqual(validator.validated_data, expected.validated_data, data)
+
+    def test_reads_the_attributes_of_an_object(self):
+        # pylint: disable=too-few-public-methods
+        class Stub:
+            name = 'abc'
+            is_active = 5
+
+        validator = StrictStubValidator()
+        self.assertFalse(validator.validate(Stub()))
+        self.assertEqual(validator.errors, {'is_active': ['Must be a valid boolean.']})
+
+    def test_refuses_serializers_with_validate_hooks(self):
+        class HookedSerializer(StubSerializer):
+            def validate_name(self, value):
+                return value
+
+        # pylint: disable=abstract-method
+        class HookedValidator(CompiledDRFValidator):
+            serializer_class = HookedSerializer
+
+        with self.assertRaises(TypeError):
+            HookedValidator().validate({})
+
+
 class TestStrictCharFieldIntegration(unittest.TestCase):
 
     def test_if_is_invalid_when_not_str_values(self):
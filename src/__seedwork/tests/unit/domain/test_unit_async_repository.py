@@ -0,0 +1,245 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List
+import unittest
+from __seedwork.domain.async_repository import (
+    AsyncInMemorySearchableRepository,
+    AsyncRepositoryInterface,
+    AsyncSearchableRepositoryInterface,
+    ExecutorSearchableRepository
+)
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import (
+    BulkWriteResult,
+    InMemorySearchableRepository,
+    SearchParams
+)
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubEntity(Entity):
+    name: str
+    price: float
+
+
+class StubInMemorySearchableRepository(InMemorySearchableRepository[StubEntity, str]):
+    sortable_fields: List[str] = ['name', 'price']
+    search_chunk_size = 4
+
+    def _apply_filter(self, items: List[StubEntity], filter_param: str | None) -> List[StubEntity]:
+        if filter_param:
+            return [item for item in items if filter_param.lower() in item.name.lower()]
+
+        return items
+
+
+class TestAsyncRepositoryInterface(unittest.IsolatedAsyncioTestCase):
+
+    def test_throw_error_when_methods_not_implemented(self):
+        with self.assertRaises(TypeError) as assert_error:
+            # pylint: disable=abstract-class-instantiated
+            AsyncRepositoryInterface()
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class AsyncRepositoryInterface with "+
+            "abstract methods delete, find_all, find_by_id, insert, update"
+        )
+
+        with self.assertRaises(TypeError) as assert_error:
+            # pylint: disable=abstract-class-instantiated
+            AsyncSearchableRepositoryInterface()
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class AsyncSearchableRepositoryInterface with "+
+            "abstract methods delete, find_all, find_by_id, insert, search, update"
+        )
+
+    def test_sortable_fields(self):
+        self.assertEqual(AsyncSearchableRepositoryInterface.sortable_fields, [])
+
+    async def test_bulk_methods_fall_back_to_single_entity_methods(self):
+        # pylint: disable=too-few-public-methods
+        class DictRepository(AsyncRepositoryInterface):
+            def __init__(self):
+                self.entities = {}
+
+            async def insert(self, entity):
+                self.entities[entity.id] = entity
+
+            async def find_by_id(self, entity_id):
+                if str(entity_id) not in self.entities:
+                    raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+                return self.entities[str(entity_id)]
+
+            async def find_all(self):
+                return list(self.entities.values())
+
+            async def update(self, entity):
+                await self.find_by_id(entity.id)
+                self.entities[entity.id] = entity
+
+            async def delete(self, entity_id):
+                await self.find_by_id(entity_id)
+                del self.entities[str(entity_id)]
+
+        repo = DictRepository()
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(2)]
+        self.assertEqual(await repo.insert_many(entities), BulkWriteResult(succeeded=2))
+
+        result = await repo.update_many([StubEntity(name='unknown', price=1), entities[1]])
+        self.assertEqual(result.succeeded, 1)
+        self.assertEqual(list(result.errors), [0])
+
+        result = await repo.delete_many([entities[0].id, '1'])
+        self.assertEqual(result.succeeded, 1)
+        self.assertEqual(list(result.errors), [1])
+        self.assertEqual(await repo.find_all(), [entities[1]])
+        self.assertTrue(await repo.exists(entities[1].id))
+        self.assertFalse(await repo.exists(entities[0].id))
+
+
+class TestAsyncInMemorySearchableRepository(unittest.IsolatedAsyncioTestCase):
+
+    sync_repo: StubInMemorySearchableRepository
+    repo: AsyncInMemorySearchableRepository
+
+    def setUp(self) -> None:
+        self.sync_repo = StubInMemorySearchableRepository()
+        self.repo = AsyncInMemorySearchableRepository(self.sync_repo)
+
+    async def test_writes_and_lookups(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+        await self.repo.insert(entities[0])
+        await self.repo.insert_many(entities[1:])
+        self.assertEqual(await self.repo.find_all(), entities)
+        self.assertEqual(await self.repo.find_by_id(entities[1].id), entities[1])
+
+        updated = StubEntity(unique_entity_id=entities[1].unique_entity_id, name='New', price=9)
+        await self.repo.update(updated)
+        self.assertEqual(self.sync_repo.find_by_id(updated.id), updated)
+
+        await self.repo.delete(entities[0].id)
+        result = await self.repo.delete_many([entities[0].id, entities[2].id])
+        self.assertEqual(list(result.errors), [0])
+        self.assertEqual(await self.repo.find_all(), [updated])
+        self.assertTrue(await self.repo.exists(updated.id))
+        self.assertFalse(await self.repo.exists(entities[0].id))
+        self.assertEqual(await self.repo.count(), 1)
+        self.assertEqual(await self.repo.count('new'), 1)
+        self.assertEqual(await self.repo.count('test'), 0)
+
+        with self.assertRaises(NotFoundException):
+            await self.repo.find_by_id(entities[0].id)
+
+    async def test_search_matches_the_sync_search(self):
+        entities = [
+            StubEntity(name=name, price=price % 3)
+            for price, name in enumerate('dbadcabdcaebadca')
+        ]
+        self.sync_repo.insert_many(entities)
+
+        arrange = [
+            SearchParams(),
+            SearchParams(page=2, per_page=4, sort='price', sort_dir='desc'),
+            SearchParams(page=1, per_page=3, sort='name', filter='a'),
+            SearchParams(page=2, per_page=2, sort='price', filter='b'),
+        ]
+
+        for params in arrange:
+            self.assertEqual(
+                await self.repo.search(params),
+                self.sync_repo.search(params),
+                f"The output using {params} is different"
+            )
+
+        params = SearchParams(per_page=4, filter='a')
+        self.assertEqual(
+            [entity async for entity in self.repo.iter_search(params)],
+            self.sync_repo.search(params).items
+        )
+
+    async def test_search_gives_the_event_loop_back_between_chunks(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(40)]
+        self.sync_repo.insert_many(entities)
+
+        finished = []
+
+        async def search():
+            await self.repo.search(SearchParams(filter='test', sort='price'))
+            finished.append('search')
+
+        async def find():
+            await self.repo.find_by_id(entities[0].id)
+            finished.append('find')
+
+        await asyncio.gather(search(), find())
+        self.assertEqual(finished, ['find', 'search'])
+
+    async def test_writes_wait_for_running_searches(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(40)]
+        self.sync_repo.insert_many(entities)
+        params = SearchParams(filter='test', per_page=50)
+
+        search = asyncio.ensure_future(self.repo.search(params))
+        await asyncio.sleep(0)
+        await self.repo.delete(entities[0].id)
+
+        self.assertTrue(search.done())
+        self.assertEqual(search.result().items, entities)
+        self.assertEqual((await self.repo.search(params)).items, entities[1:])
+
+    async def test_searches_queue_behind_a_waiting_write(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(40)]
+        self.sync_repo.insert_many(entities)
+        params = SearchParams(filter='test', per_page=50)
+
+        running = asyncio.ensure_future(self.repo.search(params))
+        await asyncio.sleep(0)
+        write = asyncio.ensure_future(self.repo.delete(entities[0].id))
+        await asyncio.sleep(0)
+        queued = asyncio.ensure_future(self.repo.search(params))
+        await asyncio.gather(running, write, queued)
+
+        self.assertEqual(running.result().items, entities)
+        self.assertEqual(queued.result().items, entities[1:])
+
+    def test_can_be_used_from_several_event_loops(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(40)]
+        self.sync_repo.insert_many(entities)
+
+        async def search_and_delete(entity):
+            await asyncio.gather(
+                self.repo.search(SearchParams(filter='test')), self.repo.delete(entity.id))
+
+        for entity in entities[:2]:
+            asyncio.run(search_and_delete(entity))
+        self.assertEqual(self.sync_repo.find_all(), entities[2:])
+
+
+class TestExecutorSearchableRepository(unittest.IsolatedAsyncioTestCase):
+
+    async def test_delegates_to_the_sync_repository(self):
+        sync_repo = StubInMemorySearchableRepository()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            repo = ExecutorSearchableRepository(sync_repo, executor)
+            entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+
+            await repo.insert(entities[0])
+            await repo.insert_many(entities[1:])
+            self.assertEqual(await repo.find_by_id(entities[2].id), entities[2])
+            await repo.delete(entities[2].id)
+            self.assertEqual(await repo.find_all(), entities[:2])
+            self.assertEqual([entity async for entity in repo.iter_all()], entities[:2])
+
+            params = SearchParams(sort='price', sort_dir='desc')
+            self.assertEqual(await repo.search(params), sync_repo.search(params))
+            self.assertEqual(await repo.count('test'), 2)
+            self.assertTrue(await repo.exists(entities[0].id))
+            self.assertFalse(await repo.exists(entities[2].id))
+
+            with self.assertRaises(NotFoundException):
+                await repo.update(entities[2])
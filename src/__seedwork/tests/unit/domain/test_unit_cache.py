@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch
+
+from __seedwork.domain.cache import CacheInfo, LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    cache: LRUCache[str, int]
+
+    def setUp(self) -> None:
+        self.cache = LRUCache(max_size=2)
+
+    def test_get_and_set(self):
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('a', 0), 0)
+
+        self.cache.set('a', 1)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+
+    def test_clear(self):
+        self.cache.set('a', 1)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_info(self):
+        self.cache.set('a', 1)
+        self.cache.get('a')
+        self.cache.get('a')
+        self.cache.get('b')
+
+        self.assertEqual(
+            self.cache.info(),
+            CacheInfo(hits=2, misses=1, max_size=2, size=1)
+        )
+
+    def test_expires_entries_after_ttl(self):
+        cache = LRUCache(max_size=2, ttl=10)
+        with patch('time.monotonic', return_value=100):
+            cache.set('a', 1)
+        with patch('time.monotonic', return_value=109):
+            self.assertEqual(cache.get('a'), 1)
+            self.assertEqual(cache.peek('a'), 1)
+        with patch('time.monotonic', return_value=110):
+            self.assertIsNone(cache.peek('a'))
+            self.assertIsNone(cache.get('a'))
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.info().expirations, 1)
+
+    def test_peek_and_pop(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.assertEqual(self.cache.peek('a'), 1)
+        self.cache.set('c', 3)
+
+        self.assertIsNone(self.cache.peek('a'))
+        self.assertEqual(self.cache.pop('b'), 2)
+        self.assertIsNone(self.cache.pop('b'))
+        self.assertEqual(list(self.cache.items()), [('c', 3)])
+        self.assertEqual(self.cache.info().hits, 0)
+
+    def test_evictions_and_memory(self):
+        cache = LRUCache(max_size=2, size_of=len)
+        cache.set('a', 'x' * 10)
+        cache.set('b', 'x' * 20)
+        cache.set('a', 'x' * 5)
+        cache.set('c', 'x' * 1)
+        cache.get('a')
+        cache.get('b')
+
+        info = cache.info()
+        self.assertEqual((info.evictions, info.memory, info.size), (1, 6, 2))
+        self.assertEqual(info.hit_ratio, 0.5)
+        self.assertEqual(CacheInfo(hits=0, misses=0, max_size=1, size=0).hit_ratio, 0.0)
+
+        cache.clear()
+        self.assertEqual(cache.info().memory, 0)
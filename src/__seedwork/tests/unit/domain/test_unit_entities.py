@@ -1,6 +1,7 @@
 from abc import ABC
 from dataclasses import dataclass, is_dataclass
 import unittest
+from unittest.mock import patch
 
 from __seedwork.domain.entities import Entity
 from __seedwork.domain.value_objects import UniqueEntityId
@@ -52,6 +53,44 @@ class TestUnitEntities(unittest.TestCase):
         }
         )
 
+    def test_projection(self):
+        entity = StubEntity(
+            unique_entity_id=UniqueEntityId(
+                '444384e5-534e-4037-b09f-e5fca7596031'),
+            prop1='value1',
+            prop2='value2'
+        )
+
+        arrange = [
+            {'fields': ['prop2', 'id'], 'expected': {
+                'prop2': 'value2', 'id': '444384e5-534e-4037-b09f-e5fca7596031'}},
+            {'fields': ['prop1'], 'expected': {'prop1': 'value1'}},
+            {'fields': ['prop1', 'fake', 'unique_entity_id', 'prop1'], 'expected': {
+                'prop1': 'value1'}},
+            {'fields': ['fake'], 'expected': {}},
+        ]
+        for i in arrange:
+            self.assertEqual(StubEntity.projected_fields(i['fields']), tuple(i['expected']))
+            projected = StubEntity.projection(i['fields'])(entity)
+            self.assertEqual(projected, i['expected'])
+            self.assertEqual(list(projected), list(i['expected']))
+
+        self.assertIs(StubEntity.projection(('prop1',)), StubEntity.projection(['prop1']))
+
+    def test_change_method_validates_before_setting(self):
+        entity = StubEntity(prop1='value1', prop2='value2')
+
+        # pylint: disable=protected-access
+        with patch.object(StubEntity, '_validate_fields') as validate_fields:
+            entity._change(prop1='changed')
+        validate_fields.assert_called_once_with({'prop1': 'changed'})
+        self.assertEqual((entity.prop1, entity.prop2), ('changed', 'value2'))
+
+        with patch.object(StubEntity, '_validate_fields', side_effect=ValueError):
+            with self.assertRaises(ValueError):
+                entity._change(prop1='invalid', prop2='invalid')
+        self.assertEqual((entity.prop1, entity.prop2), ('changed', 'value2'))
+
     def test_set_method(self):
         entity = StubEntity(
             prop1='value1',
@@ -0,0 +1,355 @@
+from dataclasses import dataclass
+import math
+import random
+from typing import Dict, List, Optional
+import unittest
+
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.indexes import (
+    EntityIndex, FullTextIndex, HashIndex, NgramIndex, SortedIndex, tokenize
+)
+
+
+class TestEntityIndex(unittest.TestCase):
+
+    def test_throw_error_when_methods_not_implemented(self):
+        with self.assertRaises(TypeError) as assert_error:
+            # pylint: disable=abstract-class-instantiated
+            EntityIndex()
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class EntityIndex with "+
+            "abstract methods add, rebuild, remove"
+        )
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubEntity(Entity):
+    name: str
+    price: float
+
+
+class TestSortedIndex(unittest.TestCase):
+
+    index: SortedIndex[StubEntity]
+
+    def setUp(self) -> None:
+        self.index = SortedIndex('name')
+
+    def test_rebuild(self):
+        items = [
+            StubEntity(name='b', price=1),
+            StubEntity(name='a', price=2),
+            StubEntity(name='b', price=3),
+        ]
+        self.index.rebuild([item.id for item in items], items)
+
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(
+            list(self.index.iter_entities()),
+            [items[1], items[0], items[2]]
+        )
+
+    def test_iter_entities_keeps_ties_in_insertion_order(self):
+        items = [
+            StubEntity(name='b', price=1),
+            StubEntity(name='a', price=2),
+            StubEntity(name='b', price=3),
+            StubEntity(name='c', price=4),
+            StubEntity(name='a', price=5),
+        ]
+        for item in items:
+            self.index.add(item.id, item)
+
+        self.assertEqual(
+            list(self.index.iter_entities()),
+            sorted(items, key=lambda item: item.name)
+        )
+        self.assertEqual(
+            list(self.index.iter_entities(descending=True)),
+            sorted(items, key=lambda item: item.name, reverse=True)
+        )
+
+    def test_iter_from(self):
+        items = [StubEntity(name=name, price=1) for name in 'bacbdab']
+        for item in items:
+            self.index.add(item.id, item)
+
+        for descending in [False, True]:
+            ordered = sorted(items, key=lambda item: item.name, reverse=descending)
+            for position, item in enumerate(ordered):
+                key = self.index.keys[item.id]
+                self.assertEqual(
+                    list(self.index.iter_from(key, descending=descending)),
+                    ordered[position + 1:]
+                )
+                self.assertEqual(
+                    list(self.index.iter_from(key, descending=descending, forward=False)),
+                    ordered[:position][::-1]
+                )
+
+    def test_between(self):
+        items = [StubEntity(name=name, price=1) for name in 'dbacbe']
+        for item in items:
+            self.index.add(item.id, item)
+
+        self.assertEqual(
+            [entity for _, _, entity in self.index.between('b', 'c')],
+            [items[1], items[4], items[3]]
+        )
+        self.assertEqual([entity for _, _, entity in self.index.between(high='a')], [items[2]])
+        self.assertEqual(len(self.index.between(low='c')), 3)
+        self.assertEqual(self.index.count_between('b', 'd'), 4)
+        self.assertEqual(self.index.count_between('bb', 'bc'), 0)
+        self.assertEqual(self.index.count_between('e', 'a'), 0)
+        self.assertEqual(self.index.count_between(), len(items))
+
+    def test_replace_and_remove(self):
+        items = [
+            StubEntity(name='a', price=1),
+            StubEntity(name='b', price=2),
+            StubEntity(name='c', price=3),
+        ]
+        for item in items:
+            self.index.add(item.id, item)
+
+        item_replaced = StubEntity(
+            unique_entity_id=items[0].unique_entity_id,
+            name='c',
+            price=4
+        )
+        self.index.replace(item_replaced.id, item_replaced)
+        self.assertEqual(
+            list(self.index.iter_entities()),
+            [items[1], item_replaced, items[2]]
+        )
+
+        self.index.remove(items[2].id)
+        self.assertEqual(
+            list(self.index.iter_entities()),
+            [items[1], item_replaced]
+        )
+
+
+class TestNgramIndex(unittest.TestCase):
+
+    index: NgramIndex[StubEntity]
+
+    def setUp(self) -> None:
+        self.index = NgramIndex('name')
+
+    def test_search(self):
+        items = [
+            StubEntity(name='Movie', price=1),
+            StubEntity(name='MOVIES', price=2),
+            StubEntity(name='Documentary', price=3),
+        ]
+        self.index.rebuild([item.id for item in items], items)
+
+        self.assertEqual(self.index.search('movi'), {items[0].id, items[1].id})
+        self.assertEqual(self.index.search('IES'), {items[1].id})
+        self.assertEqual(self.index.search('vim'), set())
+        self.assertEqual(self.index.search('documentary film'), set())
+        self.assertIsNone(self.index.search('mo'))
+        self.assertEqual(self.index.estimate('movies'), 1)
+        self.assertEqual(self.index.estimate('MOV'), 2)
+        self.assertEqual(self.index.estimate('xyz'), 0)
+        self.assertIsNone(self.index.estimate('mo'))
+
+    def test_replace_and_remove(self):
+        item = StubEntity(name='Movie', price=1)
+        self.index.add(item.id, item)
+
+        item_replaced = StubEntity(
+            unique_entity_id=item.unique_entity_id,
+            name='Series',
+            price=1
+        )
+        self.index.replace(item.id, item_replaced)
+        self.assertEqual(self.index.search('movie'), set())
+        self.assertEqual(self.index.search('series'), {item.id})
+
+        self.index.remove(item.id)
+        self.assertEqual(self.index.search('series'), set())
+        self.assertEqual(self.index.grams, {})
+
+
+class TestHashIndex(unittest.TestCase):
+
+    index: HashIndex[StubEntity]
+
+    def setUp(self) -> None:
+        self.index = HashIndex('price')
+
+    def test_search(self):
+        items = [StubEntity(name=name, price=price) for name, price in zip('abc', [1, 2, 1])]
+        self.index.rebuild([item.id for item in items], items)
+
+        self.assertEqual(self.index.search(1), {items[0].id, items[2].id})
+        self.assertEqual(self.index.search(2), {items[1].id})
+        self.assertEqual(self.index.search(3), set())
+
+    def test_replace_and_remove(self):
+        item = StubEntity(name='a', price=1)
+        self.index.add(item.id, item)
+
+        self.index.replace(item.id, StubEntity(
+            unique_entity_id=item.unique_entity_id, name='a', price=2))
+        self.assertEqual(self.index.search(1), set())
+        self.assertEqual(self.index.search(2), {item.id})
+
+        self.index.remove(item.id)
+        self.assertEqual(self.index.buckets, {})
+        self.assertEqual(self.index.values, {})
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubDocument(Entity):
+    title: str
+    body: Optional[str] = None
+
+
+def bm25_scores(items: List[StubDocument], query: str) -> Dict[str, float]:
+    # the score of every document holding all the query terms, computed
+    # from scratch with the title counting twice
+    def length(item):
+        return 2 * len(tokenize(item.title)) + len(tokenize(item.body))
+
+    average = sum(map(length, items)) / len(items)
+    terms = set(tokenize(query))
+    scores = {}
+    for item in items:
+        frequencies = {}
+        for token in tokenize(item.title):
+            frequencies[token] = frequencies.get(token, 0) + 2
+        for token in tokenize(item.body):
+            frequencies[token] = frequencies.get(token, 0) + 1
+        if not terms <= frequencies.keys():
+            continue
+
+        score = 0.0
+        for term in terms:
+            held = sum(1 for other in items if term in tokenize(
+                f'{other.title} {other.body or ""}'))
+            idf = math.log(1 + (len(items) - held + 0.5) / (held + 0.5))
+            frequency = frequencies[term]
+            score += idf * frequency * 2.2 / (
+                frequency + 1.2 * (0.25 + 0.75 * length(item) / average))
+        scores[item.id] = score
+
+    return scores
+
+
+class TestFullTextIndex(unittest.TestCase):
+
+    index: FullTextIndex[StubDocument]
+
+    def setUp(self) -> None:
+        self.index = FullTextIndex({'title': 2.0, 'body': 1.0})
+
+    def ranked_ids(self, query: str, **kwargs):
+        return [entity_id for _, _, entity_id in self.index.ranked(query, **kwargs)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize('Ação, AÇÃO e ação!'), ['acao', 'acao', 'e', 'acao'])
+        self.assertEqual(tokenize('Straße 2024'), ['strasse', '2024'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_ranked_by_score_with_ties_in_insertion_order(self):
+        items = [
+            StubDocument(title='Drama', body='sad movies'),
+            StubDocument(title='Comedy', body='funny movies and drama'),
+            StubDocument(title='Drama', body='sad movies'),
+            StubDocument(title='Kids'),
+        ]
+        self.index.rebuild([item.id for item in items], items)
+
+        self.assertEqual(
+            self.ranked_ids('DRAMA'), [items[0].id, items[2].id, items[1].id])
+        self.assertEqual(
+            self.ranked_ids('drama', descending=True), [items[1].id, items[2].id, items[0].id])
+        self.assertEqual(self.ranked_ids('drama funny'), [items[1].id])
+        self.assertEqual(self.ranked_ids('drama horror'), [])
+        self.assertEqual(self.ranked_ids('!!'), [])
+        self.assertEqual(self.index.count('movies'), 3)
+        self.assertEqual(self.index.count('movies sad'), 2)
+        self.assertEqual(self.index.count('horror'), 0)
+
+        score, sequence, _ = next(self.index.ranked('drama'))
+        self.assertEqual(
+            self.ranked_ids('drama', start=(score, sequence)), [items[2].id, items[1].id])
+
+    def test_ranked_merges_ties_across_frequency_groups(self):
+        items = [
+            StubDocument(title='movie film'),
+            StubDocument(title='film movie'),
+            StubDocument(title='movie movie film'),
+            StubDocument(title='film film movie'),
+        ]
+        for item in items:
+            self.index.add(item.id, item)
+
+        expected = [items[2].id, items[3].id, items[0].id, items[1].id]
+        self.assertEqual(self.ranked_ids('movie film'), expected)
+        self.assertEqual(self.ranked_ids('film movie', descending=True), expected[::-1])
+        self.assertEqual(self.index.count('movie film'), 4)
+
+    def test_ranked_matches_a_full_bm25_scoring(self):
+        generator = random.Random(1)
+        words = ['movie', 'série', 'serie', 'drama', 'kids', 'news']
+        def document(**kwargs):
+            return StubDocument(
+                title=' '.join(generator.choices(words, k=generator.randint(1, 3))),
+                body=generator.choice([None, ' '.join(generator.choices(words, k=4))]),
+                **kwargs
+            )
+
+        items = [document() for _ in range(300)]
+        for item in items:
+            self.index.add(item.id, item)
+        for position in generator.sample(range(300), 60):
+            items[position] = document(unique_entity_id=items[position].unique_entity_id)
+            self.index.replace(items[position].id, items[position])
+        for position in sorted(generator.sample(range(300), 30), reverse=True):
+            self.index.remove(items.pop(position).id)
+
+        sequences = self.index.sequences
+        for query in ['serie', 'movie drama', 'kids news movie', 'news news']:
+            scores = bm25_scores(items, query)
+            expected = [
+                entity_id for _, _, entity_id in sorted(
+                    (-score, sequences[entity_id], entity_id)
+                    for entity_id, score in scores.items())
+            ]
+            ranked = list(self.index.ranked(query))
+            self.assertEqual([entity_id for _, _, entity_id in ranked], expected, query)
+            for score, _, entity_id in ranked:
+                self.assertAlmostEqual(score, scores[entity_id])
+                self.assertEqual(self.index.score(query, entity_id), score)
+            self.assertEqual(self.index.count(query), len(expected))
+            self.assertEqual(self.ranked_ids(query, descending=True), expected[::-1])
+
+            middle = ranked[len(ranked) // 2]
+            self.assertEqual(
+                self.ranked_ids(query, start=middle[:2]), expected[len(ranked) // 2 + 1:])
+            self.assertEqual(
+                self.ranked_ids(query, descending=True, start=middle[:2]),
+                expected[:len(ranked) // 2][::-1]
+            )
+
+    def test_replace_and_remove(self):
+        item = StubDocument(title='Movie')
+        self.index.add(item.id, item)
+
+        item_replaced = StubDocument(unique_entity_id=item.unique_entity_id, title='Series')
+        self.index.replace(item.id, item_replaced)
+        self.assertEqual(self.ranked_ids('movie'), [])
+        self.assertEqual(self.ranked_ids('series'), [item.id])
+        self.assertIsNone(self.index.score('movie', item.id))
+        self.assertIsNone(self.index.score('series', 'unknown'))
+
+        self.index.remove(item.id)
+        self.assertEqual(self.ranked_ids('series'), [])
+        self.assertEqual(self.index.postings, {})
+        self.assertEqual(self.index.groups, {})
+        self.assertEqual(self.index.total_length, 0)
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import os
+import tempfile
+import threading
+from typing import List
+import unittest
+from unittest.mock import patch
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.journal import (
+    EntityCodec,
+    JournaledSearchableRepository,
+    RepositoryJournal
+)
+from __seedwork.domain.repository import InMemorySearchableRepository, SearchParams
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class StubEntity(Entity):
+    name: str
+    price: float
+
+    def __post_init__(self):
+        self._validate()
+
+    def _validate(self):
+        pass
+
+
+class StubInMemorySearchableRepository(InMemorySearchableRepository[StubEntity, str]):
+    sortable_fields: List[str] = ['name']
+
+    def _apply_filter(self, items: List[StubEntity], filter_param: str | None) -> List[StubEntity]:
+        return items
+
+
+class TestEntityCodec(unittest.TestCase):
+
+    def test_round_trip_without_validation(self):
+        codec = EntityCodec(StubEntity)
+        entity = StubEntity(name='Test', price=5)
+        record = codec.to_record(entity)
+        self.assertEqual(codec.field_names, ('name', 'price'))
+        self.assertEqual(record, (entity.id, 'Test', 5))
+
+        with patch.object(StubEntity, '_validate') as validate:
+            self.assertEqual(codec.from_record(record), entity)
+            validate.assert_not_called()
+
+
+class TestJournaledSearchableRepository(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.directory.cleanup)
+
+    def open(self, **kwargs) -> JournaledSearchableRepository[StubEntity, str]:
+        repo = JournaledSearchableRepository(
+            journal=RepositoryJournal(self.directory.name, EntityCodec(StubEntity), **kwargs),
+            repository=StubInMemorySearchableRepository()
+        )
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_restores_writes_after_restart(self):
+        repo = self.open()
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(4)]
+        repo.insert(entities[0])
+        repo.insert_many(entities[1:])
+        updated = StubEntity(unique_entity_id=entities[1].unique_entity_id, name='Updated', price=9)
+        repo.update(updated)
+        repo.update_many([StubEntity(name='unknown', price=1)])
+        repo.delete(entities[0].id)
+        result = repo.delete_many([entities[2].id, entities[2].id])
+        self.assertEqual(list(result.errors), [1])
+        repo.close()
+
+        with patch.object(StubEntity, '_validate') as validate:
+            restored = self.open()
+            validate.assert_not_called()
+
+        self.assertEqual(restored.find_all(), [updated, entities[3]])
+        self.assertEqual(restored.find_by_id(entities[3].id), entities[3])
+        self.assertEqual(
+            restored.search(SearchParams(sort='name', sort_dir='desc')).items,
+            [updated, entities[3]]
+        )
+
+    def test_snapshot_replaces_older_logs(self):
+        repo = self.open(snapshot_every=3)
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(4)]
+        for entity in entities:
+            repo.insert(entity)
+
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)),
+            ['journal-00000001.log', 'snapshot.bin']
+        )
+        repo.delete(entities[0].id)
+        repo.close()
+
+        restored = self.open()
+        self.assertEqual(restored.find_all(), entities[1:])
+
+        restored.checkpoint()
+        restored.insert(entities[0])
+        restored.close()
+        self.assertEqual(self.open().find_all(), [*entities[1:], entities[0]])
+
+    def test_drops_a_torn_record_at_the_end_of_the_log(self):
+        repo = self.open()
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(2)]
+        repo.insert(entities[0])
+        repo.insert(entities[1])
+        repo.close()
+
+        log = os.path.join(self.directory.name, 'journal-00000000.log')
+        os.truncate(log, os.path.getsize(log) - 1)
+
+        restored = self.open()
+        self.assertEqual(restored.find_all(), [entities[0]])
+        restored.insert(entities[1])
+        restored.close()
+        self.assertEqual(self.open().find_all(), entities)
+
+    def test_batches_fsync(self):
+        repo = self.open(sync_every=3, sync_interval=60)
+        with patch('os.fsync') as fsync:
+            for i in range(7):
+                repo.insert(StubEntity(name=f'Test {i}', price=i))
+
+            self.assertEqual(fsync.call_count, 2)
+            repo.close()
+            self.assertEqual(fsync.call_count, 3)
+
+    def test_syncs_on_a_timer_and_flushes_every_record(self):
+        repo = self.open(sync_every=100, sync_interval=0.01)
+        log = os.path.join(self.directory.name, 'journal-00000000.log')
+        synced = threading.Event()
+        with patch('os.fsync', side_effect=lambda _: synced.set()) as fsync:
+            repo.insert(StubEntity(name='Test', price=1))
+            self.assertGreater(os.path.getsize(log), 0)
+            self.assertTrue(synced.wait(5))
+            repo.close()
+        self.assertEqual(fsync.call_count, 1)
+
+    def test_journals_plain_values_only(self):
+        repo = self.open(snapshot_every=1)
+        entity = StubEntity(name='Test', price=datetime(2023, 1, 1, tzinfo=timezone.utc))
+        repo.insert(entity)
+        with open(os.path.join(self.directory.name, 'snapshot.bin'), 'rb') as snapshot:
+            self.assertIn(b'{"$datetime":"2023-01-01T00:00:00+00:00"}', snapshot.read())
+        with self.assertRaises(TypeError):
+            repo.insert(StubEntity(name='Test', price=object()))
+        repo.close()
+
+        self.assertEqual(self.open().find_all(), [entity])
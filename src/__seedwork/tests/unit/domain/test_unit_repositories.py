@@ -1,15 +1,19 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
 import unittest
+from unittest.mock import patch
 from __seedwork.domain.entities import Entity
 from __seedwork.domain.exceptions import NotFoundException
 from __seedwork.domain.repository import (
     ET,
+    BulkWriteResult,
     Filter,
     InMemoryRepository,
     InMemorySearchableRepository,
     RepositoryInterface,
     SearchParams,
+    SearchCursor,
     SearchResult,
     SearchableRepositoryInterface
 )
@@ -32,6 +36,46 @@ class TestRepositoryInterface(unittest.TestCase):
     def test_sortable_fields(self):
         self.assertEqual(SearchableRepositoryInterface.sortable_fields, [])
 
+    def test_bulk_methods_fall_back_to_single_entity_methods(self):
+        # pylint: disable=too-few-public-methods
+        class DictRepository(RepositoryInterface):
+            def __init__(self):
+                self.entities = {}
+
+            def insert(self, entity):
+                self.entities[entity.id] = entity
+
+            def find_by_id(self, entity_id):
+                if str(entity_id) not in self.entities:
+                    raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+                return self.entities[str(entity_id)]
+
+            def find_all(self):
+                return list(self.entities.values())
+
+            def update(self, entity):
+                self.find_by_id(entity.id)
+                self.entities[entity.id] = entity
+
+            def delete(self, entity_id):
+                self.find_by_id(entity_id)
+                del self.entities[str(entity_id)]
+
+        repo = DictRepository()
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(2)]
+        self.assertEqual(repo.insert_many(entities), BulkWriteResult(succeeded=2))
+
+        result = repo.update_many([StubEntity(name='unknown', price=1), entities[1]])
+        self.assertEqual(result.succeeded, 1)
+        self.assertEqual(list(result.errors), [0])
+
+        result = repo.delete_many([entities[0].id, '1'])
+        self.assertEqual(result.succeeded, 1)
+        self.assertEqual(list(result.errors), [1])
+        self.assertEqual(repo.find_all(), [entities[1]])
+        self.assertTrue(repo.exists(entities[1].unique_entity_id))
+        self.assertFalse(repo.exists(entities[0].id))
+
 
 @dataclass(frozen=True, kw_only=True, slots=True)
 class StubEntity(Entity):
@@ -148,6 +192,145 @@ class TestInMemoryRepository(unittest.TestCase):
         )
 
 
+    def test_find_update_and_delete_after_deleting_from_the_middle(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(5)]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        self.repo.delete(entities[1].id)
+        self.repo.delete(entities[0].id)
+
+        self.assertEqual(self.repo.find_by_id(entities[4].id), entities[4])
+        self.assertEqual(self.repo.find_by_id(entities[2].id), entities[2])
+
+        entity_updated = StubEntity(
+            unique_entity_id=entities[3].unique_entity_id,
+            name='updated',
+            price=10
+        )
+        self.repo.update(entity_updated)
+        self.assertListEqual(
+            self.repo.items,
+            [entities[2], entity_updated, entities[4]]
+        )
+
+        self.repo.delete(entities[4].id)
+        self.assertListEqual(self.repo.items, [entities[2], entity_updated])
+        with self.assertRaises(NotFoundException):
+            self.repo.find_by_id(entities[0].id)
+
+    def test_find_after_many_deletes(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(1200)]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        for entity in entities[:1100:2] + entities[1:1100:2]:
+            self.repo.delete(entity.id)
+
+        self.assertListEqual(self.repo.items, entities[1100:])
+        for entity in entities[1100:]:
+            self.assertEqual(self.repo.find_by_id(entity.id), entity)
+
+    def test_index_follows_items_reassignment(self):
+        entity = StubEntity(name='Test', price=4)
+        self.repo.insert(entity)
+
+        other_entity = StubEntity(name='Other', price=5)
+        self.repo.items = [other_entity]
+
+        self.assertEqual(self.repo.find_by_id(other_entity.id), other_entity)
+        with self.assertRaises(NotFoundException):
+            self.repo.find_by_id(entity.id)
+
+        self.repo.insert(entity)
+        self.assertEqual(self.repo.find_by_id(entity.id), entity)
+        self.assertListEqual(self.repo.items, [other_entity, entity])
+
+    def test_delete_keeps_the_other_copy_of_a_duplicated_id(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+        copy = StubEntity(unique_entity_id=entities[1].unique_entity_id, name='Copy', price=1)
+        self.repo.insert_many(entities)
+        self.repo.insert(copy)
+
+        self.repo.delete(entities[1].id)
+        self.assertListEqual(self.repo.items, [entities[0], entities[2], copy])
+        self.assertEqual(self.repo.find_by_id(copy.id), copy)
+        self.assertEqual(self.repo.find_by_id(entities[2].id), entities[2])
+        self.repo.delete(copy.id)
+        self.assertFalse(self.repo.exists(copy.id))
+
+        self.repo.insert_many([copy, entities[1]])
+        self.assertEqual(self.repo.delete_many([copy.id]), BulkWriteResult(succeeded=1))
+        self.assertEqual(self.repo.find_by_id(copy.id), entities[1])
+        self.assertListEqual(self.repo.items, [entities[0], entities[2], entities[1]])
+
+
+    def test_insert_many(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+        self.repo.insert(entities[0])
+
+        result = self.repo.insert_many(entities[1:])
+        self.assertEqual(result, BulkWriteResult(succeeded=2))
+        self.assertListEqual(self.repo.items, entities)
+        for entity in entities:
+            self.assertEqual(self.repo.find_by_id(entity.id), entity)
+
+    def test_update_many(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+        self.repo.insert_many(entities)
+
+        entities_updated = [
+            StubEntity(unique_entity_id=entities[2].unique_entity_id, name='updated', price=5),
+            StubEntity(name='unknown', price=6),
+            StubEntity(unique_entity_id=entities[0].unique_entity_id, name='updated', price=7),
+        ]
+        result = self.repo.update_many(entities_updated)
+
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual(list(result.errors), [1])
+        self.assertIsInstance(result.errors[1], NotFoundException)
+        self.assertListEqual(
+            self.repo.items,
+            [entities_updated[2], entities[1], entities_updated[0]]
+        )
+
+    def test_delete_many(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(5)]
+        self.repo.insert_many(entities)
+
+        result = self.repo.delete_many([
+            entities[3].id,
+            '1',
+            entities[0].unique_entity_id,
+            entities[3].id,
+        ])
+
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual(list(result.errors), [1, 3])
+        self.assertEqual(
+            result.errors[1].args[0],
+            "Entity not found using ID '1'"
+        )
+        self.assertListEqual(self.repo.items, [entities[1], entities[2], entities[4]])
+        for entity in self.repo.items:
+            self.assertEqual(self.repo.find_by_id(entity.id), entity)
+
+        self.repo.delete(entities[2].id)
+        self.assertListEqual(self.repo.items, [entities[1], entities[4]])
+
+    def test_exists(self):
+        entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+        self.repo.insert_many(entities)
+        self.repo.delete(entities[1].id)
+
+        with patch.object(self.repo, 'find_by_id') as find_by_id:
+            self.assertTrue(self.repo.exists(entities[0].id))
+            self.assertTrue(self.repo.exists(entities[2].unique_entity_id))
+            self.assertFalse(self.repo.exists(entities[1].id))
+            self.assertFalse(self.repo.exists('1'))
+        find_by_id.assert_not_called()
+
+
 class TestSearchableRepositoryInterface(unittest.TestCase):
 
     def test_throw_error_when_methods_not_implemented(self):
@@ -171,7 +354,10 @@ class TestSearchParams(unittest.TestCase):
                 'per_page': Optional[int],
                 'sort': Optional[str],
                 'sort_dir': Optional[str],
-                'filter': Optional[Filter]
+                'filter': Optional[Filter],
+                'after': Optional[str],
+                'before': Optional[str],
+                'fields': Optional[Tuple[str, ...]]
             }
         )
 
@@ -310,6 +496,65 @@ class TestSearchParams(unittest.TestCase):
                 f"Expected: {i['expected']}, using: {i['filter']}"
             )
 
+    def test_cursor_props(self):
+        params = SearchParams()
+        self.assertIsNone(params.after)
+        self.assertIsNone(params.before)
+
+        arrange = [
+            {'cursor': None, 'expected': None},
+            {'cursor': '', 'expected': None},
+            {'cursor': 'fake', 'expected': 'fake'},
+            {'cursor': 0, 'expected': '0'},
+        ]
+
+        for i in arrange:
+            params = SearchParams(after=i['cursor'], before=i['cursor'])
+            self.assertEqual(params.after, i['expected'])
+            self.assertEqual(params.before, i['expected'])
+
+    def test_fields_prop(self):
+        params = SearchParams()
+        self.assertIsNone(params.fields)
+
+        arrange = [
+            {'fields': None, 'expected': None},
+            {'fields': '', 'expected': None},
+            {'fields': [], 'expected': None},
+            {'fields': ' , ', 'expected': None},
+            {'fields': 'name', 'expected': ('name',)},
+            {'fields': 'id, name,is_active', 'expected': ('id', 'name', 'is_active')},
+            {'fields': ['name', 'id', 'name'], 'expected': ('name', 'id')},
+            {'fields': ('price',), 'expected': ('price',)},
+        ]
+
+        for i in arrange:
+            params = SearchParams(fields=i['fields'])
+            self.assertEqual(params.fields, i['expected'], f"Using: {i['fields']}")
+
+
+class TestSearchCursor(unittest.TestCase):
+
+    def test_encode_and_decode(self):
+        arrange = [
+            SearchCursor(sort=None, value=None, entity_id='1'),
+            SearchCursor(sort='name', value='some name', entity_id='1'),
+            SearchCursor(sort='price', value=5.5, entity_id='1'),
+            SearchCursor(
+                sort='created_at',
+                value=datetime(2023, 6, 18, 1, 0, 0, 5),
+                entity_id='1'
+            ),
+        ]
+
+        for cursor in arrange:
+            self.assertEqual(SearchCursor.decode(cursor.encode()), cursor)
+
+    def test_decode_invalid_token(self):
+        for token in ['fake', '!!', 'W10=', 'eyJhIjogMX0=']:
+            self.assertIsNone(SearchCursor.decode(token), token)
+
+
 class TestSearchResult(unittest.TestCase):
 
     def test_props_annotations(self):
@@ -324,6 +569,8 @@ class TestSearchResult(unittest.TestCase):
                 'sort': Optional[str],
                 'sort_dir': Optional[str],
                 'filter': Optional[Filter],
+                'next_cursor': Optional[str],
+                'prev_cursor': Optional[str],
             }
         )
 
@@ -344,7 +591,9 @@ class TestSearchResult(unittest.TestCase):
             'last_page': 2,
             'sort': None,
             'sort_dir': None,
-            'filter': None
+            'filter': None,
+            'next_cursor': None,
+            'prev_cursor': None
         })
 
 
@@ -365,7 +614,9 @@ class TestSearchResult(unittest.TestCase):
             'last_page': 2,
             'sort': 'name',
             'sort_dir': 'asc',
-            'filter': 'test'
+            'filter': 'test',
+            'next_cursor': None,
+            'prev_cursor': None
         })
 
     def test_when_per_page_is_greater_than_total(self):
@@ -408,6 +659,21 @@ class TestInMemorySearchableRepository(unittest.TestCase):
     def setUp(self) -> None:
         self.repo = StubInMemorySearchableRepository()
 
+    def test_count(self):
+        items = [
+            StubEntity(name='test', price=5),
+            StubEntity(name='TEST', price=1),
+            StubEntity(name='other', price=5),
+        ]
+        self.repo.insert_many(items)
+
+        with patch.object(self.repo, 'search') as search:
+            self.assertEqual(self.repo.count(), 3)
+            self.assertEqual(self.repo.count('test'), 2)
+            self.assertEqual(self.repo.count('5'), 2)
+            self.assertEqual(self.repo.count('fake'), 0)
+        search.assert_not_called()
+
     def test__apply_filter(self):
         items = [StubEntity(name='test', price=5)]
         # pylint: disable=protected-access
@@ -729,3 +995,372 @@ class TestInMemorySearchableRepository(unittest.TestCase):
             sort_dir="asc",
             filter="TEST"
         ))
+
+    def test_search_with_sort_after_writes(self):
+        entities = [
+            StubEntity(name='b', price=1),
+            StubEntity(name='a', price=2),
+            StubEntity(name='b', price=3),
+            StubEntity(name='c', price=4),
+            StubEntity(name='a', price=5),
+        ]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        entity_updated = StubEntity(
+            unique_entity_id=entities[3].unique_entity_id,
+            name='a',
+            price=6
+        )
+        self.repo.update(entity_updated)
+        self.repo.delete(entities[1].id)
+        self.repo.insert(StubEntity(name='b', price=7))
+
+        for sort_dir in ['asc', 'desc']:
+            expected = sorted(
+                self.repo.items,
+                key=lambda item: item.name,
+                reverse=sort_dir == 'desc'
+            )
+            for page in [1, 2, 3]:
+                result = self.repo.search(SearchParams(
+                    page=page, per_page=2, sort='name', sort_dir=sort_dir
+                ))
+                self.assertEqual(
+                    result.items,
+                    expected[(page - 1) * 2:page * 2],
+                    f"The output using sort_dir {sort_dir} on page {page} is different"
+                )
+
+        result = self.repo.search(SearchParams(
+            page=1, per_page=5, sort='name', sort_dir='desc', filter='b'
+        ))
+        self.assertEqual(
+            [item.price for item in result.items],
+            [1, 3, 7]
+        )
+
+    def test__apply_sort_with_limit(self):
+        items = [
+            StubEntity(name=name, price=price)
+            for price, name in enumerate('dbadcabdcaebdacb' * 4)
+        ]
+
+        for sort_dir in ['asc', 'desc']:
+            expected = sorted(
+                items,
+                key=lambda item: item.name,
+                reverse=sort_dir == 'desc'
+            )
+            for limit in [1, 5, 15, 64, 100]:
+                # pylint: disable=protected-access
+                result = self.repo._apply_sort(items, 'name', sort_dir, limit)
+                self.assertEqual(
+                    result,
+                    expected[:limit],
+                    f"The output using sort_dir {sort_dir} and limit {limit} is different"
+                )
+
+    def test_search_results_are_cached_until_the_next_write(self):
+        entity = StubEntity(name='a', price=1)
+        self.repo.insert(entity)
+
+        result = self.repo.search(SearchParams())
+        self.assertIs(self.repo.search(SearchParams()), result)
+        self.assertIsNot(self.repo.search(SearchParams(sort='name')), result)
+
+        cache_info = self.repo.search_cache_info()
+        self.assertEqual(cache_info.hits, 1)
+        self.assertEqual(cache_info.misses, 2)
+        self.assertEqual(cache_info.size, 2)
+
+        other_entity = StubEntity(name='b', price=2)
+        self.repo.insert(other_entity)
+        self.assertEqual(self.repo.search(SearchParams()).items, [entity, other_entity])
+
+        entity_updated = StubEntity(
+            unique_entity_id=entity.unique_entity_id,
+            name='c',
+            price=3
+        )
+        self.repo.update(entity_updated)
+        self.assertEqual(
+            self.repo.search(SearchParams()).items,
+            [entity_updated, other_entity]
+        )
+
+        self.repo.delete(other_entity.id)
+        self.assertEqual(self.repo.search(SearchParams()).items, [entity_updated])
+
+        self.repo.items = []
+        self.assertEqual(self.repo.search(SearchParams()).items, [])
+        self.assertEqual(self.repo.search_cache_info().size, 1)
+
+    def test_search_by_cursor(self):
+        entities = [
+            StubEntity(name=name, price=price)
+            for price, name in enumerate('dbadcabdcae')
+        ]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        arrange = [
+            {'sort': None, 'sort_dir': None, 'filter': None},
+            {'sort': 'name', 'sort_dir': 'asc', 'filter': None},
+            {'sort': 'name', 'sort_dir': 'desc', 'filter': None},
+            {'sort': 'name', 'sort_dir': 'desc', 'filter': 'a'},
+        ]
+
+        for i in arrange:
+            pages = [
+                self.repo.search(SearchParams(page=page, per_page=3, **i)).items
+                for page in [1, 2, 3, 4]
+            ]
+
+            result = self.repo.search(SearchParams(per_page=3, **i))
+            self.assertIsNone(result.prev_cursor)
+            pages_by_cursor = [result.items]
+            while result.next_cursor:
+                result = self.repo.search(SearchParams(
+                    per_page=3, after=result.next_cursor, **i
+                ))
+                pages_by_cursor.append(result.items)
+
+            self.assertEqual(
+                pages_by_cursor,
+                [page for page in pages if page],
+                f"The pages walking forward using {i} are different"
+            )
+
+            pages_by_cursor = [result.items]
+            while result.prev_cursor:
+                result = self.repo.search(SearchParams(
+                    per_page=3, before=result.prev_cursor, **i
+                ))
+                pages_by_cursor.insert(0, result.items)
+
+            self.assertEqual(
+                [item for page in pages_by_cursor for item in page],
+                [item for page in pages for item in page],
+                f"The items walking backward using {i} are different"
+            )
+
+    def test_search_by_cursor_of_a_deleted_entity_with_or_without_index(self):
+        class UnindexedRepository(StubInMemorySearchableRepository):
+            def _create_indexes(self):
+                return {}
+
+        unindexed_repo = UnindexedRepository()
+        entities = [
+            StubEntity(name=name, price=price)
+            for price, name in enumerate('dbadcabdcae')
+        ]
+        self.repo.insert_many(entities)
+        unindexed_repo.insert_many(entities)
+
+        for sort_dir in ['asc', 'desc']:
+            params = SearchParams(per_page=4, sort='name', sort_dir=sort_dir)
+            result = self.repo.search(params)
+            cursor_entity = result.items[-1]
+            self.repo.delete(cursor_entity.id)
+            unindexed_repo.delete(cursor_entity.id)
+
+            for cursor in [{'after': result.next_cursor}, {'before': result.next_cursor}]:
+                params = SearchParams(per_page=4, sort='name', sort_dir=sort_dir, **cursor)
+                expected = self.repo.search(params)
+                self.assertEqual(unindexed_repo.search(params), expected)
+                self.assertNotIn(cursor_entity, expected.items)
+
+            self.repo.insert(cursor_entity)
+            unindexed_repo.insert(cursor_entity)
+
+    def test_search_projecting_fields(self):
+        entities = [
+            StubEntity(name=name, price=price)
+            for price, name in enumerate('dbadcabdcae')
+        ]
+        self.repo.insert_many(entities)
+
+        arrange = [
+            {'sort': None, 'filter': None},
+            {'sort': 'name', 'filter': None},
+            {'sort': 'name', 'filter': 'a'},
+        ]
+        for i in arrange:
+            full = self.repo.search(SearchParams(per_page=3, **i))
+            with patch.object(StubEntity, 'to_dict') as to_dict:
+                projected = self.repo.search(
+                    SearchParams(per_page=3, fields='price,id,fake', **i))
+            to_dict.assert_not_called()
+
+            self.assertEqual(
+                projected.items,
+                [{'price': item.price, 'id': item.id} for item in full.items]
+            )
+            self.assertEqual(projected.total, full.total)
+            # cursors still come from the entities, not from the rows
+            self.assertEqual(projected.next_cursor, full.next_cursor)
+            after = self.repo.search(SearchParams(
+                per_page=3, after=projected.next_cursor, fields=['name'], **i))
+            self.assertEqual(
+                after.items,
+                [{'name': item.name} for item in self.repo.search(SearchParams(
+                    per_page=3, after=full.next_cursor, **i)).items]
+            )
+
+    def test_search_by_cursor_is_not_shifted_by_inserts(self):
+        entities = [StubEntity(name=name, price=1) for name in 'bdfh']
+        for entity in entities:
+            self.repo.insert(entity)
+
+        result = self.repo.search(SearchParams(per_page=2, sort='name'))
+        self.assertEqual(result.items, entities[:2])
+
+        self.repo.insert(StubEntity(name='a', price=1))
+        result = self.repo.search(SearchParams(
+            per_page=2, sort='name', after=result.next_cursor
+        ))
+        self.assertEqual(result.items, entities[2:])
+        self.assertIsNone(result.next_cursor)
+
+    def test_search_ignores_cursor_of_another_sort(self):
+        entities = [StubEntity(name=name, price=1) for name in 'ba']
+        for entity in entities:
+            self.repo.insert(entity)
+
+        result = self.repo.search(SearchParams(per_page=1))
+        result = self.repo.search(SearchParams(
+            per_page=1, sort='name', after=result.next_cursor
+        ))
+        self.assertEqual(result.items, [entities[1]])
+
+    def test_search_after_bulk_writes(self):
+        names = 'dbadcabdcaebdacb' * 80
+        entities = [StubEntity(name=name, price=price) for price, name in enumerate(names)]
+        self.repo.insert_many(entities[:10])
+        self.repo.insert_many(entities[10:])
+        self.repo.update_many([
+            StubEntity(unique_entity_id=entity.unique_entity_id, name='z', price=-1)
+            for entity in entities[::3]
+        ])
+        self.repo.delete_many([entity.id for entity in entities[1::3]])
+        self.repo.delete_many([entities[2].id])
+
+        for sort_dir in ['asc', 'desc']:
+            expected = sorted(
+                self.repo.items,
+                key=lambda item: item.name,
+                reverse=sort_dir == 'desc'
+            )
+            result = self.repo.search(SearchParams(
+                page=3, per_page=10, sort='name', sort_dir=sort_dir
+            ))
+            self.assertEqual(result.items, expected[20:30])
+            self.assertEqual(result.total, len(expected))
+
+    def test_writes_refused_by_the_sort_index_leave_nothing_behind(self):
+        entities = [StubEntity(name=name, price=1) for name in 'dbadcabdcaebdacb' * 4]
+        self.repo.insert_many(entities)
+        expected = sorted(entities, key=lambda item: item.name)
+        unsortable = StubEntity(name=None, price=2)
+
+        # small batches go through the indexes entity by entity, large ones
+        # rebuild them
+        for size in [1, 20]:
+            with self.assertRaises(TypeError):
+                self.repo.insert_many(
+                    [StubEntity(name='f', price=3) for _ in range(size)] + [unsortable])
+            renamed = [
+                StubEntity(unique_entity_id=entity.unique_entity_id, name='z', price=1)
+                for entity in entities[:size]
+            ]
+            unsortable_update = StubEntity(
+                unique_entity_id=entities[-1].unique_entity_id, name=None, price=1)
+            with self.assertRaises(TypeError):
+                self.repo.update_many(renamed + [unsortable_update])
+        with self.assertRaises(TypeError):
+            self.repo.insert(unsortable)
+        with self.assertRaises(TypeError):
+            self.repo.update(
+                StubEntity(unique_entity_id=entities[0].unique_entity_id, name=None, price=1))
+
+        self.assertEqual(self.repo.items, entities)
+        self.assertFalse(self.repo.exists(unsortable.id))
+        self.assertEqual(self.repo.search(SearchParams(sort='name', per_page=100)).items, expected)
+
+        self.repo.delete(entities[0].id)
+        self.repo.insert(StubEntity(name='f', price=3))
+        result = self.repo.search(SearchParams(sort='name', sort_dir='desc', per_page=100))
+        self.assertEqual(
+            result.items, sorted(self.repo.items, key=lambda item: item.name, reverse=True))
+
+    def test_iter_all(self):
+        entities = [StubEntity(name=name, price=1) for name in 'ba']
+        self.repo.insert_many(entities)
+
+        iterator = self.repo.iter_all()
+        self.assertIsInstance(iterator, Iterator)
+        self.assertEqual(list(iterator), entities)
+
+    def test_iter_search(self):
+        entities = [
+            StubEntity(name=name, price=price)
+            for price, name in enumerate('dbadcabdcae')
+        ]
+        self.repo.insert_many(entities)
+
+        arrange = [
+            SearchParams(),
+            SearchParams(page=2, per_page=4),
+            SearchParams(page=2, per_page=4, sort='name', sort_dir='desc'),
+            SearchParams(page=1, per_page=3, sort='name', filter='A'),
+            SearchParams(page=2, per_page=2, sort='price', filter='b'),
+            SearchParams(page=9, per_page=2, sort='name'),
+        ]
+
+        for params in arrange:
+            iterator = self.repo.iter_search(params)
+            self.assertIsInstance(iterator, Iterator)
+            self.assertEqual(
+                list(iterator),
+                self.repo.search(params).items,
+                f"The output using {params} is different"
+            )
+
+    def test_search_steps_in_chunks(self):
+        class PricedRepository(StubInMemorySearchableRepository):
+            sortable_fields = ['name', 'price']
+
+        class ChunkedRepository(PricedRepository):
+            search_chunk_size = 3
+
+        entities = [
+            StubEntity(name=name, price=price % 4)
+            for price, name in enumerate('dbadcabdcaebadca')
+        ]
+        repo = PricedRepository()
+        repo.insert_many(entities)
+        chunked_repo = ChunkedRepository()
+        chunked_repo.insert_many(entities)
+
+        arrange = [
+            SearchParams(page=2, per_page=4),
+            SearchParams(page=2, per_page=3, sort='price', sort_dir='desc'),
+            SearchParams(page=1, per_page=5, sort='price', filter='a'),
+            SearchParams(page=2, per_page=2, sort='price', sort_dir='desc', filter='a'),
+            SearchParams(page=2, per_page=2, sort='name', filter='b'),
+        ]
+
+        for params in arrange:
+            steps = chunked_repo.search_steps(params)
+            yields, result = 0, None
+            while result is None:
+                try:
+                    next(steps)
+                    yields += 1
+                except StopIteration as stop:
+                    result = stop.value
+
+            self.assertEqual(yields > 0, params.filter is not None)
+            self.assertEqual(
+                result, repo.search(params), f"The output using {params} is different")
@@ -0,0 +1,159 @@
+from dataclasses import dataclass
+from typing import List
+import unittest
+from unittest.mock import patch
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.exceptions import NotFoundException, UndoFailedException
+from __seedwork.domain.repository import BulkWriteResult, InMemoryRepository
+from __seedwork.domain.unit_of_work import UnitOfWork
+
+
+@dataclass(kw_only=True, frozen=True, slots=True)
+class StubEntity(Entity):
+    name: str
+    price: float
+
+    def reprice(self, price: float) -> None:
+        self._change(price=price)
+
+
+class StubInMemoryRepository(InMemoryRepository[StubEntity]):
+    pass
+
+
+class TestUnitOfWork(unittest.TestCase):
+
+    repo: StubInMemoryRepository
+    entities: List[StubEntity]
+
+    def setUp(self) -> None:
+        self.repo = StubInMemoryRepository()
+        self.entities = [StubEntity(name=f'Test {i}', price=i) for i in range(3)]
+        self.repo.insert_many(self.entities)
+
+    def changed(self, entity: StubEntity, price: float) -> StubEntity:
+        return StubEntity(unique_entity_id=entity.unique_entity_id, name=entity.name, price=price)
+
+    def test_merges_changes_for_the_same_id(self):
+        uow = UnitOfWork(self.repo)
+        created = StubEntity(name='New', price=1)
+        uow.insert(created)
+        created = self.changed(created, 2)
+        uow.update(created)
+
+        discarded = StubEntity(name='Discarded', price=1)
+        uow.insert(discarded)
+        uow.delete(discarded.id)
+
+        uow.update(self.changed(self.entities[0], 10))
+        updated = self.changed(self.entities[0], 20)
+        uow.update(updated)
+
+        uow.update(self.changed(self.entities[1], 10))
+        uow.delete(self.entities[1].unique_entity_id)
+
+        uow.delete(self.entities[2].id)
+        replaced = self.changed(self.entities[2], 30)
+        uow.insert(replaced)
+
+        self.assertEqual(uow.find_by_id(created.id), created)
+        self.assertEqual(uow.find_by_id(self.entities[0].id), updated)
+        with self.assertRaises(NotFoundException):
+            uow.find_by_id(self.entities[1].id)
+        with self.assertRaises(NotFoundException):
+            uow.update(self.entities[1])
+        with self.assertRaises(NotFoundException):
+            uow.delete(self.entities[1].id)
+        self.assertEqual(self.repo.items, self.entities)
+
+        with (
+            patch.object(self.repo, 'insert_many', wraps=self.repo.insert_many) as insert_many,
+            patch.object(self.repo, 'update_many', wraps=self.repo.update_many) as update_many,
+            patch.object(self.repo, 'delete_many', wraps=self.repo.delete_many) as delete_many
+        ):
+            uow.commit()
+
+        insert_many.assert_called_once_with([created])
+        update_many.assert_called_once_with([updated, replaced])
+        delete_many.assert_called_once_with([self.entities[1].unique_entity_id])
+        self.assertEqual(self.repo.items, [updated, replaced, created])
+        self.assertFalse(uow.has_changes)
+
+    def test_missing_entity_fails_before_writing(self):
+        uow = UnitOfWork(self.repo)
+        created = StubEntity(name='New', price=1)
+        unknown = StubEntity(name='Unknown', price=1)
+        uow.insert(created)
+        uow.update(unknown)
+
+        with self.assertRaises(NotFoundException):
+            uow.commit()
+
+        self.assertEqual(self.repo.items, self.entities)
+        self.assertTrue(uow.has_changes)
+
+        # the pending writes survive the failure and are committed once the
+        # missing entity exists
+        self.repo.insert(
+            StubEntity(unique_entity_id=unknown.unique_entity_id, name='Old', price=0))
+        uow.commit()
+        self.assertEqual(self.repo.items, [*self.entities, unknown, created])
+        self.assertFalse(uow.has_changes)
+
+    def test_undoes_applied_writes_when_a_later_one_fails(self):
+        created = StubEntity(name='New', price=1)
+        updated = self.changed(self.entities[0], 10)
+        delete_many = self.repo.delete_many
+        failures = [BulkWriteResult(errors={0: NotFoundException('deleted meanwhile')})]
+
+        def fail_once(entity_ids):
+            return failures.pop() if failures else delete_many(entity_ids)
+
+        with patch.object(self.repo, 'delete_many', side_effect=fail_once):
+            with self.assertRaises(NotFoundException) as assert_error:
+                with UnitOfWork(self.repo) as uow:
+                    uow.insert(created)
+                    uow.update(updated)
+                    uow.delete(self.entities[1].id)
+
+        self.assertEqual(assert_error.exception.args[0], 'deleted meanwhile')
+        self.assertEqual(self.repo.items, self.entities)
+        self.assertFalse(uow.has_changes)
+
+    def test_entities_read_are_copies_the_undo_can_restore(self):
+        failure = BulkWriteResult(errors={0: NotFoundException('deleted meanwhile')})
+        with patch.object(self.repo, 'delete_many', return_value=failure):
+            with self.assertRaises(NotFoundException):
+                with UnitOfWork(self.repo) as uow:
+                    found = uow.find_by_id(self.entities[0].id)
+                    found.reprice(10)
+                    self.assertEqual(self.repo.items[0].price, 0)
+                    uow.update(found)
+                    uow.delete(self.entities[1].id)
+
+        self.assertEqual(self.repo.items, self.entities)
+        self.assertEqual(self.repo.find_by_id(self.entities[0].id).price, 0)
+
+    def test_undo_failures_are_raised_from_the_commit_error(self):
+        uow = UnitOfWork(self.repo)
+        uow.insert(StubEntity(name='New', price=1))
+        uow.delete(self.entities[0].id)
+        failure = BulkWriteResult(errors={0: NotFoundException('deleted meanwhile')})
+        undo_error = RuntimeError('connection lost')
+
+        with patch.object(self.repo, 'delete_many', side_effect=[failure, undo_error]):
+            with self.assertRaises(UndoFailedException) as assert_error:
+                uow.commit()
+
+        self.assertEqual(assert_error.exception.errors, [undo_error])
+        self.assertIsInstance(assert_error.exception.__cause__, NotFoundException)
+        self.assertTrue(uow.has_changes)
+
+    def test_context_manager_discards_changes_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with UnitOfWork(self.repo) as uow:
+                uow.delete(self.entities[0].id)
+                raise RuntimeError()
+
+        self.assertFalse(uow.has_changes)
+        self.assertEqual(self.repo.items, self.entities)
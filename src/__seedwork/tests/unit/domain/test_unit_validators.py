@@ -1,10 +1,22 @@
-from dataclasses import fields
+from dataclasses import dataclass, fields
+from types import SimpleNamespace
+from typing import Any
 import unittest
 from unittest.mock import MagicMock, PropertyMock, patch
 from rest_framework import serializers
 
-from __seedwork.domain.exceptions import ValidationException
-from __seedwork.domain.validators import DRFValidator, ValidatorFieldsInterface, ValidatorRules
+from __seedwork.domain.exceptions import EntityValidationException, ValidationException
+from __seedwork.domain.validators import (
+    DRFValidator,
+    FieldRules,
+    RuleSchema,
+    ValidatorFieldsInterface,
+    ValidatorRules,
+    boolean,
+    max_length,
+    required,
+    string
+)
 
 
 class TestValidatorRules(unittest.TestCase):
@@ -184,6 +196,78 @@ class TestValidatorRules(unittest.TestCase):
         self.assertTrue(True) #NOSONAR
 
 
+@dataclass(frozen=True)
+class StubProps:
+    name: Any = 'Movie'
+    description: Any = None
+    is_active: Any = True
+
+
+class TestRuleSchema(unittest.TestCase):
+
+    def test_rules_are_chained_in_order(self):
+        self.assertEqual(
+            required().string().max_length(5),
+            FieldRules((('required', None), ('string', None), ('max_length', 5)))
+        )
+        self.assertEqual(string(), FieldRules((('string', None),)))
+        self.assertEqual(max_length('3'), FieldRules((('max_length', 3),)))
+        self.assertEqual(boolean().required(), FieldRules((('boolean', None), ('required', None))))
+
+    def test_errors_match_validator_rules(self):
+        chains = {
+            'required().string().max_length(4)':
+                lambda rules: rules.required().string().max_length(4),
+            'string().max_length(4)': lambda rules: rules.string().max_length(4),
+            'required().boolean()': lambda rules: rules.required().boolean(),
+            'boolean()': lambda rules: rules.boolean(),
+        }
+        values = [None, '', 'test', 't' * 5, 5, {}, True, False, 0, 1, [1, 2]]
+        for label, chain in chains.items():
+            schema = RuleSchema({'prop': chain(FieldRules())})
+            for value in values:
+                try:
+                    chain(ValidatorRules.values(value, 'prop'))
+                    expected = {}
+                except ValidationException as exception:
+                    expected = {'prop': [exception.args[0]]}
+
+                self.assertEqual(
+                    schema.errors(SimpleNamespace(prop=value)),
+                    expected,
+                    f'{label} using {value!r}'
+                )
+
+    def test_collects_the_errors_of_every_field(self):
+        schema = RuleSchema({
+            'name': required().string().max_length(255),
+            'description': string(),
+            'is_active': boolean(),
+        })
+        self.assertEqual(schema.errors(StubProps()), {})
+        schema.validate(StubProps(description='some description', is_active=False))
+
+        props = StubProps(name='t' * 256, description=5, is_active='true')
+        self.assertEqual(schema.errors(props), {
+            'name': ['The name must be less than 255 characters'],
+            'description': ['The description must be a string'],
+            'is_active': ['The is_active must be a boolean'],
+        })
+        with self.assertRaises(EntityValidationException) as assert_error:
+            schema.validate(props)
+        self.assertEqual(assert_error.exception.error, schema.errors(props))
+
+        errors = schema.errors(StubProps(name=None))
+        self.assertEqual(errors, {'name': ['The name is required']})
+        errors['name'].append('changed')
+        self.assertEqual(schema.errors(StubProps(name=None)), {'name': ['The name is required']})
+
+    def test_field_names_must_be_identifiers(self):
+        for name in ['is active', 'name) or (1', '', 'class', 'None']:
+            with self.assertRaises(ValueError):
+                RuleSchema({name: required()})
+
+
 class TestValidatorFieldsInterface(unittest.TestCase):
 
     def test_throw_error_when_validate_method_not_implemented(self):
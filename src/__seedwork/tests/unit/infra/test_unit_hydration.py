@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+import unittest
+from unittest.mock import patch
+
+from __seedwork.domain.entities import Entity
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrate, hydrator
+
+
+@dataclass(frozen=True, kw_only=True)
+class StubEntity(Entity):
+    prop1: str
+    prop2: str
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class StubSlottedEntity(Entity):
+    prop1: str
+
+
+class TestHydration(unittest.TestCase):
+
+    def test_hydrate(self):
+        entity_id = '444384e5-534e-4037-b09f-e5fca7596031'
+        with patch.object(UniqueEntityId, '_UniqueEntityId__validate') as validate_id, \
+                patch.object(StubEntity, '__post_init__', create=True) as post_init:
+            entity = hydrate(StubEntity, entity_id, prop2='value2', prop1='value1')
+        validate_id.assert_not_called()
+        post_init.assert_not_called()
+        self.assertEqual(entity, StubEntity(
+            unique_entity_id=UniqueEntityId(entity_id), prop1='value1', prop2='value2'))
+        self.assertEqual(entity.id, entity_id)
+
+        for values in [{'prop1': 'value1'}, {'prop1': 'value1', 'prop2': 'value2', 'prop3': 1}]:
+            with self.assertRaises(TypeError):
+                hydrate(StubEntity, entity_id, **values)
+
+    def test_hydrator_is_built_once_per_class(self):
+        hydrate_values = hydrator(StubSlottedEntity)
+        self.assertIs(hydrator(StubSlottedEntity), hydrate_values)
+
+        entity_id = '444384e5-534e-4037-b09f-e5fca7596031'
+        self.assertEqual(
+            hydrate_values(entity_id, {'prop1': 'value1'}),
+            StubSlottedEntity(unique_entity_id=UniqueEntityId(entity_id), prop1='value1')
+        )
@@ -1,6 +1,6 @@
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from __seedwork.domain.entities import Entity
 from __seedwork.domain.exceptions import EntityValidationException
@@ -25,15 +25,13 @@ class Category(Entity):
         self._validate()
 
     def update(self, name: str, description: str) -> None:
-        self._set('name', name)
-        self._set('description', description)
-        self._validate()
+        self._change(name=name, description=description)
 
     def activate(self):
-        self._set('is_active', True)
+        self._change(is_active=True)
 
     def deactivate(self):
-        self._set('is_active', False)
+        self._change(is_active=False)
 
     # def _validate(self) -> None: #NOSONAR
     #     ValidatorRules.values(self.name, 'name').required().string().max_length(255)
@@ -42,6 +40,11 @@ class Category(Entity):
 
     def _validate(self) -> None:
         validator = CategoryValidatorFactory.create()
-        is_valid = validator.validate(self.to_dict())
+        is_valid = validator.validate(self)
         if not is_valid:
             raise EntityValidationException(validator.errors)
+
+    def _validate_fields(self, values: Dict[str, Any]) -> None:
+        validator = CategoryValidatorFactory.create()
+        if not validator.validate(values, field_names=values.keys()):
+            raise EntityValidationException(validator.errors)
@@ -1,4 +1,8 @@
 from abc import ABC
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from __seedwork.domain.async_repository import AsyncSearchableRepositoryInterface
 from __seedwork.domain.repository import (
     SearchParams as DefaultSearchParams,
     SearchResult as DefaultSearchResult,
@@ -7,8 +11,44 @@ from __seedwork.domain.repository import (
 from category.domain.entities import Category
 
 
+@dataclass(frozen=True, slots=True, kw_only=True)
+class CategoryFilter:
+
+    # every condition given must hold; name ones ignore case as the plain
+    # string filter does, the created_at bounds are inclusive
+    name_contains: Optional[str] = None
+    name_prefix: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at_from: Optional[datetime] = None
+    created_at_to: Optional[datetime] = None
+
+    def matches(self, category: Category) -> bool:
+        if self.name_contains is not None and \
+                self.name_contains.lower() not in category.name.lower():
+            return False
+        if self.name_prefix is not None and \
+                not category.name.lower().startswith(self.name_prefix.lower()):
+            return False
+        if self.is_active is not None and category.is_active != self.is_active:
+            return False
+        if self.created_at_from is not None and category.created_at < self.created_at_from:
+            return False
+        if self.created_at_to is not None and category.created_at > self.created_at_to:
+            return False
+
+        return True
+
+
 class _SearchParams(DefaultSearchParams): # pylint: disable=too-few-public-methods
-    pass
+
+    def _normalize_filter(self):
+        # a CategoryFilter is kept as it is, an empty one filters nothing
+        if isinstance(self.filter, CategoryFilter):
+            if self.filter == CategoryFilter():
+                self.filter = None
+            return
+
+        super()._normalize_filter()
 
 
 class _SearchResult(DefaultSearchResult): # pylint: disable=too-few-public-methods
@@ -20,6 +60,19 @@ class CategoryRepository(
         Category, _SearchParams, _SearchResult
     ],
     ABC
+):
+    SearchParams = _SearchParams
+    SearchResult = _SearchResult
+    sortable_fields = ['name', 'created_at']
+    sort_default = 'created_at'
+    sort_value_types = {'name': str, 'created_at': datetime}
+
+
+class AsyncCategoryRepository(
+    AsyncSearchableRepositoryInterface[
+        Category, _SearchParams, _SearchResult
+    ],
+    ABC
 ):
     SearchParams = _SearchParams
     SearchResult = _SearchResult
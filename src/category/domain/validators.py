@@ -1,7 +1,14 @@
-from typing import Dict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
 from rest_framework import serializers
 
-from __seedwork.domain.validators import DRFValidator, StrictBooleanField, StrictCharField
+from __seedwork.domain.validators import (
+    CompiledDRFValidator,
+    DRFValidator,
+    ErrorFields,
+    StrictBooleanField,
+    StrictCharField
+)
 
 # pylint: disable=abstract-method
 class CategoryRules(serializers.Serializer):
@@ -11,8 +18,16 @@ class CategoryRules(serializers.Serializer):
     created_at = serializers.DateTimeField(required=False)
 
 
-class CategoryValidator(DRFValidator):
+class CategoryValidator(CompiledDRFValidator):
 
+    # validates a dict or a Category directly from its attributes
+    serializer_class = CategoryRules
+
+
+class CategoryDRFValidator(DRFValidator):
+
+    # a new CategoryRules serializer per validation, the errors of
+    # CategoryValidator are checked against it
     def validate(self, data: Dict) -> bool:
         rules = CategoryRules(data=data if data is not None else {})
         return super().validate(rules)
@@ -23,3 +38,41 @@ class CategoryValidatorFactory:
     @staticmethod
     def create():
         return CategoryValidator()
+
+
+def validate_many(
+        rows: Sequence[Optional[Dict]],
+        executor: Optional[Executor] = None,
+        chunk_size: int = 5_000,
+        parallel_threshold: int = 50_000
+    ) -> Dict[int, ErrorFields]:
+    # the errors of the invalid rows keyed by their position in rows, as
+    # BulkWriteResult keys failures. Batches from parallel_threshold rows
+    # are split in chunks validated over the executor, or over a process
+    # pool started for the call; smaller ones are validated right here
+    if len(rows) < parallel_threshold:
+        return _validate_chunk(0, rows)
+
+    starts = range(0, len(rows), chunk_size)
+    chunks = (rows[start:start + chunk_size] for start in starts)
+    if executor is not None:
+        return _merge(executor.map(_validate_chunk, starts, chunks))
+
+    with ProcessPoolExecutor() as pool:
+        return _merge(pool.map(_validate_chunk, starts, chunks))
+
+
+def _validate_chunk(start: int, rows: Sequence[Optional[Dict]]) -> Dict[int, ErrorFields]:
+    validator = CategoryValidatorFactory.create()
+    return {
+        position: validator.errors
+        for position, row in enumerate(rows, start)
+        if not validator.validate(row)
+    }
+
+
+def _merge(results) -> Dict[int, ErrorFields]:
+    errors = {}
+    for chunk_errors in results:
+        errors.update(chunk_errors)
+    return errors
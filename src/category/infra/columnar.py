@@ -0,0 +1,498 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import uuid
+
+import numpy as np
+
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import SearchCursor, SearchResult
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrate
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository
+from category.infra.timestamps import from_micros, to_micros, utc_offset
+_SEPARATOR = b'\x00'
+# created_at_offset of a naive created_at
+_NAIVE_OFFSET = np.iinfo(np.int32).min
+# a heap is rewritten once its dead bytes outgrow both this and its live ones
+_MIN_DEAD_BYTES = 1 << 16
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros(capacity, dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _get_bits(bitmap: np.ndarray, rows: np.ndarray | int) -> np.ndarray | int:
+    return bitmap[rows >> 3] >> (rows & 7) & 1
+
+
+def _set_bit(bitmap: np.ndarray, row: int, value: bool) -> None:
+    if value:
+        bitmap[row >> 3] |= 1 << (row & 7)
+    else:
+        bitmap[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+
+@dataclass(slots=True)
+class _StringColumn:
+    # UTF-8 values packed one after the other, a row points at its bytes
+    # with an offset and a length, -1 standing for None; the bytes a value
+    # replaced stay behind as dead ones until the heap is rewritten
+    heap: bytearray = field(default_factory=bytearray)
+    offsets: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    lengths: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    dead: int = 0
+
+    def grow(self, capacity: int) -> None:
+        self.offsets = _grow(self.offsets, capacity)
+        self.lengths = _grow(self.lengths, capacity)
+
+    def set(self, row: int, value: Optional[str]) -> None:
+        self.dead += max(int(self.lengths[row]), 0)
+        if value is None:
+            self.lengths[row] = -1
+            return
+
+        data = value.encode()
+        self.offsets[row] = len(self.heap)
+        self.lengths[row] = len(data)
+        self.heap += data
+
+    def get(self, row: int) -> Optional[str]:
+        length = int(self.lengths[row])
+        if length < 0:
+            return None
+
+        offset = int(self.offsets[row])
+        return self.heap[offset:offset + length].decode()
+
+    def compact(self, rows: np.ndarray) -> None:
+        values = [self.get(row) for row in rows]
+        self.heap = bytearray()
+        self.offsets = np.zeros(len(self.offsets), dtype=np.int64)
+        self.lengths = np.zeros(len(self.lengths), dtype=np.int64)
+        for row, value in enumerate(values):
+            self.set(row, value)
+        self.dead = 0
+
+    def wasteful(self) -> bool:
+        return self.dead > max(_MIN_DEAD_BYTES, len(self.heap) - self.dead)
+
+
+@dataclass(slots=True)
+class _SearchHeap:
+    # lowered names separated by a zero byte, so a term can never match
+    # across two names; an update appends a new segment and the old one
+    # is ignored from then on, -1 standing for a row without one
+    heap: bytearray = field(default_factory=bytearray)
+    starts: List[int] = field(default_factory=lambda: [])
+    segment_rows: List[int] = field(default_factory=lambda: [])
+    row_segments: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    dead: int = 0
+    _arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def grow(self, capacity: int) -> None:
+        grown = np.full(capacity, -1, dtype=np.int64)
+        grown[:len(self.row_segments)] = self.row_segments
+        self.row_segments = grown
+
+    def set(self, row: int, value: str) -> None:
+        segment = int(self.row_segments[row])
+        if segment >= 0:
+            # the segment and the separator before it
+            end = self.starts[segment + 1] if segment + 1 < len(self.starts) \
+                else len(self.heap) + 1
+            self.dead += end - self.starts[segment]
+        self.row_segments[row] = len(self.starts)
+        self.heap += _SEPARATOR
+        self.starts.append(len(self.heap))
+        self.segment_rows.append(row)
+        self.heap += value.lower().encode()
+        self._arrays = None
+
+    def find_rows(self, term: str) -> np.ndarray:
+        needle = term.lower().encode()
+        offsets = []
+        position = self.heap.find(needle)
+        while position != -1:
+            offsets.append(position)
+            # one hit per name is enough, jump to the next separator
+            position = self.heap.find(_SEPARATOR, position)
+            if position == -1:
+                break
+            position = self.heap.find(needle, position)
+
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self.starts, dtype=np.int64),
+                np.array(self.segment_rows, dtype=np.int64)
+            )
+
+        starts, segment_rows = self._arrays
+        segments = np.searchsorted(starts, offsets, 'right') - 1
+        rows = segment_rows[segments]
+        return rows[self.row_segments[rows] == segments]
+
+    def compact(self, names: _StringColumn, size: int) -> None:
+        self.heap = bytearray()
+        self.starts = []
+        self.segment_rows = []
+        self.row_segments[:] = -1
+        self.dead = 0
+        self._arrays = None
+        for row in range(size):
+            self.set(row, names.get(row))
+
+    def wasteful(self) -> bool:
+        return self.dead > max(_MIN_DEAD_BYTES, len(self.heap) - self.dead)
+
+
+@dataclass(slots=True)
+class ColumnarCategoryRepository(CategoryRepository):
+
+    # every column is an attribute of its own
+    # pylint: disable=too-many-instance-attributes
+    capacity: int = 1024
+    size: int = field(default=0, init=False)
+    _ids: np.ndarray = field(init=False, repr=False)
+    _created_at: np.ndarray = field(init=False, repr=False)
+    # the utcoffset in seconds of an aware created_at, _NAIVE_OFFSET
+    _created_at_offset: np.ndarray = field(init=False, repr=False)
+    # one bit per row each: is_active and is_active being None
+    _is_active: np.ndarray = field(init=False, repr=False)
+    _is_active_null: np.ndarray = field(init=False, repr=False)
+    _alive: np.ndarray = field(init=False, repr=False)
+    _names: _StringColumn = field(default_factory=_StringColumn, init=False, repr=False)
+    _name_search: _SearchHeap = field(default_factory=_SearchHeap, init=False, repr=False)
+    _descriptions: _StringColumn = field(
+        default_factory=_StringColumn, init=False, repr=False)
+    _rows: Dict[str, int] = field(default_factory=lambda: {}, init=False, repr=False)
+    _name_ranks: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _name_values: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._ids = np.zeros(0, dtype='V16')
+        self._created_at = np.zeros(0, dtype=np.int64)
+        self._created_at_offset = np.zeros(0, dtype=np.int32)
+        self._is_active = np.zeros(0, dtype=np.uint8)
+        self._is_active_null = np.zeros(0, dtype=np.uint8)
+        self._alive = np.zeros(0, dtype=np.bool_)
+        self._reserve(self.capacity)
+
+    def insert(self, entity: Category) -> None:
+        if self.size == len(self._alive):
+            self._reserve(2 * len(self._alive))
+
+        row = self.size
+        self.size += 1
+        self._ids[row] = uuid.UUID(entity.id).bytes
+        self._alive[row] = True
+        self._rows.setdefault(entity.id, row)
+        self._write(row, entity)
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Category:
+        return self._build(self._row(str(entity_id)))
+
+    def find_all(self) -> List[Category]:
+        return [self._build(row) for row in np.flatnonzero(self._alive[:self.size])]
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return str(entity_id) in self._rows
+
+    def count(self, filter_param: str | CategoryFilter | None = None) -> int:
+        return int(np.count_nonzero(self._filter_mask(filter_param)))
+
+    def update(self, entity: Category) -> None:
+        self._write(self._row(entity.id), entity)
+        self._reclaim_heaps()
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        row = self._row(str(entity_id))
+        del self._rows[str(entity_id)]
+        self._alive[row] = False
+        if self.size - len(self._rows) > max(1024, len(self._rows)):
+            self._compact()
+
+    def search(
+            self,
+            input_params: CategoryRepository.SearchParams
+        ) -> CategoryRepository.SearchResult:
+        sort = self._effective_sort(input_params.sort)
+        is_reverse = input_params.sort_dir == 'desc'
+        rows, keys = self._sorted_rows(
+            np.flatnonzero(self._filter_mask(input_params.filter)), sort, is_reverse)
+
+        per_page = input_params.per_page
+        start = (input_params.page - 1) * per_page
+        has_prev = start > 0
+        cursor = self._decode_cursor(input_params.after or input_params.before, sort)
+        if cursor:
+            forward = input_params.after is not None
+            position = self._cursor_position(rows, keys, cursor, is_reverse, forward)
+            if forward:
+                start, has_prev = position, True
+            else:
+                start = max(position - per_page, 0)
+                has_prev = start > 0
+                per_page = position - start
+
+        page_rows = rows[start:start + per_page]
+        if input_params.fields is None:
+            items = [self._build(row) for row in page_rows]
+        else:
+            items = self._project(page_rows, input_params.fields)
+        has_next = start + len(page_rows) < len(rows)
+        return SearchResult(
+            items=items,
+            total=len(rows),
+            current_page=input_params.page,
+            per_page=input_params.per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            next_cursor=self._row_cursor(page_rows[-1], sort) if items and has_next else None,
+            prev_cursor=self._row_cursor(page_rows[0], sort) if items and has_prev else None
+        )
+
+    def _sorted_rows(
+            self,
+            rows: np.ndarray,
+            sort: Optional[str],
+            is_reverse: bool
+        ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        # the rows in display order and their sort keys, None without a sort
+        if not sort:
+            return rows, None
+
+        keys = self._sort_keys(sort)[rows]
+        if is_reverse:
+            keys = -keys
+        # rows are in insertion order, a stable sort keeps it for ties
+        order = np.argsort(keys, kind='stable')
+        return rows[order], keys[order]
+
+    def _cursor_position(
+            self,
+            rows: np.ndarray,
+            keys: Optional[np.ndarray],
+            cursor: SearchCursor,
+            is_reverse: bool,
+            forward: bool
+        ) -> int:
+        # rows are ordered by (key, row), so the rows up to the cursor are
+        # counted rather than searched for, the cursor row itself included
+        # when walking forward
+        cursor_row = self._rows.get(cursor.entity_id, -1)
+        if forward:
+            cursor_row += 1
+
+        if keys is None:
+            return int(np.count_nonzero(rows < cursor_row))
+
+        cursor_key = self._cursor_key(cursor)
+        if is_reverse:
+            cursor_key = -cursor_key
+
+        return int(np.count_nonzero(
+            (keys < cursor_key) | ((keys == cursor_key) & (rows < cursor_row))
+        ))
+
+    def _cursor_key(self, cursor: SearchCursor) -> float:
+        if cursor.sort == 'created_at':
+            return to_micros(cursor.value)
+
+        # names are ranked, a name no longer stored falls between two ranks
+        self._sort_keys('name')
+        rank = int(np.searchsorted(self._name_values, cursor.value))
+        if rank < len(self._name_values) and self._name_values[rank] == cursor.value:
+            return rank
+
+        return rank - 0.5
+
+    def _row_cursor(self, row: int, sort: Optional[str]) -> str:
+        rows = np.array([row])
+        value = self._read_column(sort, rows)[0] if sort else None
+        return SearchCursor(
+            sort=sort, value=value, entity_id=self._read_column('id', rows)[0]).encode()
+
+    def _project(self, rows: np.ndarray, field_names: Tuple[str, ...]) -> List[dict]:
+        # each field is read for the whole page from its column, no entity
+        # is built
+        names = Category.projected_fields(field_names)
+        if not names:
+            return [{} for _ in rows]
+
+        columns = [self._read_column(name, rows) for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
+
+    def _read_column(self, name: str, rows: np.ndarray) -> list:
+        if name == 'id':
+            return [str(uuid.UUID(bytes=bytes(value))) for value in self._ids[rows]]
+        if name == 'name':
+            return [self._names.get(row) for row in rows]
+        if name == 'description':
+            return [self._descriptions.get(row) for row in rows]
+        if name == 'is_active':
+            return [
+                None if is_null else bool(is_active)
+                for is_active, is_null in zip(
+                    _get_bits(self._is_active, rows).tolist(),
+                    _get_bits(self._is_active_null, rows).tolist()
+                )
+            ]
+
+        return [
+            self._to_datetime(micros, offset)
+            for micros, offset in zip(
+                self._created_at[rows].tolist(), self._created_at_offset[rows].tolist())
+        ]
+
+    def _sort_keys(self, sort: str) -> np.ndarray:
+        if sort == 'created_at':
+            return self._created_at[:self.size]
+
+        if self._name_ranks is None:
+            names = np.array(
+                [self._names.get(row) or '' for row in range(self.size)], dtype=object)
+            self._name_values, self._name_ranks = np.unique(names, return_inverse=True)
+
+        return self._name_ranks
+
+    def _filter_mask(self, filter_param: str | CategoryFilter | None) -> np.ndarray:
+        mask = self._alive[:self.size]
+        if not filter_param:
+            return mask
+
+        if not isinstance(filter_param, CategoryFilter):
+            return mask & self._name_mask(filter_param)
+
+        if filter_param.name_contains is not None:
+            mask = mask & self._name_mask(filter_param.name_contains)
+        if filter_param.name_prefix is not None:
+            mask = mask & self._name_prefix_mask(filter_param.name_prefix)
+        if filter_param.is_active is not None:
+            mask = mask & self._is_active_mask(filter_param.is_active)
+        if filter_param.created_at_from is not None or filter_param.created_at_to is not None:
+            mask = mask & self._created_at_mask(
+                filter_param.created_at_from, filter_param.created_at_to)
+        return mask
+
+    def _name_mask(self, term: str) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=np.bool_)
+        mask[self._name_search.find_rows(term)] = True
+        return mask
+
+    def _name_prefix_mask(self, prefix: str) -> np.ndarray:
+        # the rows holding the prefix anywhere are found in the search heap,
+        # only those are checked for holding it at the start
+        prefix = prefix.lower()
+        mask = np.zeros(self.size, dtype=np.bool_)
+        rows = [
+            row for row in self._name_search.find_rows(prefix).tolist()
+            if self._names.get(row).lower().startswith(prefix)
+        ]
+        mask[rows] = True
+        return mask
+
+    def _is_active_mask(self, is_active: bool) -> np.ndarray:
+        bits = np.unpackbits(self._is_active, count=self.size, bitorder='little')
+        nulls = np.unpackbits(self._is_active_null, count=self.size, bitorder='little')
+        return (bits.astype(np.bool_) == is_active) & ~nulls.astype(np.bool_) & \
+            self._alive[:self.size]
+
+    def _created_at_mask(
+            self,
+            created_from: Optional[datetime] = None,
+            created_to: Optional[datetime] = None
+        ) -> np.ndarray:
+        mask = self._alive[:self.size].copy()
+        if created_from is not None:
+            mask &= self._created_at[:self.size] >= to_micros(created_from)
+        if created_to is not None:
+            mask &= self._created_at[:self.size] <= to_micros(created_to)
+        return mask
+
+    def _row(self, entity_id: str) -> int:
+        row = self._rows.get(entity_id)
+        if row is None:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        return row
+
+    def _write(self, row: int, entity: Category) -> None:
+        self._names.set(row, entity.name)
+        self._name_search.set(row, entity.name)
+        self._descriptions.set(row, entity.description)
+        self._created_at[row] = to_micros(entity.created_at)
+        offset = utc_offset(entity.created_at)
+        self._created_at_offset[row] = _NAIVE_OFFSET if offset is None else offset
+        _set_bit(self._is_active, row, bool(entity.is_active))
+        _set_bit(self._is_active_null, row, entity.is_active is None)
+        self._name_ranks = None
+
+    def _build(self, row: int) -> Category:
+        return hydrate(
+            Category,
+            str(uuid.UUID(bytes=bytes(self._ids[row]))),
+            name=self._names.get(row),
+            description=self._descriptions.get(row),
+            is_active=None if _get_bits(self._is_active_null, row)
+            else bool(_get_bits(self._is_active, row)),
+            created_at=self._to_datetime(
+                int(self._created_at[row]), int(self._created_at_offset[row]))
+        )
+
+    def _reserve(self, capacity: int) -> None:
+        capacity = (capacity + 7) // 8 * 8
+        self._ids = _grow(self._ids, capacity)
+        self._created_at = _grow(self._created_at, capacity)
+        self._created_at_offset = _grow(self._created_at_offset, capacity)
+        self._alive = _grow(self._alive, capacity)
+        self._is_active = _grow(self._is_active, capacity // 8)
+        self._is_active_null = _grow(self._is_active_null, capacity // 8)
+        self._names.grow(capacity)
+        self._descriptions.grow(capacity)
+        self._name_search.grow(capacity)
+
+    def _compact(self) -> None:
+        # deleted rows are dropped and the heaps rewritten in one pass, the
+        # surviving rows keep their relative (insertion) order
+        kept = np.flatnonzero(self._alive[:self.size])
+        new_rows = np.zeros(self.size, dtype=np.int64)
+        new_rows[kept] = np.arange(len(kept))
+        bitmaps = [
+            (bitmap, np.unpackbits(bitmap, count=self.size, bitorder='little')[kept])
+            for bitmap in (self._is_active, self._is_active_null)
+        ]
+
+        self._ids[:len(kept)] = self._ids[kept]
+        self._created_at[:len(kept)] = self._created_at[kept]
+        self._created_at_offset[:len(kept)] = self._created_at_offset[kept]
+        self._alive[:] = False
+        self._alive[:len(kept)] = True
+        for bitmap, bits in bitmaps:
+            bitmap[:] = 0
+            packed = np.packbits(bits, bitorder='little')
+            bitmap[:len(packed)] = packed
+        self._names.compact(kept)
+        self._descriptions.compact(kept)
+        self.size = len(kept)
+        self._name_search.compact(self._names, self.size)
+        self._rows = {entity_id: int(new_rows[row]) for entity_id, row in self._rows.items()}
+        self._name_ranks = None
+
+    def _reclaim_heaps(self) -> None:
+        # an update leaves the bytes it replaced behind in the heaps, a heap
+        # is rewritten in place once most of it is dead, keeping every row
+        for column in (self._names, self._descriptions):
+            if column.wasteful():
+                column.compact(np.arange(self.size))
+        if self._name_search.wasteful():
+            self._name_search.compact(self._names, self.size)
+
+    @staticmethod
+    def _to_datetime(micros: int, offset: int) -> datetime:
+        return from_micros(micros, None if offset == _NAIVE_OFFSET else offset)
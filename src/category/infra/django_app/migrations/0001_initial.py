@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 17:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryModel',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('entity_id', models.UUIDField(editable=False, unique=True)),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('description', models.TextField(null=True)),
+                ('is_active', models.BooleanField(db_index=True, null=True)),
+                ('created_at', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'db_table': 'categories',
+            },
+        ),
+    ]
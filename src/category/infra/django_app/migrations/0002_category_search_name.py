@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+def fill_search_name(apps, schema_editor):
+    # pylint: disable=unused-argument
+    category_model = apps.get_model('category', 'CategoryModel')
+    models_found = list(category_model.objects.only('seq', 'name'))
+    for model in models_found:
+        model.search_name = model.name.lower()
+    category_model.objects.bulk_update(models_found, ['search_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('category', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='categorymodel',
+            name='search_name',
+            field=models.TextField(default='', editable=False),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class CategoryModel(models.Model):
+
+    # seq follows the insertion order and breaks sort ties, like the
+    # position of an entity in the in-memory repository
+    seq = models.BigAutoField(primary_key=True)
+    entity_id = models.UUIDField(unique=True, editable=False)
+    name = models.CharField(max_length=255, db_index=True)
+    # the name lowered by Python, so filters match what str.lower matches
+    # instead of the ASCII-only case folding of some databases
+    search_name = models.TextField(editable=False)
+    description = models.TextField(null=True)
+    is_active = models.BooleanField(null=True, db_index=True)
+    created_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = 'categories'
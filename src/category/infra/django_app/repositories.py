@@ -0,0 +1,304 @@
+from dataclasses import dataclass
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import BulkWriteResult, SearchCursor, SearchResult
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrate
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository
+from category.infra.django_app.models import CategoryModel
+
+# objects is added to CategoryModel by the model metaclass
+# pylint: disable=no-member
+
+# the columns an entity is built from, read as tuples so no model instance
+# is created for them
+_COLUMNS = ('entity_id', 'name', 'description', 'is_active', 'created_at')
+_WRITE_FIELDS = ['name', 'search_name', 'description', 'is_active', 'created_at']
+# how each Category field is read from a row selected with _COLUMNS
+_FIELD_READERS = {
+    'id': lambda row: str(row[0]),
+    'name': itemgetter(1),
+    'description': itemgetter(2),
+    'is_active': itemgetter(3),
+    'created_at': itemgetter(4),
+}
+
+
+@dataclass(slots=True)
+class DjangoCategoryRepository(CategoryRepository):
+
+
+    # rows written or ids looked up per query by the bulk operations
+    batch_size: int = 500
+
+    def insert(self, entity: Category) -> None:
+        self._to_model(entity).save(force_insert=True)
+
+    def insert_many(self, entities: List[Category]) -> BulkWriteResult:
+        CategoryModel.objects.bulk_create(
+            map(self._to_model, entities), batch_size=self.batch_size)
+        return BulkWriteResult(succeeded=len(entities))
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Category:
+        entity_uuid = self._to_uuid(entity_id)
+        row = None
+        if entity_uuid is not None:
+            row = CategoryModel.objects.filter(entity_id=entity_uuid).values_list(*_COLUMNS).first()
+        if row is None:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        return self._build(row)
+
+    def find_all(self) -> List[Category]:
+        return list(self.iter_all())
+
+    def iter_all(self) -> Iterator[Category]:
+        rows = CategoryModel.objects.order_by('seq').values_list(*_COLUMNS)
+        yield from map(self._build, rows.iterator(chunk_size=self.batch_size))
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        entity_uuid = self._to_uuid(str(entity_id))
+        return entity_uuid is not None and \
+            CategoryModel.objects.filter(entity_id=entity_uuid).exists()
+
+    def count(self, filter_param: str | CategoryFilter | None = None) -> int:
+        return self._filter(CategoryModel.objects.all(), filter_param).count()
+
+    def update(self, entity: Category) -> None:
+        updated = CategoryModel.objects.filter(entity_id=entity.id).update(
+            **self._to_fields(entity))
+        if updated == 0:
+            raise NotFoundException(f"Entity not found using ID '{entity.id}'")
+
+    def update_many(self, entities: List[Category]) -> BulkWriteResult:
+        with transaction.atomic():
+            seqs = self._find_seqs(entity.id for entity in entities)
+            errors = {}
+            # a later entity with the same id wins, as if updated one by one
+            models: Dict[int, CategoryModel] = {}
+            for position, entity in enumerate(entities):
+                seq = seqs.get(entity.id)
+                if seq is None:
+                    errors[position] = NotFoundException(
+                        f"Entity not found using ID '{entity.id}'")
+                    continue
+
+                models[seq] = CategoryModel(seq=seq, **self._to_fields(entity))
+
+            CategoryModel.objects.bulk_update(
+                models.values(), _WRITE_FIELDS, batch_size=self.batch_size)
+
+        return BulkWriteResult(succeeded=len(entities) - len(errors), errors=errors)
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        entity_uuid = self._to_uuid(entity_id)
+        deleted = 0
+        if entity_uuid is not None:
+            deleted, _ = CategoryModel.objects.filter(entity_id=entity_uuid).delete()
+        if deleted == 0:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        with transaction.atomic():
+            seqs = self._find_seqs(map(str, entity_ids))
+            errors = {}
+            removed = set()
+            for position, entity_id in enumerate(entity_ids):
+                seq = seqs.get(str(entity_id))
+                if seq is None or seq in removed:
+                    errors[position] = NotFoundException(
+                        f"Entity not found using ID '{entity_id}'")
+                    continue
+
+                removed.add(seq)
+
+            removed = list(removed)
+            for start in range(0, len(removed), self.batch_size):
+                CategoryModel.objects.filter(
+                    seq__in=removed[start:start + self.batch_size]).delete()
+
+        return BulkWriteResult(succeeded=len(removed), errors=errors)
+
+    def search(
+            self,
+            input_params: CategoryRepository.SearchParams
+        ) -> CategoryRepository.SearchResult:
+        sort = self._effective_sort(input_params.sort)
+        queryset = self._filter(CategoryModel.objects.all(), input_params.filter)
+
+        cursor = self._decode_cursor(input_params.after or input_params.before, sort)
+
+        # the count and the page are read in one transaction, so concurrent
+        # writes cannot make them disagree; nothing is written, so no
+        # savepoint is needed inside an outer transaction
+        with transaction.atomic(savepoint=False):
+            if cursor is None:
+                rows, total, has_next, has_prev = self._read_page(queryset, input_params, sort)
+            else:
+                rows, total, has_next, has_prev = self._read_from_cursor(
+                    queryset, input_params, cursor)
+
+        if input_params.fields is None:
+            items = [self._build(row) for row in rows]
+        else:
+            items = self._project(rows, input_params.fields)
+        return SearchResult(
+            items=items,
+            total=total,
+            current_page=input_params.page,
+            per_page=input_params.per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            next_cursor=self._row_cursor(rows[-1], sort) if rows and has_next else None,
+            prev_cursor=self._row_cursor(rows[0], sort) if rows and has_prev else None
+        )
+
+    def _read_page(
+            self,
+            queryset: QuerySet,
+            input_params: CategoryRepository.SearchParams,
+            sort: Optional[str]
+        ) -> Tuple[list, int, bool, bool]:
+        per_page = input_params.per_page
+        start = (input_params.page - 1) * per_page
+        page = queryset.order_by(
+            *self._ordering(sort, input_params.sort_dir == 'desc', backwards=False))
+        rows = list(page.values_list(*_COLUMNS)[start:start + per_page])
+        if 0 < len(rows) < per_page or start == len(rows) == 0:
+            # a page that is not full is the last one
+            total = start + len(rows)
+        else:
+            total = queryset.count()
+        return rows, total, start + len(rows) < total, start > 0
+
+    def _read_from_cursor(
+            self,
+            queryset: QuerySet,
+            input_params: CategoryRepository.SearchParams,
+            cursor: SearchCursor
+        ) -> Tuple[list, int, bool, bool]:
+        # pages before a cursor are read walking backwards from it, one row
+        # past the page tells whether there is more after it
+        per_page = input_params.per_page
+        backwards = input_params.after is None
+        descending = (input_params.sort_dir == 'desc') != backwards
+        page = queryset.filter(self._cursor_filter(cursor, descending, backwards))
+        page = page.order_by(*self._ordering(cursor.sort, descending, backwards))
+        rows = list(page.values_list(*_COLUMNS)[:per_page + 1])
+        total = queryset.count()
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if not backwards:
+            return rows, total, has_more, True
+
+        rows.reverse()
+        return rows, total, True, has_more
+
+    def _filter(self, queryset: QuerySet, filter_param: str | CategoryFilter | None) -> QuerySet:
+        if not filter_param:
+            return queryset
+
+        # names are matched on search_name with the terms lowered the same way
+        if not isinstance(filter_param, CategoryFilter):
+            return queryset.filter(search_name__contains=filter_param.lower())
+
+        lookups = {
+            'search_name__contains': self._lower(filter_param.name_contains),
+            'search_name__startswith': self._lower(filter_param.name_prefix),
+            'is_active': filter_param.is_active,
+            'created_at__gte': filter_param.created_at_from,
+            'created_at__lte': filter_param.created_at_to,
+        }
+        return queryset.filter(**{
+            lookup: value for lookup, value in lookups.items() if value is not None
+        })
+
+    def _find_seqs(self, entity_ids: Iterator[str]) -> Dict[str, int]:
+        entity_uuids = list({
+            entity_uuid for entity_uuid in map(self._to_uuid, entity_ids)
+            if entity_uuid is not None
+        })
+        seqs = {}
+        for start in range(0, len(entity_uuids), self.batch_size):
+            rows = CategoryModel.objects.filter(
+                entity_id__in=entity_uuids[start:start + self.batch_size]
+            ).values_list('entity_id', 'seq')
+            seqs.update((str(entity_uuid), seq) for entity_uuid, seq in rows)
+
+        return seqs
+
+    def _ordering(self, sort: Optional[str], descending: bool, backwards: bool) -> List[str]:
+        seq_order = '-seq' if backwards else 'seq'
+        if not sort:
+            return [seq_order]
+
+        return [f"{'-' if descending else ''}{sort}", seq_order]
+
+    def _cursor_filter(self, cursor: SearchCursor, descending: bool, backwards: bool) -> Q:
+        seqs = self._find_seqs([cursor.entity_id])
+        seq_lookup = {f"seq__{'lt' if backwards else 'gt'}": seqs.get(cursor.entity_id, -1)}
+        if not cursor.sort:
+            return Q(**seq_lookup)
+
+        compare = 'lt' if descending else 'gt'
+        return Q(**{f'{cursor.sort}__{compare}': cursor.value}) | \
+            Q(**{cursor.sort: cursor.value}, **seq_lookup)
+
+    def _cursor_value_fits(self, sort: str, value: Any) -> bool:
+        # datetimes are stored aware only when USE_TZ is on
+        return not isinstance(value, datetime) or timezone.is_aware(value) == settings.USE_TZ
+
+    def _row_cursor(self, row: tuple, sort: Optional[str]) -> str:
+        value = _FIELD_READERS[sort](row) if sort else None
+        return SearchCursor(sort=sort, value=value, entity_id=str(row[0])).encode()
+
+    def _to_model(self, entity: Category) -> CategoryModel:
+        return CategoryModel(entity_id=entity.id, **self._to_fields(entity))
+
+    def _to_fields(self, entity: Category) -> dict:
+        return {
+            'name': entity.name,
+            'search_name': entity.name.lower(),
+            'description': entity.description,
+            'is_active': entity.is_active,
+            'created_at': entity.created_at,
+        }
+
+    def _build(self, row: tuple) -> Category:
+        entity_id, name, description, is_active, created_at = row
+        return hydrate(
+            Category,
+            str(entity_id),
+            name=name,
+            description=description,
+            is_active=is_active,
+            created_at=created_at
+        )
+
+    def _project(self, rows: List[tuple], field_names: Tuple[str, ...]) -> List[dict]:
+        # the fields are read straight from the columns, no entity is built
+        names = Category.projected_fields(field_names)
+        readers = [_FIELD_READERS[name] for name in names]
+        return [{name: read(row) for name, read in zip(names, readers)} for row in rows]
+
+    @staticmethod
+    def _lower(value: Optional[str]) -> Optional[str]:
+        return None if value is None else value.lower()
+
+    @staticmethod
+    def _to_uuid(entity_id: str | UniqueEntityId) -> Optional[uuid.UUID]:
+        try:
+            return uuid.UUID(str(entity_id))
+        except ValueError:
+            return None
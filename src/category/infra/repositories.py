@@ -1,29 +1,191 @@
-from typing import List
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from __seedwork.domain.async_repository import (
+    AsyncInMemorySearchableRepository,
+    ExecutorSearchableRepository
+)
+from __seedwork.domain.cached_repository import CachedSearchableRepository
+from __seedwork.domain.indexes import EntityIndex, HashIndex, NgramIndex
+from __seedwork.domain.journal import JournaledSearchableRepository
 from __seedwork.domain.repository import InMemorySearchableRepository
 from category.domain.entities import Category
-from category.domain.repositories import CategoryRepository
+from category.domain.repositories import (
+    AsyncCategoryRepository,
+    CategoryFilter,
+    CategoryRepository
+)
 
 
 class InMemoryCategoryRepository(CategoryRepository, InMemorySearchableRepository[Category, str]):
-    sortable_fields: List[str] = ['name', 'created_at']
+    full_text_fields: Dict[str, float] = {'name': 2.0, 'description': 1.0}
+    # candidates an index hands out for a CategoryFilter, as a share of the
+    # items, past which scanning all of them is cheaper
+    plan_scan_ratio: float = 0.25
 
-    def _apply_filter(self, items: List[Category], filter_param: str | None) -> List[Category]:
+    def _apply_filter(
+            self,
+            items: List[Category],
+            filter_param: str | CategoryFilter | None
+        ) -> List[Category]:
         if filter_param:
-            return list(filter(
-                lambda item: filter_param.lower() in item.name.lower(),
-                items
-            ))
+            return list(self._iter_filter(items, filter_param))
 
         return items
 
-    def _apply_sort(
+    def count(self, filter_param: str | CategoryFilter | None = None) -> int:
+        # a filter a single index answers exactly is counted from the index
+        self._sync_index()
+        if isinstance(filter_param, str) and filter_param and 'ngram:name' in self._indexes:
+            entity_ids = self._indexes['ngram:name'].search(filter_param)
+            if entity_ids is not None:
+                return len(entity_ids)
+
+        if isinstance(filter_param, CategoryFilter) and \
+                (total := self._count_from_index(filter_param)) is not None:
+            return total
+
+        return super().count(filter_param)
+
+    def _count_from_index(self, filter_param: CategoryFilter) -> Optional[int]:
+        conditions = {
+            name for name in filter_param.__dataclass_fields__
+            if getattr(filter_param, name) is not None
+        }
+        if conditions == {'is_active'} and 'value:is_active' in self._indexes:
+            return len(self._indexes['value:is_active'].search(filter_param.is_active))
+
+        if conditions and conditions <= {'created_at_from', 'created_at_to'} and \
+                'sort:created_at' in self._indexes:
+            return self._indexes['sort:created_at'].count_between(
+                filter_param.created_at_from, filter_param.created_at_to)
+
+        if conditions == {'name_contains'} and 'ngram:name' in self._indexes:
+            entity_ids = self._indexes['ngram:name'].search(filter_param.name_contains)
+            return None if entity_ids is None else len(entity_ids)
+
+        return None
+
+    def _iter_filter(
             self,
-            items: List[Category],
-            sort: str = None,
-            sort_dir: str = None
-        ) -> List[Category]:
+            items: Iterable[Category],
+            filter_param: str | CategoryFilter | None
+        ) -> Iterator[Category]:
+
+        if not filter_param:
+            return iter(items)
+
+        if isinstance(filter_param, CategoryFilter):
+            if items is self.items and (candidates := self._plan_filter(filter_param)) is not None:
+                return filter(filter_param.matches, candidates)
+
+            return filter(filter_param.matches, items)
+
+        if items is self.items and 'ngram:name' in self._indexes:
+            entity_ids = self._indexes['ngram:name'].search(filter_param)
+            if entity_ids is not None:
+                return iter(self._in_insertion_order(entity_ids))
+
+        filter_param = filter_param.lower()
+        return filter(lambda item: filter_param in item.name.lower(), items)
+
+    def _plan_filter(self, filter_param: CategoryFilter) -> Optional[List[Category]]:
+        # every condition an index can answer is costed with the number of
+        # entities the index would hand out for it; the cheapest one gives
+        # the candidates the other conditions are then checked on, or None
+        # when none narrows the items enough to beat scanning them
+        plans: List[Tuple[int, Callable[[], List[Category]]]] = []
+        ngrams = self._indexes.get('ngram:name')
+        for term in (filter_param.name_contains, filter_param.name_prefix):
+            if ngrams is not None and term and (estimate := ngrams.estimate(term)) is not None:
+                plans.append((
+                    estimate,
+                    lambda term=term: self._in_insertion_order(ngrams.search(term))
+                ))
+
+        if filter_param.is_active is not None and 'value:is_active' in self._indexes:
+            entity_ids = self._indexes['value:is_active'].search(filter_param.is_active)
+            plans.append((len(entity_ids), lambda: self._in_insertion_order(entity_ids)))
+
+        bounds = (filter_param.created_at_from, filter_param.created_at_to)
+        if bounds != (None, None) and 'sort:created_at' in self._indexes:
+            created_at = self._indexes['sort:created_at']
+            plans.append((
+                created_at.count_between(*bounds),
+                # index sequences follow the items order
+                lambda: [entry[2] for entry in sorted(
+                    created_at.between(*bounds), key=itemgetter(1))]
+            ))
+
+        if not plans:
+            return None
+
+        estimate, candidates = min(plans, key=itemgetter(0))
+        if estimate > len(self.items) * self.plan_scan_ratio:
+            return None
+
+        return candidates()
+
+    def _in_insertion_order(self, entity_ids: Iterable[str]) -> List[Category]:
+        return list(map(self.items.__getitem__, sorted(map(self._position, entity_ids))))
+
+    def _create_indexes(self) -> Dict[str, EntityIndex[Category]]:
+        indexes = super()._create_indexes()
+        indexes['ngram:name'] = NgramIndex('name')
+        indexes['value:is_active'] = HashIndex('is_active')
+        return indexes
+
+
+@dataclass(slots=True)
+class AsyncInMemoryCategoryRepository(
+    AsyncCategoryRepository,
+    AsyncInMemorySearchableRepository[Category, str]
+):
+    sortable_fields = CategoryRepository.sortable_fields
+
+    repository: InMemoryCategoryRepository = field(default_factory=InMemoryCategoryRepository)
+
+
+@dataclass(slots=True)
+class ThreadedCategoryRepository(
+    AsyncCategoryRepository,
+    ExecutorSearchableRepository[
+        Category,
+        CategoryRepository.SearchParams,
+        CategoryRepository.SearchResult
+    ]
+):
+    # wraps any CategoryRepository whose methods may run on several threads
+    # at once; the in-memory one is not such a repository, use
+    # AsyncInMemoryCategoryRepository for it
+
+    repository: CategoryRepository
+
+
+@dataclass(slots=True)
+class JournaledCategoryRepository(
+    CategoryRepository,
+    JournaledSearchableRepository[Category, str]
+):
+    # an InMemoryCategoryRepository that survives restarts, see
+    # RepositoryJournal for the durability it gives; its journal takes a
+    # CategoryCodec so snapshots are written in the binary category format
+
+    repository: InMemoryCategoryRepository = field(default_factory=InMemoryCategoryRepository)
+
+
+@dataclass(slots=True)
+class CachedCategoryRepository(
+    CategoryRepository,
+    CachedSearchableRepository[Category, str]
+):
+    # a read-through cache in front of any CategoryRepository, see
+    # CachedSearchableRepository for what it invalidates
+
+    repository: CategoryRepository
 
-        if sort is None:
-            sort = 'created_at'
+    def _matches_filter(self, filter_param: str | CategoryFilter | None, entity: Category) -> bool:
+        if isinstance(filter_param, CategoryFilter):
+            return filter_param.matches(entity)
 
-        return super()._apply_sort(items, sort, sort_dir)
+        return not filter_param or filter_param.lower() in entity.name.lower()
@@ -0,0 +1,292 @@
+from array import array
+from dataclasses import dataclass, field
+from datetime import timezone
+import mmap
+import struct
+import sys
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Type
+import uuid
+
+from __seedwork.domain.journal import EntityCodec
+from __seedwork.infra.hydration import hydrator
+from category.domain.entities import Category
+from category.infra.timestamps import (
+    AWARE_EPOCH,
+    MICROSECOND,
+    NAIVE_EPOCH,
+    SECOND,
+    to_micros,
+    utc_offset
+)
+
+FORMAT_VERSION = 1
+
+_MAGIC = b'CATSNAP\x00'
+# magic, format version, row count and string heap size
+_HEADER = struct.Struct('<8sH6xQQ')
+_ALIGNMENT = 8
+# UTC offset of a naive created_at
+_NAIVE = -2 ** 31
+
+_ITER_CHUNK = 4096
+
+
+def _padded(size: int) -> int:
+    return -size % _ALIGNMENT
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == 'big':
+        values.byteswap()
+
+    return values
+
+
+@dataclass(frozen=True, slots=True)
+class _Layout:
+
+    # pylint: disable=too-many-instance-attributes
+    # every section starts at a multiple of 8 bytes, so the fixed width
+    # ones can be cast in place: ids, created_at, created_at offsets,
+    # is_active bits, description null bits, string offsets, string heap.
+    # Row r keeps its name at string 2r and its description at 2r + 1
+    rows: int
+    heap_size: int
+    ids: int = field(init=False)
+    created_at: int = field(init=False)
+    offsets: int = field(init=False)
+    is_active: int = field(init=False)
+    null_descriptions: int = field(init=False)
+    strings: int = field(init=False)
+    heap: int = field(init=False)
+    size: int = field(init=False)
+
+    def __post_init__(self):
+        position = _HEADER.size
+        bitmask_size = (self.rows + 7) // 8
+        for name, size in [
+                ('ids', 16 * self.rows),
+                ('created_at', 8 * self.rows),
+                ('offsets', 4 * self.rows),
+                ('is_active', bitmask_size),
+                ('null_descriptions', bitmask_size),
+                ('strings', 8 * (2 * self.rows + 1)),
+                ('heap', self.heap_size)]:
+            object.__setattr__(self, name, position)
+            position += size + _padded(size)
+        object.__setattr__(self, 'size', position)
+
+
+def write_category_snapshot(file: BinaryIO, categories: Iterable[Category]) -> int:
+    ids = bytearray()
+    created_at = array('q')
+    offsets = array('i')
+    is_active = bytearray()
+    null_descriptions = bytearray()
+    strings = array('Q', [0])
+    heap = bytearray()
+    for row, category in enumerate(categories):
+        ids += uuid.UUID(category.id).bytes
+        created_at.append(to_micros(category.created_at))
+        offset = utc_offset(category.created_at)
+        offsets.append(_NAIVE if offset is None else offset)
+
+        if row % 8 == 0:
+            is_active.append(0)
+            null_descriptions.append(0)
+        if category.is_active:
+            is_active[-1] |= 1 << (row % 8)
+        if category.description is None:
+            null_descriptions[-1] |= 1 << (row % 8)
+
+        heap += category.name.encode()
+        strings.append(len(heap))
+        heap += (category.description or '').encode()
+        strings.append(len(heap))
+
+    rows = len(created_at)
+    layout = _Layout(rows, len(heap))
+    file.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, rows, len(heap)))
+    for section in [
+            ids,
+            _little_endian(created_at).tobytes(),
+            _little_endian(offsets).tobytes(),
+            is_active,
+            null_descriptions,
+            _little_endian(strings).tobytes(),
+            heap]:
+        file.write(section)
+        file.write(bytes(_padded(len(section))))
+
+    return layout.size
+
+
+@dataclass(slots=True)
+class CategorySnapshot:
+
+    # pylint: disable=too-many-instance-attributes
+    # a read only, memory-mapped view of a snapshot starting offset bytes
+    # into its file; rows are decoded into categories only when they are
+    # accessed and, as they were written from valid categories, without
+    # validating them again
+    path: str
+    offset: int = 0
+    rows: int = field(default=0, init=False)
+    _file: Optional[BinaryIO] = field(default=None, init=False, repr=False)
+    _mapped: Optional[mmap.mmap] = field(default=None, init=False, repr=False)
+    _views: List[memoryview] = field(default_factory=lambda: [], init=False, repr=False)
+    _ids: memoryview = field(init=False, repr=False)
+    _created_at: memoryview = field(init=False, repr=False)
+    _offsets: memoryview = field(init=False, repr=False)
+    _is_active: memoryview = field(init=False, repr=False)
+    _null_descriptions: memoryview = field(init=False, repr=False)
+    _strings: memoryview = field(init=False, repr=False)
+    _heap: memoryview = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # pylint: disable=consider-using-with
+        self._file = open(self.path, 'rb')
+        try:
+            self._open()
+        except Exception:
+            self.close()
+            raise
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, row: int) -> Category:
+        if row < 0:
+            row += self.rows
+        if not 0 <= row < self.rows:
+            raise IndexError('snapshot row out of range')
+
+        return self._decode(row, row + 1)[0]
+
+    def __iter__(self) -> Iterator[Category]:
+        # rows are still decoded as the iteration reaches them, a chunk at a
+        # time so every column is sliced once per chunk rather than per row
+        for start in range(0, self.rows, _ITER_CHUNK):
+            yield from self._decode(start, min(start + _ITER_CHUNK, self.rows))
+
+    def __enter__(self) -> 'CategorySnapshot':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # the views must be released before the map they point into
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self._file.seek(self.offset)
+        header = self._file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"'{self.path}' is not a category snapshot")
+
+        magic, version, rows, heap_size = _HEADER.unpack(header)
+        if magic != _MAGIC:
+            raise ValueError(f"'{self.path}' is not a category snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported category snapshot version {version}")
+
+        layout = _Layout(rows, heap_size)
+        self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapped) < self.offset + layout.size:
+            raise ValueError(f"'{self.path}' is truncated")
+
+        self.rows = rows
+        bitmask_size = (rows + 7) // 8
+        self._ids = self._view(layout.ids, 16 * rows)
+        self._created_at = self._view(layout.created_at, 8 * rows, 'q')
+        self._offsets = self._view(layout.offsets, 4 * rows, 'i')
+        self._is_active = self._view(layout.is_active, bitmask_size)
+        self._null_descriptions = self._view(layout.null_descriptions, bitmask_size)
+        self._strings = self._view(layout.strings, 8 * (2 * rows + 1), 'Q')
+        self._heap = self._view(layout.heap, heap_size)
+
+    def _view(self, start: int, size: int, type_code: Optional[str] = None) -> memoryview:
+        if not self._views:
+            self._views.append(memoryview(self._mapped))
+        start += self.offset
+        view = self._views[0][start:start + size]
+        self._views.append(view)
+        if type_code is None:
+            return view
+
+        if sys.byteorder == 'big':
+            # sections are little-endian, a big-endian host copies them once
+            values = array(type_code)
+            values.frombytes(view)
+            values.byteswap()
+            return memoryview(values)
+
+        view = view.cast(type_code)
+        self._views.append(view)
+        return view
+
+    def _decode(self, start: int, stop: int) -> List[Category]:
+        # what the loop reads is held in locals, this is what loading costs
+        # pylint: disable=too-many-locals
+        digits = self._ids[16 * start:16 * stop].hex()
+        strings = self._strings[2 * start:2 * stop + 1].tolist()
+        heap = bytes(self._heap[strings[0]:strings[-1]])
+        base = strings[0]
+        is_active = self._is_active
+        null_descriptions = self._null_descriptions
+        hydrate = hydrator(Category)
+        categories = []
+        for row, micros, offset in zip(
+                range(start, stop),
+                self._created_at[start:stop].tolist(),
+                self._offsets[start:stop].tolist()):
+            # the canonical form str(uuid.UUID(bytes=...)) gives, built directly
+            at = 32 * (row - start)
+            entity_id = f'{digits[at:at + 8]}-{digits[at + 8:at + 12]}-' \
+                f'{digits[at + 12:at + 16]}-{digits[at + 16:at + 20]}-{digits[at + 20:at + 32]}'
+            name_at = 2 * (row - start)
+            name = heap[strings[name_at] - base:strings[name_at + 1] - base].decode()
+            description = None
+            if not null_descriptions[row >> 3] >> (row & 7) & 1:
+                description = heap[
+                    strings[name_at + 1] - base:strings[name_at + 2] - base].decode()
+
+            # inlined from_micros
+            if offset == _NAIVE:
+                created_at = NAIVE_EPOCH + micros * MICROSECOND
+            else:
+                created_at = (AWARE_EPOCH + micros * MICROSECOND).astimezone(
+                    timezone(offset * SECOND))
+
+            categories.append(hydrate(entity_id, {
+                'name': name,
+                'description': description,
+                'is_active': bool(is_active[row >> 3] >> (row & 7) & 1),
+                'created_at': created_at,
+            }))
+
+        return categories
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryCodec(EntityCodec[Category]):
+
+    # journals categories as EntityCodec does, but snapshots them in the
+    # binary format above rather than as JSON lines
+    entity_class: Type[Category] = Category
+
+    def write_snapshot(self, file: BinaryIO, entities: Iterable[Category]) -> None:
+        write_category_snapshot(file, entities)
+
+    def read_snapshot(self, path: str, offset: int) -> List[Category]:
+        with CategorySnapshot(path, offset) as snapshot:
+            return list(snapshot)
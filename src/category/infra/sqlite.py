@@ -0,0 +1,394 @@
+from dataclasses import dataclass, field
+import functools
+from operator import itemgetter
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterator, List, Optional, Tuple
+import uuid
+
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import BulkWriteResult, SearchCursor, SearchResult
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrate
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository
+from category.infra.timestamps import from_micros, to_micros, utc_offset
+
+_COLUMNS = 'seq, id, name, description, is_active, created_at, created_at_offset'
+
+_SCHEMA = [
+    # seq follows the insertion order and breaks sort ties, like the
+    # position of an entity in the in-memory repository; search_name holds
+    # the name lowered by Python so LIKE matches what str.lower matches
+    '''CREATE TABLE IF NOT EXISTS categories (
+        seq INTEGER PRIMARY KEY,
+        id TEXT NOT NULL UNIQUE,
+        name TEXT NOT NULL,
+        search_name TEXT NOT NULL,
+        description TEXT,
+        is_active INTEGER,
+        created_at INTEGER NOT NULL,
+        created_at_offset INTEGER
+    )''',
+    'CREATE INDEX IF NOT EXISTS categories_name ON categories (name)',
+    'CREATE INDEX IF NOT EXISTS categories_created_at ON categories (created_at)',
+]
+
+_INSERT = (
+    'INSERT INTO categories (id, name, search_name, description, is_active, '
+    'created_at, created_at_offset) VALUES (?, ?, ?, ?, ?, ?, ?)'
+)
+_UPDATE = (
+    'UPDATE categories SET name = ?, search_name = ?, description = ?, is_active = ?, '
+    'created_at = ?, created_at_offset = ? WHERE id = ?'
+)
+_DELETE = 'DELETE FROM categories WHERE id = ?'
+_SELECT_BY_ID = f'SELECT {_COLUMNS} FROM categories WHERE id = ?'
+_SELECT_ALL = f'SELECT {_COLUMNS} FROM categories ORDER BY seq'
+_SELECT_SEQ = 'SELECT seq FROM categories WHERE id = ?'
+_EXISTS = 'SELECT EXISTS (SELECT 1 FROM categories WHERE id = ?)'
+
+# how each Category field is read from a row selected with _COLUMNS
+_FIELD_READERS = {
+    'id': itemgetter(1),
+    'name': itemgetter(2),
+    'description': itemgetter(3),
+    'is_active': lambda row: None if row[4] is None else bool(row[4]),
+    'created_at': lambda row: from_micros(row[5], row[6]),
+}
+
+
+@dataclass(slots=True)
+class SQLiteConnectionPool:
+
+    # one connection per thread, opened on first use; an in-memory database
+    # is shared by all of them through a named shared cache, kept alive by
+    # the connection opened with the pool
+    database: str = ':memory:'
+    _uri: str = field(init=False, repr=False)
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False)
+    _connections: List[sqlite3.Connection] = field(
+        default_factory=lambda: [], init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.database == ':memory:':
+            self._uri = f'file:category-{uuid.uuid4().hex}?mode=memory&cache=shared'
+        else:
+            self._uri = Path(self.database).absolute().as_uri()
+            self.connection().execute('PRAGMA journal_mode = WAL')
+
+        self.connection()
+
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self._uri,
+                uri=True,
+                check_same_thread=False,
+                cached_statements=256
+            )
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.execute('PRAGMA busy_timeout = 5000')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+
+        return connection
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections = []
+        self._local = threading.local()
+
+
+_NAME_LIKE = "search_name LIKE ? ESCAPE '\\'"
+_IS_ACTIVE = 'is_active = ?'
+_CREATED_FROM = 'created_at >= ?'
+_CREATED_TO = 'created_at <= ?'
+
+
+@functools.lru_cache(maxsize=None)
+def _search_sql(
+        sort: Optional[str],
+        is_reverse: bool,
+        conditions: Tuple[str, ...],
+        cursor: Optional[str]
+    ) -> Tuple[str, str]:
+    # the SQL text only depends on the shape of the search, so every shape
+    # is built once and reused from the statement cache of the connection
+    where = list(conditions)
+    count_sql = 'SELECT COUNT(*) FROM categories'
+    if where:
+        count_sql += f" WHERE {' AND '.join(where)}"
+
+    # pages before a cursor are read walking backwards from it
+    backwards = cursor == 'before'
+    descending = is_reverse != backwards
+    seq_order = 'DESC' if backwards else 'ASC'
+    if cursor:
+        seq_compare = '<' if backwards else '>'
+        if sort:
+            compare = '<' if descending else '>'
+            where.append(f'({sort} {compare} ? OR ({sort} = ? AND seq {seq_compare} ?))')
+        else:
+            where.append(f'seq {seq_compare} ?')
+
+    order = f"{sort} {'DESC' if descending else 'ASC'}, seq {seq_order}" if sort \
+        else f'seq {seq_order}'
+    page_sql = f'SELECT {_COLUMNS} FROM categories'
+    if where:
+        page_sql += f" WHERE {' AND '.join(where)}"
+    page_sql += f' ORDER BY {order} LIMIT ?'
+    if not cursor:
+        page_sql += ' OFFSET ?'
+
+    return count_sql, page_sql
+
+
+@dataclass(slots=True)
+class SQLiteCategoryRepository(CategoryRepository):
+
+    database: str = ':memory:'
+    _pool: SQLiteConnectionPool = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._pool = SQLiteConnectionPool(self.database)
+        with self._pool.connection() as connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    def insert(self, entity: Category) -> None:
+        with self._pool.connection() as connection:
+            connection.execute(_INSERT, self._to_row(entity))
+
+    def insert_many(self, entities: List[Category]) -> BulkWriteResult:
+        with self._pool.connection() as connection:
+            connection.executemany(_INSERT, map(self._to_row, entities))
+        return BulkWriteResult(succeeded=len(entities))
+
+    def find_by_id(self, entity_id: str | UniqueEntityId) -> Category:
+        row = self._pool.connection().execute(_SELECT_BY_ID, (str(entity_id),)).fetchone()
+        if row is None:
+            raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+        return self._build(row)
+
+    def find_all(self) -> List[Category]:
+        return list(self.iter_all())
+
+    def exists(self, entity_id: str | UniqueEntityId) -> bool:
+        return bool(self._pool.connection().execute(_EXISTS, (str(entity_id),)).fetchone()[0])
+
+    def count(self, filter_param: str | CategoryFilter | None = None) -> int:
+        conditions, filter_args = self._filter_conditions(filter_param)
+        count_sql, _ = _search_sql(None, False, conditions, None)
+        return self._pool.connection().execute(count_sql, filter_args).fetchone()[0]
+
+    def iter_all(self) -> Iterator[Category]:
+        yield from map(self._build, self._pool.connection().execute(_SELECT_ALL))
+
+    def update(self, entity: Category) -> None:
+        with self._pool.connection() as connection:
+            if connection.execute(_UPDATE, self._to_update_row(entity)).rowcount == 0:
+                raise NotFoundException(f"Entity not found using ID '{entity.id}'")
+
+    def update_many(self, entities: List[Category]) -> BulkWriteResult:
+        errors = {}
+        with self._pool.connection() as connection:
+            for position, entity in enumerate(entities):
+                if connection.execute(_UPDATE, self._to_update_row(entity)).rowcount == 0:
+                    errors[position] = NotFoundException(
+                        f"Entity not found using ID '{entity.id}'")
+        return BulkWriteResult(succeeded=len(entities) - len(errors), errors=errors)
+
+    def delete(self, entity_id: str | UniqueEntityId) -> None:
+        with self._pool.connection() as connection:
+            if connection.execute(_DELETE, (str(entity_id),)).rowcount == 0:
+                raise NotFoundException(f"Entity not found using ID '{entity_id}'")
+
+    def delete_many(self, entity_ids: List[str | UniqueEntityId]) -> BulkWriteResult:
+        errors = {}
+        with self._pool.connection() as connection:
+            for position, entity_id in enumerate(entity_ids):
+                if connection.execute(_DELETE, (str(entity_id),)).rowcount == 0:
+                    errors[position] = NotFoundException(
+                        f"Entity not found using ID '{entity_id}'")
+        return BulkWriteResult(succeeded=len(entity_ids) - len(errors), errors=errors)
+
+    def search(
+            self,
+            input_params: CategoryRepository.SearchParams
+        ) -> CategoryRepository.SearchResult:
+        connection = self._pool.connection()
+        sort = self._effective_sort(input_params.sort)
+        conditions, filter_args = self._filter_conditions(input_params.filter)
+
+        cursor = self._decode_cursor(input_params.after or input_params.before, sort)
+
+        direction = None
+        if cursor:
+            direction = 'after' if input_params.after is not None else 'before'
+        sql = _search_sql(sort, input_params.sort_dir == 'desc', conditions, direction)
+
+        # the count and the page are read in one transaction, so concurrent
+        # writes cannot make them disagree
+        connection.execute('BEGIN')
+        try:
+            if cursor is None:
+                rows, total, has_next, has_prev = self._read_page(
+                    connection, sql, filter_args, input_params)
+            else:
+                rows, total, has_next, has_prev = self._read_from_cursor(
+                    connection, sql, filter_args, input_params, cursor)
+        finally:
+            connection.commit()
+
+        if input_params.fields is None:
+            items = [self._build(row) for row in rows]
+        else:
+            items = self._project(rows, input_params.fields)
+        return SearchResult(
+            items=items,
+            total=total,
+            current_page=input_params.page,
+            per_page=input_params.per_page,
+            sort=input_params.sort,
+            sort_dir=input_params.sort_dir,
+            filter=input_params.filter,
+            next_cursor=self._row_cursor(rows[-1], sort) if rows and has_next else None,
+            prev_cursor=self._row_cursor(rows[0], sort) if rows and has_prev else None
+        )
+
+    def _read_page(
+            self,
+            connection: sqlite3.Connection,
+            sql: Tuple[str, str],
+            filter_args: list,
+            input_params: CategoryRepository.SearchParams
+        ) -> Tuple[list, int, bool, bool]:
+        count_sql, page_sql = sql
+        per_page = input_params.per_page
+        start = (input_params.page - 1) * per_page
+        rows = connection.execute(page_sql, [*filter_args, per_page, start]).fetchall()
+        if 0 < len(rows) < per_page or start == len(rows) == 0:
+            # a page that is not full is the last one
+            total = start + len(rows)
+        else:
+            total = connection.execute(count_sql, filter_args).fetchone()[0]
+        return rows, total, start + len(rows) < total, start > 0
+
+    def _read_from_cursor(
+            self,
+            connection: sqlite3.Connection,
+            sql: Tuple[str, str],
+            filter_args: list,
+            input_params: CategoryRepository.SearchParams,
+            cursor: SearchCursor
+        ) -> Tuple[list, int, bool, bool]:
+        # one row past the page tells whether there is more after it
+        count_sql, page_sql = sql
+        per_page = input_params.per_page
+        rows = connection.execute(
+            page_sql,
+            [*filter_args, *self._cursor_args(connection, cursor), per_page + 1]
+        ).fetchall()
+        total = connection.execute(count_sql, filter_args).fetchone()[0]
+        has_more = len(rows) > per_page
+        rows = rows[:per_page]
+        if input_params.after is not None:
+            return rows, total, has_more, True
+
+        rows.reverse()
+        return rows, total, True, has_more
+
+    def close(self) -> None:
+        self._pool.close()
+
+    def _filter_conditions(
+            self,
+            filter_param: str | CategoryFilter | None
+        ) -> Tuple[Tuple[str, ...], list]:
+        if not filter_param:
+            return (), []
+
+        if not isinstance(filter_param, CategoryFilter):
+            filter_param = CategoryFilter(name_contains=filter_param)
+
+        # a prefix is a LIKE anchored at the start of the lowered name
+        conditions = []
+        args = []
+        if filter_param.name_contains is not None:
+            conditions.append(_NAME_LIKE)
+            args.append(f'%{self._escape_like(filter_param.name_contains.lower())}%')
+        if filter_param.name_prefix is not None:
+            conditions.append(_NAME_LIKE)
+            args.append(f'{self._escape_like(filter_param.name_prefix.lower())}%')
+        if filter_param.is_active is not None:
+            conditions.append(_IS_ACTIVE)
+            args.append(int(filter_param.is_active))
+        if filter_param.created_at_from is not None:
+            conditions.append(_CREATED_FROM)
+            args.append(to_micros(filter_param.created_at_from))
+        if filter_param.created_at_to is not None:
+            conditions.append(_CREATED_TO)
+            args.append(to_micros(filter_param.created_at_to))
+
+        return tuple(conditions), args
+
+    def _cursor_args(self, connection: sqlite3.Connection, cursor: SearchCursor) -> list:
+        row = connection.execute(_SELECT_SEQ, (cursor.entity_id,)).fetchone()
+        seq = row[0] if row else -1
+        if not cursor.sort:
+            return [seq]
+
+        value = cursor.value
+        if cursor.sort == 'created_at':
+            value = to_micros(value)
+
+        return [value, value, seq]
+
+    def _to_row(self, entity: Category) -> tuple:
+        return (entity.id, *self._to_values(entity))
+
+    def _to_update_row(self, entity: Category) -> tuple:
+        return (*self._to_values(entity), entity.id)
+
+    def _to_values(self, entity: Category) -> tuple:
+        return (
+            entity.name,
+            entity.name.lower(),
+            entity.description,
+            None if entity.is_active is None else int(entity.is_active),
+            to_micros(entity.created_at),
+            utc_offset(entity.created_at)
+        )
+
+    def _build(self, row: tuple) -> Category:
+        _, entity_id, name, description, is_active, created_at, offset = row
+        return hydrate(
+            Category,
+            entity_id,
+            name=name,
+            description=description,
+            is_active=None if is_active is None else bool(is_active),
+            created_at=from_micros(created_at, offset)
+        )
+
+    def _project(self, rows: List[tuple], field_names: Tuple[str, ...]) -> List[dict]:
+        # the fields are read straight from the columns, no entity is built
+        names = Category.projected_fields(field_names)
+        readers = [_FIELD_READERS[name] for name in names]
+        return [{name: read(row) for name, read in zip(names, readers)} for row in rows]
+
+    def _row_cursor(self, row: tuple, sort: Optional[str]) -> str:
+        value = _FIELD_READERS[sort](row) if sort else None
+        return SearchCursor(sort=sort, value=value, entity_id=row[1]).encode()
+
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
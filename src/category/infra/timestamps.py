@@ -0,0 +1,27 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# created_at is stored as microseconds since the epoch, counted in UTC for
+# an aware value whose utcoffset is kept apart in seconds, so it is read
+# back in the offset it was written with
+NAIVE_EPOCH = datetime(1970, 1, 1)
+AWARE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+SECOND = timedelta(seconds=1)
+
+
+def to_micros(value: datetime) -> int:
+    epoch = NAIVE_EPOCH if value.tzinfo is None else AWARE_EPOCH
+    return (value - epoch) // MICROSECOND
+
+
+def utc_offset(value: datetime) -> Optional[int]:
+    offset = value.utcoffset()
+    return None if offset is None else offset // SECOND
+
+
+def from_micros(micros: int, offset: Optional[int]) -> datetime:
+    if offset is None:
+        return NAIVE_EPOCH + micros * MICROSECOND
+
+    return (AWARE_EPOCH + micros * MICROSECOND).astimezone(timezone(offset * SECOND))
@@ -0,0 +1,263 @@
+from datetime import datetime, timezone
+from typing import Any, List, Tuple
+from unittest.mock import patch
+from __seedwork.domain.exceptions import NotFoundException
+from __seedwork.domain.repository import BulkWriteResult, SearchCursor, SearchResult
+from __seedwork.domain.value_objects import UniqueEntityId
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository
+from category.infra.repositories import InMemoryCategoryRepository
+
+
+class CategoryRepositoryBehaviorMixin:
+    # the behavior every category repository shares with the in memory one,
+    # mixed into a TestCase whose setUp builds the backend under test
+
+    repo: CategoryRepository
+    # a created_at the backend keeps as given, offset included
+    created_at = datetime(2023, 6, 18, 1, 0, 0, 5, tzinfo=timezone.utc)
+    # cursor values the sort fields cannot be compared with
+    incomparable_cursor_values: List[Tuple[str, Any]] = [
+        ('name', 5),
+        ('created_at', '2020'),
+        ('created_at', None),
+    ]
+
+    def test_insert_and_find_by_id(self):
+        entities = [
+            Category(name='Movie'),
+            Category(
+                name='Série',
+                description='some description',
+                is_active=False,
+                created_at=self.created_at
+            ),
+            Category(name='Documentary', description=''),
+        ]
+        self.repo.insert(entities[0])
+        self.assertEqual(self.repo.insert_many(entities[1:]), BulkWriteResult(succeeded=2))
+
+        # rows are hydrated as trusted, neither validated nor parsed again
+        with patch.object(Category, '_validate') as validate, \
+                patch.object(UniqueEntityId, '_UniqueEntityId__validate') as validate_id:
+            for entity in entities:
+                self.assertEqual(self.repo.find_by_id(entity.id), entity)
+                self.assertEqual(self.repo.find_by_id(entity.unique_entity_id), entity)
+
+            self.assertEqual(self.repo.find_all(), entities)
+        validate.assert_not_called()
+        validate_id.assert_not_called()
+        self.assertEqual(list(self.repo.iter_all()), entities)
+        self.assertEqual(
+            self.repo.find_by_id(entities[1].id).created_at.utcoffset(),
+            self.created_at.utcoffset()
+        )
+
+    def test_throw_not_found_exception(self):
+        unique_entity_id = UniqueEntityId()
+        for method in [self.repo.find_by_id, self.repo.delete]:
+            for entity_id in ['1', unique_entity_id]:
+                with self.assertRaises(NotFoundException) as assert_error:
+                    method(entity_id)
+
+                self.assertEqual(
+                    assert_error.exception.args[0],
+                    f"Entity not found using ID '{entity_id}'"
+                )
+
+        entity = Category(name='Movie')
+        with self.assertRaises(NotFoundException) as assert_error:
+            self.repo.update(entity)
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            f"Entity not found using ID '{entity.id}'"
+        )
+
+    def test_update_and_delete(self):
+        entity = Category(name='Movie')
+        other_entity = Category(name='Series')
+        self.repo.insert_many([entity, other_entity])
+
+        entity.update(name='Movie updated', description='some description')
+        entity.deactivate()
+        self.repo.update(entity)
+        self.assertEqual(self.repo.find_by_id(entity.id), entity)
+        self.assertEqual(self.repo.find_all(), [entity, other_entity])
+
+        self.repo.delete(entity.id)
+        self.assertEqual(self.repo.find_all(), [other_entity])
+        with self.assertRaises(NotFoundException):
+            self.repo.find_by_id(entity.id)
+        self.repo.delete(other_entity.unique_entity_id)
+        self.assertEqual(self.repo.find_all(), [])
+
+    def test_bulk_update_and_delete_report_missing_entities(self):
+        entities = [Category(name=f'Movie {index}') for index in range(5)]
+        self.repo.insert_many(entities)
+
+        entities[1].update(name='Series', description=None)
+        entities[3].deactivate()
+        result = self.repo.update_many([Category(name='unknown'), entities[1], entities[3]])
+        self.assertEqual(result.succeeded, 2)
+        self.assertEqual(list(result.errors), [0])
+        self.assertIsInstance(result.errors[0], NotFoundException)
+        self.assertEqual(self.repo.find_all(), entities)
+
+        result = self.repo.delete_many([
+            entities[0].id,
+            '1',
+            entities[2].unique_entity_id,
+            entities[0].id,
+            entities[4].id,
+        ])
+        self.assertEqual(result.succeeded, 3)
+        self.assertEqual(list(result.errors), [1, 3])
+        self.assertEqual(self.repo.find_all(), [entities[1], entities[3]])
+
+    def test_search_applying_filter_and_sort_and_paginate(self):
+        items = [
+            Category(name='test'),
+            Category(name='a'),
+            Category(name='TEST'),
+            Category(name='e'),
+            Category(name='TeSt'),
+        ]
+        self.repo.insert_many(items)
+
+        for page, expected in [(1, [items[2], items[4]]), (2, [items[0]])]:
+            result = self.repo.search(self.repo.SearchParams(
+                page=page,
+                per_page=2,
+                sort="name",
+                sort_dir="asc",
+                filter="TEST"
+            ))
+
+            self.assertEqual(result, SearchResult(
+                items=expected,
+                total=3,
+                current_page=page,
+                per_page=2,
+                sort="name",
+                sort_dir="asc",
+                filter="TEST"
+            ))
+
+    def test_search_matches_in_memory_repository(self):
+        in_memory_repo = InMemoryCategoryRepository()
+        names = ['test', 'a', 'TEST', 'e', 'TeSt', 'b', 'Ação', 'aÇÃo', '_test_', '50%']
+        entities = [
+            Category(
+                name=name,
+                is_active=index % 3 > 0,
+                created_at=datetime(2023, 1, 1, 0, 0, index % 5)
+            )
+            for index, name in enumerate(names * 3)
+        ]
+        self.repo.insert_many(entities)
+        in_memory_repo.insert_many(entities)
+
+        deleted_ids = [entity.id for entity in entities[::4]]
+        self.repo.delete_many(deleted_ids)
+        in_memory_repo.delete_many(deleted_ids)
+
+        arrange = [
+            {},
+            {'per_page': 4, 'page': 2},
+            {'per_page': 4, 'page': 9},
+            {'sort': 'name', 'per_page': 5, 'page': 2},
+            {'sort': 'name', 'sort_dir': 'desc', 'per_page': 5},
+            {'sort': 'created_at', 'sort_dir': 'desc', 'per_page': 3, 'page': 3},
+            {'sort': 'fake', 'filter': 'test', 'per_page': 2, 'page': 2},
+            {'filter': 'AÇ', 'sort': 'name'},
+            {'filter': '_'},
+            {'filter': '%'},
+            {'filter': 'fake'},
+            {'filter': CategoryFilter(name_prefix='TE', is_active=True)},
+            {'filter': CategoryFilter(is_active=False), 'per_page': 4, 'page': 2},
+            {
+                'filter': CategoryFilter(
+                    name_contains='es',
+                    created_at_from=datetime(2023, 1, 1, 0, 0, 1),
+                    created_at_to=datetime(2023, 1, 1, 0, 0, 3)
+                ),
+                'sort': 'name'
+            },
+        ]
+
+        for i in arrange:
+            params = self.repo.SearchParams(**i)
+            self.assertEqual(
+                self.repo.search(params),
+                in_memory_repo.search(params),
+                f"The output using {i} is different"
+            )
+            self.assertEqual(
+                self.repo.count(params.filter),
+                in_memory_repo.count(params.filter),
+                f"The count using {i} is different"
+            )
+
+            params = self.repo.SearchParams(**i, fields='id,name,is_active,created_at')
+            result = self.repo.search(params)
+            expected = in_memory_repo.search(params)
+            self.assertEqual(result, expected, f"The projection using {i} is different")
+            self.assertEqual(
+                (result.next_cursor, result.prev_cursor),
+                (expected.next_cursor, expected.prev_cursor),
+                f"The cursors of the projection using {i} are different"
+            )
+
+        for entity in in_memory_repo.items[:2]:
+            self.assertTrue(self.repo.exists(entity.unique_entity_id))
+        self.assertFalse(self.repo.exists(UniqueEntityId()))
+        self.assertFalse(self.repo.exists('fake id'))
+
+    def test_search_by_cursor(self):
+        in_memory_repo = InMemoryCategoryRepository()
+        for index, name in enumerate('dbadcabdcae'):
+            entity = Category(name=name, created_at=datetime(2023, 1, 1, 0, 0, index % 4))
+            self.repo.insert(entity)
+            in_memory_repo.insert(entity)
+
+        for i in [
+                {},
+                {'sort': 'name'},
+                {'sort': 'fake'},
+                {'sort': 'name', 'sort_dir': 'desc', 'filter': 'a'}]:
+            pages = [
+                self.repo.search(self.repo.SearchParams(page=page, per_page=3, **i)).items
+                for page in [1, 2, 3, 4]
+            ]
+
+            result = self.repo.search(self.repo.SearchParams(per_page=3, **i))
+            pages_by_cursor = [result.items]
+            while result.next_cursor:
+                params = self.repo.SearchParams(per_page=3, after=result.next_cursor, **i)
+                result = self.repo.search(params)
+                self.assertEqual(result, in_memory_repo.search(params))
+                pages_by_cursor.append(result.items)
+
+            self.assertEqual(pages_by_cursor, [page for page in pages if page])
+
+            pages_by_cursor = [result.items]
+            while result.prev_cursor:
+                params = self.repo.SearchParams(per_page=3, before=result.prev_cursor, **i)
+                result = self.repo.search(params)
+                self.assertEqual(result, in_memory_repo.search(params))
+                pages_by_cursor.insert(0, result.items)
+
+            self.assertEqual(
+                [item for page in pages_by_cursor for item in page],
+                [item for page in pages for item in page]
+            )
+
+        # a cursor value the sort field cannot be compared with is ignored
+        first_id = self.repo.search(self.repo.SearchParams()).items[0].id
+        for sort, value in self.incomparable_cursor_values:
+            token = SearchCursor(sort=sort, value=value, entity_id=first_id).encode()
+            self.assertEqual(
+                self.repo.search(self.repo.SearchParams(per_page=3, sort=sort, after=token)),
+                self.repo.search(self.repo.SearchParams(per_page=3, sort=sort))
+            )
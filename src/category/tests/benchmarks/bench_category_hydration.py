@@ -0,0 +1,75 @@
+"""
+Measures how many Category entities per second are rebuilt from stored
+rows through the validating constructor and through hydrate, as the
+repositories do, and how long SQLiteCategoryRepository takes to read them
+all back.
+
+Run from the src folder:
+    python -m category.tests.benchmarks.bench_category_hydration [sizes...]
+"""
+import sys
+import timeit
+from typing import Dict, List
+
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrate
+from category.domain.entities import Category
+from category.infra.sqlite import SQLiteCategoryRepository
+from category.tests.benchmarks.common import make_categories
+
+DEFAULT_SIZES = [1_000_000]
+
+
+def measure(categories: List[Category]) -> Dict[str, float]:
+    rows = [
+        (category.id, category.name, category.description, category.is_active,
+         category.created_at)
+        for category in categories
+    ]
+
+    def construct():
+        return [
+            Category(
+                unique_entity_id=UniqueEntityId(entity_id),
+                name=name,
+                description=description,
+                is_active=is_active,
+                created_at=created_at
+            )
+            for entity_id, name, description, is_active, created_at in rows
+        ]
+
+    def trusted():
+        return [
+            hydrate(
+                Category,
+                entity_id,
+                name=name,
+                description=description,
+                is_active=is_active,
+                created_at=created_at
+            )
+            for entity_id, name, description, is_active, created_at in rows
+        ]
+
+    repo = SQLiteCategoryRepository()
+    repo.insert_many(categories)
+    timings = {
+        'constructor (1/s)': len(rows) / timeit.timeit(construct, number=1),
+        'hydrate (1/s)': len(rows) / timeit.timeit(trusted, number=1),
+        'sqlite iter_all (s)': timeit.timeit(lambda: sum(1 for _ in repo.iter_all()), number=1),
+    }
+    repo.close()
+    return timings
+
+
+def main(sizes: List[int]):
+    labels = ['constructor (1/s)', 'hydrate (1/s)', 'sqlite iter_all (s)']
+    print(f"{'size':>8} " + ' '.join(f'{label:>20}' for label in labels))
+    for size in sizes:
+        timings = measure(make_categories(size))
+        print(f'{size:>8} ' + ' '.join(f'{timings[label]:>20,.2f}' for label in labels))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
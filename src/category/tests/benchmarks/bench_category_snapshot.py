@@ -0,0 +1,87 @@
+"""
+Compares the binary category snapshot against a JSON dump of
+Category.to_dict, in size and load time.
+
+Run from the src folder:
+    python -m category.tests.benchmarks.bench_category_snapshot [sizes...]
+"""
+from datetime import datetime
+import json
+import os
+import sys
+import tempfile
+import timeit
+from typing import List
+
+from __seedwork.domain.journal import EntityCodec
+from category.domain.entities import Category
+from category.infra.snapshot import CategorySnapshot, write_category_snapshot
+from category.tests.benchmarks.common import make_categories
+
+DEFAULT_SIZES = [10_000, 100_000]
+CODEC = EntityCodec(Category)
+
+
+def dump_json(path: str, categories: List[Category]) -> None:
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump([category.to_dict() for category in categories], file, default=str)
+
+
+def load_json(path: str) -> List[Category]:
+    # entities are hydrated as the snapshot does, so only decoding is compared
+    with open(path, encoding='utf-8') as file:
+        return [
+            CODEC.from_record((
+                item['id'],
+                item['name'],
+                item['description'],
+                item['is_active'],
+                datetime.fromisoformat(item['created_at'])
+            ))
+            for item in json.load(file)
+        ]
+
+
+def open_snapshot(path: str) -> Category:
+    with CategorySnapshot(path) as snapshot:
+        return snapshot[len(snapshot) // 2]
+
+
+def load_snapshot(path: str) -> List[Category]:
+    with CategorySnapshot(path) as snapshot:
+        return list(snapshot)
+
+
+def formats(directory: str, categories: List[Category]) -> List[tuple]:
+    # the name, path and write, open one, load functions of each format
+    json_path = os.path.join(directory, 'categories.json')
+    snapshot_path = os.path.join(directory, 'categories.snapshot')
+
+    def write_snapshot():
+        with open(snapshot_path, 'wb') as file:
+            write_category_snapshot(file, categories)
+
+    return [
+        ('json', json_path, lambda: dump_json(json_path, categories),
+         lambda: load_json(json_path)[len(categories) // 2], lambda: load_json(json_path)),
+        ('binary', snapshot_path, write_snapshot,
+         lambda: open_snapshot(snapshot_path), lambda: load_snapshot(snapshot_path)),
+    ]
+
+
+def main(sizes: List[int]):
+    print(f"{'size':>8} {'format':>8} {'bytes':>12} {'write (ms)':>12} "
+          f"{'open+1 (ms)':>12} {'load (ms)':>12}")
+    for size in sizes:
+        categories = make_categories(size)
+        with tempfile.TemporaryDirectory() as directory:
+            for name, path, write, open_one, load in formats(directory, categories):
+                write_time = timeit.timeit(write, number=1) * 1000
+                open_time = min(timeit.repeat(open_one, number=1, repeat=3)) * 1000
+                load_time = min(timeit.repeat(load, number=1, repeat=3)) * 1000
+                print(f'{size:>8} {name:>8} {os.path.getsize(path):>12} {write_time:>12.2f} '
+                      f'{open_time:>12.2f} {load_time:>12.2f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,67 @@
+"""
+Compares the construction and update throughput of Category validated with
+a new CategoryRules serializer per entity, as it used to be, against the
+compiled CategoryValidator checking the whole entity on construction and
+the changed fields on update.
+
+Run from the src folder:
+    python -m category.tests.benchmarks.bench_category_validation [counts...]
+"""
+from datetime import datetime
+import sys
+import timeit
+from typing import Dict, List
+from unittest.mock import patch
+
+from __seedwork.domain.exceptions import EntityValidationException
+from category.domain.entities import Category
+from category.domain.validators import CategoryDRFValidator
+
+DEFAULT_COUNTS = [10_000, 100_000]
+
+
+def _validate_with_serializer(category: Category) -> None:
+    validator = CategoryDRFValidator()
+    if not validator.validate(category.to_dict()):
+        raise EntityValidationException(validator.errors)
+
+
+def measure(count: int) -> Dict[str, float]:
+    created_at = datetime(2023, 1, 1)
+
+    def construct():
+        return [
+            Category(name=f'Movie {index}', description='some description', created_at=created_at)
+            for index in range(count)
+        ]
+
+    def update(categories):
+        for category in categories:
+            category.update('Documentary', None)
+
+    timings = {}
+    categories = construct()
+    timings['compiled (1/s)'] = count / timeit.timeit(construct, number=1)
+    timings['compiled update (1/s)'] = count / timeit.timeit(
+        lambda: update(categories), number=1)
+    # updates used to validate the whole entity with a serializer as well
+    with patch.object(Category, '_validate', _validate_with_serializer), \
+            patch.object(Category, '_validate_fields',
+                         lambda category, values: _validate_with_serializer(category)):
+        timings['serializer (1/s)'] = count / timeit.timeit(construct, number=1)
+        timings['serializer update (1/s)'] = count / timeit.timeit(
+            lambda: update(categories), number=1)
+    return timings
+
+
+def main(counts: List[int]):
+    labels = [
+        'serializer (1/s)', 'compiled (1/s)', 'serializer update (1/s)', 'compiled update (1/s)']
+    print(f"{'count':>8} " + ' '.join(f'{label:>24}' for label in labels))
+    for count in counts:
+        timings = measure(count)
+        print(f'{count:>8} ' + ' '.join(f'{timings[label]:>24,.0f}' for label in labels))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_COUNTS)
@@ -0,0 +1,55 @@
+"""
+Compares memory and search latency of ColumnarCategoryRepository against
+InMemoryCategoryRepository.
+
+Run from the src folder (numpy is required):
+    python -m category.tests.benchmarks.bench_columnar_repository [sizes...]
+"""
+import gc
+import sys
+import tracemalloc
+from typing import Callable, List
+
+from category.domain.repositories import CategoryRepository
+from category.infra.columnar import ColumnarCategoryRepository
+from category.infra.repositories import InMemoryCategoryRepository
+from category.tests.benchmarks.common import make_categories, time_searches
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def build(factory: Callable[[], CategoryRepository], size: int):
+    gc.collect()
+    tracemalloc.start()
+    repo = factory()
+    repo.insert_many(make_categories(size))
+    gc.collect()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return repo, memory
+
+
+def measure(repo: CategoryRepository):
+    return time_searches(repo, {
+        'first pages': {},
+        'sort name': {'sort': 'name'},
+        'filter': {'filter': 'drama anime'},
+    })
+
+
+def main(sizes: List[int]):
+    print(f"{'size':>8} {'backend':>9} {'memory (MB)':>12} "
+          f"{'pages (ms)':>11} {'sort (ms)':>10} {'filter (ms)':>12}")
+    for size in sizes:
+        for name, factory in (
+                ('list', InMemoryCategoryRepository),
+                ('columnar', ColumnarCategoryRepository)):
+            repo, memory = build(factory, size)
+            timings = measure(repo)
+            print(f"{size:>8} {name:>9} {memory / 2 ** 20:>12.1f} "
+                  f"{timings['first pages']:>11.2f} {timings['sort name']:>10.2f} "
+                  f"{timings['filter']:>12.2f}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
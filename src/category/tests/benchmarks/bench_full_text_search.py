@@ -0,0 +1,55 @@
+"""
+Measures relevance ranked searches of InMemoryCategoryRepository and the
+cost of keeping its full-text index up to date.
+
+Run from the src folder:
+    python -m category.tests.benchmarks.bench_full_text_search [sizes...]
+"""
+import random
+import sys
+import timeit
+from typing import Dict, List
+
+from category.domain.repositories import CategoryRepository
+from category.infra.repositories import InMemoryCategoryRepository
+from category.tests.benchmarks.common import make_categories
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+QUERIES = {
+    'rare (ms)': '12345',
+    'pair (ms)': 'drama anime',
+    'common (ms)': 'movie',
+}
+
+
+def measure(categories) -> Dict[str, float]:
+    repo = InMemoryCategoryRepository()
+    timings = {'insert (s)': timeit.timeit(lambda: repo.insert_many(categories), number=1)}
+
+    # a new page every time, so cached searches are not measured
+    for label, query in QUERIES.items():
+        timings[label] = sum(
+            timeit.timeit(
+                lambda page=page, query=query: repo.search(CategoryRepository.SearchParams(
+                    page=page, filter=query, sort='relevance')),
+                number=1
+            )
+            for page in range(1, 6)
+        ) / 5 * 1000
+
+    sample = random.Random(0).sample(categories, 1000)
+    timings['update (us)'] = timeit.timeit(
+        lambda: [repo.update(category) for category in sample], number=1) * 1000
+    return timings
+
+
+def main(sizes: List[int]):
+    labels = ['insert (s)', *QUERIES, 'update (us)']
+    print(f"{'size':>8} " + ' '.join(f'{label:>12}' for label in labels))
+    for size in sizes:
+        timings = measure(make_categories(size))
+        print(f'{size:>8} ' + ' '.join(f'{timings[label]:>12.2f}' for label in labels))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
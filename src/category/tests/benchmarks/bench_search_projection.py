@@ -0,0 +1,64 @@
+"""
+Measures the cost of serializing a search page of every backend as entities
+turned into dicts with to_dict, against asking the search for the fields
+of a list screen only.
+
+Run from the src folder:
+    python -m category.tests.benchmarks.bench_search_projection [sizes...]
+"""
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+from category.domain.repositories import CategoryRepository
+from category.infra.columnar import ColumnarCategoryRepository
+from category.infra.repositories import InMemoryCategoryRepository
+from category.infra.sqlite import SQLiteCategoryRepository
+from category.tests.benchmarks.common import make_categories
+
+DEFAULT_SIZES = [100_000]
+PER_PAGE = 100
+PAGES = 20
+FIELDS = 'id,name,is_active'
+
+
+def measure(repo: CategoryRepository) -> Dict[str, float]:
+    # every page is requested once so cached searches are not measured
+    def entities():
+        for page in range(1, PAGES + 1):
+            result = repo.search(CategoryRepository.SearchParams(
+                page=page, per_page=PER_PAGE, sort='name'))
+            [item.to_dict() for item in result.items]  # pylint: disable=expression-not-assigned
+
+    def projected():
+        for page in range(PAGES + 1, 2 * PAGES + 1):
+            repo.search(CategoryRepository.SearchParams(
+                page=page, per_page=PER_PAGE, sort='name', fields=FIELDS))
+
+    repo.search(CategoryRepository.SearchParams(sort='name', page=2 * PAGES + 2))
+    return {
+        'to_dict (ms)': timeit.timeit(entities, number=1) / PAGES * 1000,
+        'fields (ms)': timeit.timeit(projected, number=1) / PAGES * 1000,
+    }
+
+
+def main(sizes: List[int]):
+    labels = ['to_dict (ms)', 'fields (ms)']
+    print(f"{'size':>8} {'backend':>10} " + ' '.join(f'{label:>12}' for label in labels))
+    for size in sizes:
+        categories = make_categories(size)
+        factories: Dict[str, Callable[[], CategoryRepository]] = {
+            'list': InMemoryCategoryRepository,
+            'sqlite': SQLiteCategoryRepository,
+            'columnar': ColumnarCategoryRepository,
+        }
+        for backend, factory in factories.items():
+            repo = factory()
+            repo.insert_many(categories)
+            timings = measure(repo)
+            print(f'{size:>8} {backend:>10} ' + ' '.join(
+                f'{timings[label]:>12.3f}' for label in labels))
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
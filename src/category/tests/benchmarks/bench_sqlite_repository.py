@@ -0,0 +1,66 @@
+"""
+Compares SQLiteCategoryRepository, in memory and on a WAL file, against
+InMemoryCategoryRepository.
+
+Run from the src folder:
+    python -m category.tests.benchmarks.bench_sqlite_repository [sizes...]
+"""
+import functools
+import os
+import random
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, List
+
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepository
+from category.infra.repositories import InMemoryCategoryRepository
+from category.infra.sqlite import SQLiteCategoryRepository
+from category.tests.benchmarks.common import make_categories, time_searches
+
+DEFAULT_SIZES = [10_000, 100_000]
+
+
+def measure(
+        repo: CategoryRepository,
+        categories: List[Category],
+        pages: int = 5
+    ) -> Dict[str, float]:
+    timings = {'insert (s)': timeit.timeit(lambda: repo.insert_many(categories), number=1)}
+
+    ids = [category.id for category in random.Random(0).sample(categories, 1000)]
+    timings['find (us)'] = timeit.timeit(
+        lambda: [repo.find_by_id(entity_id) for entity_id in ids], number=1) * 1000
+
+    timings.update(time_searches(repo, {
+        'pages (ms)': {},
+        'sort (ms)': {'sort': 'name'},
+        'filter (ms)': {'filter': 'drama anime'},
+    }, pages))
+    return timings
+
+
+def main(sizes: List[int]):
+    labels = ['insert (s)', 'find (us)', 'pages (ms)', 'sort (ms)', 'filter (ms)']
+    print(f"{'size':>8} {'backend':>14} " + ' '.join(f'{label:>12}' for label in labels))
+    for size in sizes:
+        categories = make_categories(size)
+        with tempfile.TemporaryDirectory() as directory:
+            factories: Dict[str, Callable[[], CategoryRepository]] = {
+                'list': InMemoryCategoryRepository,
+                'sqlite memory': SQLiteCategoryRepository,
+                'sqlite file': functools.partial(
+                    SQLiteCategoryRepository, os.path.join(directory, 'categories.db')),
+            }
+            for name, factory in factories.items():
+                repo = factory()
+                timings = measure(repo, categories)
+                print(f'{size:>8} {name:>14} ' + ' '.join(
+                    f'{timings[label]:>12.2f}' for label in labels))
+                if isinstance(repo, SQLiteCategoryRepository):
+                    repo.close()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
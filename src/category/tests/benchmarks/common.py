@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+import random
+import timeit
+from typing import Dict, List
+from unittest.mock import patch
+
+from category.domain.entities import Category
+from category.domain.repositories import CategoryRepository
+
+WORDS = ['movie', 'series', 'documentary', 'anime', 'drama', 'comedy', 'kids', 'news']
+
+
+def make_categories(size: int) -> List[Category]:
+    generator = random.Random(size)
+    start = datetime(2023, 1, 1)
+    # fixture data only, validation is not what is being measured here
+    with patch.object(Category, '_validate'):
+        return [
+            Category(
+                name=f'{generator.choice(WORDS)} {generator.choice(WORDS)} {index}',
+                description=generator.choice([None, 'some description']),
+                is_active=generator.random() < 0.8,
+                created_at=start + timedelta(seconds=generator.randrange(10_000_000))
+            )
+            for index in range(size)
+        ]
+
+
+def time_searches(
+        repo: CategoryRepository,
+        params: Dict[str, dict],
+        pages: int = 5
+    ) -> Dict[str, float]:
+    # the average ms of a page for each labelled search; every page is
+    # requested once so cached searches are not measured, the first call
+    # warms up lazily built ranks and indexes
+    timings = {}
+    for label, kwargs in params.items():
+        repo.search(CategoryRepository.SearchParams(page=pages + 1, **kwargs))
+        timings[label] = sum(
+            timeit.timeit(
+                lambda page=page, kwargs=kwargs: repo.search(
+                    CategoryRepository.SearchParams(page=page, **kwargs)),
+                number=1
+            )
+            for page in range(1, pages + 1)
+        ) / pages * 1000
+    return timings
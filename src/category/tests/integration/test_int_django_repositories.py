@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+import unittest
+from django.db import connection
+from django.test import TestCase
+from category.domain.entities import Category
+from category.infra.django_app.repositories import DjangoCategoryRepository
+from category.tests.behaviors import CategoryRepositoryBehaviorMixin
+
+
+def setUpModule():  # pylint: disable=invalid-name
+    setUpModule.database_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+
+
+def tearDownModule():  # pylint: disable=invalid-name
+    connection.creation.destroy_test_db(setUpModule.database_name, verbosity=0)
+
+
+class TestDjangoCategoryRepository(CategoryRepositoryBehaviorMixin, TestCase):
+
+    repo: DjangoCategoryRepository
+    # naive as USE_TZ is off, so an aware cursor value is not comparable
+    created_at = datetime(2023, 6, 18, 1, 0, 0, 5)
+    incomparable_cursor_values = CategoryRepositoryBehaviorMixin.incomparable_cursor_values + [
+        ('created_at', datetime(2023, 1, 1, tzinfo=timezone.utc)),
+    ]
+
+    def setUp(self) -> None:
+        self.repo = DjangoCategoryRepository(batch_size=2)
+
+    def test_search_reads_the_count_only_when_the_page_is_full(self):
+        self.repo.insert_many([Category(name=name) for name in ['test', 'a', 'TEST', 'e']])
+
+        params = self.repo.SearchParams(page=1, per_page=2, filter='TEST')
+        with self.assertNumQueries(2):
+            self.assertEqual(self.repo.search(params).total, 2)
+
+        # the last page is not full, so no count query is needed
+        params = self.repo.SearchParams(page=1, per_page=3, filter='TEST')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.repo.search(params).total, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -87,11 +87,15 @@ class TestCategoryIntegration(unittest.TestCase):
             }
         ]
 
-        category = Category(name='Movie')
+        category = Category(name='Movie', description='some description')
         for i in invalid_data:
             with self.assertRaises(EntityValidationException) as assert_error:
                 category.update(**i['data']) #NOSONAR
 
+            # nothing is changed by an update that is not valid
+            self.assertEqual(category.name, 'Movie')
+            self.assertEqual(category.description, 'some description')
+
             self.assertIn('name', assert_error.exception.error)
             self.assertEqual(
                 assert_error.exception.error['name'],
@@ -106,6 +110,16 @@ class TestCategoryIntegration(unittest.TestCase):
 
         self.assertEqual(assert_error.exception.error['description'], ['Not a valid string.'])
 
+    def test_update_only_checks_the_fields_it_changes(self):
+        category = Category(name='Movie')
+        # pylint: disable=protected-access
+        category._set('is_active', 5)
+        category.update('Documentary', 'some description')
+        self.assertEqual(category.name, 'Documentary')
+
+        category.activate()
+        self.assertTrue(category.is_active)
+
     def test_update_with_valid_cases(self):
         category = Category(name='Movie')
         try:
@@ -1,6 +1,18 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import itertools
+from types import SimpleNamespace
 import unittest
+from unittest.mock import patch
 
-from category.domain.validators import CategoryValidator, CategoryValidatorFactory
+from django.test import override_settings
+
+from category.domain.validators import (
+    CategoryDRFValidator,
+    CategoryValidator,
+    CategoryValidatorFactory,
+    validate_many
+)
 
 
 class TestCategoryValidatorsIntegration(unittest.TestCase):
@@ -82,3 +94,82 @@ class TestCategoryValidatorsIntegration(unittest.TestCase):
             is_valid = self.validator.validate(data)
             self.assertTrue(is_valid)
             self.assertEqual(self.validator.validated_data, data)
+
+    def test_matches_the_drf_serializer(self):
+        arrange = [
+            None,
+            {'name': 'Movie', 'description': '  ', 'is_active': None, 'created_at': None},
+            {'name': ' Movie ', 'description': ' Some Value ', 'is_active': False,
+             'created_at': datetime(2023, 1, 1)},
+            {'name': 'Movie', 'created_at': datetime(2023, 1, 1, tzinfo=timezone.utc)},
+            {'name': 'Movie', 'created_at': '2023-01-01T10:00:00'},
+            {'name': '\t', 'description': 5, 'is_active': 'yes', 'created_at': 'fake'},
+            {'name': 'Movie\x00', 'description': 'a\x00b'},
+            {'name': 'ação' * 64, 'description': True},
+            {'name': 'ação' * 63 + ' '},
+            {'name': 't' * 256, 'is_active': 1},
+            {'name': 2.5, 'description': ['a']},
+        ]
+        for use_tz, data in itertools.product([False, True], arrange):
+            with override_settings(USE_TZ=use_tz):
+                expected = CategoryDRFValidator()
+                expected_is_valid = expected.validate(data)
+                for value in [data, SimpleNamespace(**data) if data is not None else None]:
+                    validator = CategoryValidatorFactory.create()
+                    self.assertEqual(validator.validate(value), expected_is_valid, data)
+                    self.assertEqual(validator.errors, expected.errors, data)
+                    self.assertEqual(validator.validated_data, expected.validated_data, data)
+
+    def test_refuses_values_with_no_fields_as_the_drf_serializer(self):
+        for data in ['abc', 5, True, ['name'], b'name']:
+            expected = CategoryDRFValidator()
+            self.assertFalse(expected.validate(data))
+            self.assertFalse(self.validator.validate(data), data)
+            self.assertEqual(self.validator.errors, expected.errors, data)
+
+
+class TestValidateMany(unittest.TestCase):
+
+    rows = [
+        {'name': 'Movie'},
+        {'name': ''},
+        None,
+        {'name': 'Documentary', 'is_active': False},
+        {'name': 5, 'description': 5},
+        {'name': 'Series', 'description': 'some description'},
+        {'name': 't' * 256},
+    ]
+    expected = {
+        1: {'name': ['This field may not be blank.']},
+        2: {'name': ['This field is required.']},
+        4: {'name': ['Not a valid string.'], 'description': ['Not a valid string.']},
+        6: {'name': ['Ensure this field has no more than 255 characters.']},
+    }
+
+    def test_small_batches_are_validated_in_process(self):
+        with patch('category.domain.validators.ProcessPoolExecutor') as pool:
+            self.assertEqual(validate_many(self.rows), self.expected)
+            self.assertEqual(validate_many([]), {})
+        pool.assert_not_called()
+
+    def test_large_batches_are_validated_in_chunks_over_the_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor, \
+                patch.object(executor, 'map', wraps=executor.map) as executor_map:
+            errors = validate_many(
+                self.rows * 3, executor=executor, chunk_size=2, parallel_threshold=7)
+
+        self.assertEqual(executor_map.call_count, 1)
+        self.assertEqual(list(executor_map.call_args.args[1]), list(range(0, 21, 2)))
+        self.assertEqual(errors, {
+            position + offset: row_errors
+            for offset in [0, 7, 14]
+            for position, row_errors in self.expected.items()
+        })
+
+    def test_large_batches_fan_out_over_a_process_pool(self):
+        errors = validate_many(self.rows * 2, chunk_size=3, parallel_threshold=10)
+        self.assertEqual(errors, {
+            position + offset: row_errors
+            for offset in [0, 7]
+            for position, row_errors in self.expected.items()
+        })
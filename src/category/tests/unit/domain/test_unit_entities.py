@@ -61,6 +61,20 @@ class TestCategoryUnit(unittest.TestCase):
             self.assertEqual(category.name, name)
             self.assertEqual(category.description, description)
 
+    def test_mutators_only_validate_the_fields_they_change(self):
+        category = Category(name='test', is_active=False)
+        arrange = [
+            (lambda: category.update('Movie', None), {'name': 'Movie', 'description': None}),
+            (category.activate, {'is_active': True}),
+            (category.deactivate, {'is_active': False}),
+        ]
+        for mutate, expected in arrange:
+            with patch.object(Category, '_validate') as validate, \
+                    patch.object(Category, '_validate_fields') as validate_fields:
+                mutate()
+            validate.assert_not_called()
+            validate_fields.assert_called_once_with(expected)
+
     def test_activate(self):
         with patch.object(Category, '_validate'):
             category = Category(name='test', is_active=False)
@@ -0,0 +1,36 @@
+from datetime import datetime
+import unittest
+
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter, CategoryRepository
+
+
+class TestCategoryFilter(unittest.TestCase):
+
+    def test_matches(self):
+        category = Category(
+            name='Ação e Drama', is_active=True, created_at=datetime(2023, 1, 2))
+
+        arrange = [
+            (CategoryFilter(), True),
+            (CategoryFilter(name_contains='E DR'), True),
+            (CategoryFilter(name_contains='comedy'), False),
+            (CategoryFilter(name_prefix='aÇÃ'), True),
+            (CategoryFilter(name_prefix='drama'), False),
+            (CategoryFilter(is_active=True), True),
+            (CategoryFilter(is_active=False), False),
+            (CategoryFilter(created_at_from=datetime(2023, 1, 2)), True),
+            (CategoryFilter(created_at_from=datetime(2023, 1, 3)), False),
+            (CategoryFilter(created_at_to=datetime(2023, 1, 2)), True),
+            (CategoryFilter(created_at_to=datetime(2023, 1, 1)), False),
+            (CategoryFilter(name_prefix='ação', is_active=False), False),
+        ]
+        for filter_param, expected in arrange:
+            self.assertEqual(filter_param.matches(category), expected, filter_param)
+
+    def test_search_params_keep_a_category_filter(self):
+        filter_param = CategoryFilter(is_active=False)
+
+        self.assertIs(CategoryRepository.SearchParams(filter=filter_param).filter, filter_param)
+        self.assertIsNone(CategoryRepository.SearchParams(filter=CategoryFilter()).filter)
+        self.assertEqual(CategoryRepository.SearchParams(filter=5).filter, '5')
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+import unittest
+from __seedwork.domain.value_objects import UniqueEntityId
+from __seedwork.infra.hydration import hydrate
+from category.domain.entities import Category
+from category.domain.repositories import CategoryFilter
+from category.tests.behaviors import CategoryRepositoryBehaviorMixin
+
+try:
+    from category.infra.columnar import ColumnarCategoryRepository
+except ImportError:  # numpy is an optional dependency
+    ColumnarCategoryRepository = None
+
+
+@unittest.skipIf(ColumnarCategoryRepository is None, 'numpy is not installed')
+class TestColumnarCategoryRepository(CategoryRepositoryBehaviorMixin, unittest.TestCase):
+
+    repo: 'ColumnarCategoryRepository'
+
+    def setUp(self) -> None:
+        self.repo = ColumnarCategoryRepository(capacity=2)
+
+    def test_keeps_created_at_offsets_and_unknown_is_active(self):
+        offset = timezone(timedelta(hours=-3))
+        entities = [
+            Category(name='Movie', created_at=datetime(2023, 6, 18, 1, 0, 0, 5, tzinfo=offset)),
+            hydrate(
+                Category,
+                UniqueEntityId().id,
+                name='Series',
+                description=None,
+                is_active=None,
+                created_at=datetime(2023, 6, 18)
+            ),
+        ]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        found = [self.repo.find_by_id(entity.id) for entity in entities]
+        self.assertEqual(found, entities)
+        self.assertEqual(found[0].created_at.utcoffset(), timedelta(hours=-3))
+        self.assertIsNone(found[1].created_at.tzinfo)
+        self.assertIsNone(found[1].is_active)
+        self.assertEqual(
+            self.repo.search(self.repo.SearchParams(fields='created_at,is_active')).items,
+            [
+                {'created_at': entities[1].created_at, 'is_active': None},
+                {'created_at': entities[0].created_at, 'is_active': True},
+            ]
+        )
+        self.assertEqual(
+            self.repo.search(self.repo.SearchParams(
+                filter=CategoryFilter(is_active=False))).items,
+            []
+        )
+
+    def test_compaction_keeps_rows(self):
+        entities = [Category(name=f'Movie {index}') for index in range(2100)]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        for entity in entities[:1500]:
+            self.repo.delete(entity.id)
+
+        self.assertLess(self.repo.size, 2100)
+        self.assertEqual(self.repo.find_all(), entities[1500:])
+        result = self.repo.search(self.repo.SearchParams(filter='movie 20', sort='name'))
+        self.assertEqual(result.items, sorted(
+            [entity for entity in entities[1500:] if 'movie 20' in entity.name.lower()],
+            key=lambda entity: entity.name
+        )[:15])
+
+    def test_updates_reclaim_dead_heap_bytes(self):
+        entities = [
+            Category(name=f'Movie {index}', description='some description' * 10)
+            for index in range(100)
+        ]
+        for entity in entities:
+            self.repo.insert(entity)
+
+        for round_number in range(200):
+            for entity in entities[:10]:
+                entity.update(f'Series {round_number} {entity.name[-2:]}', entity.description)
+                self.repo.update(entity)
+
+        # pylint: disable=protected-access
+        for heap in [self.repo._names, self.repo._descriptions, self.repo._name_search]:
+            self.assertLess(len(heap.heap), 3 * (1 << 16))
+            self.assertLessEqual(heap.dead, max(1 << 16, len(heap.heap) - heap.dead))
+        self.assertEqual(self.repo.find_all(), entities)
+        self.assertEqual(
+            self.repo.search(self.repo.SearchParams(filter='series 199')).total, 10)
+        self.assertEqual(self.repo.search(self.repo.SearchParams(filter='movie')).total, 90)
+
+    def test_vectorized_masks(self):
+        entities = [
+            Category(name='a', is_active=True, created_at=datetime(2023, 1, 1)),
+            Category(name='b', is_active=False, created_at=datetime(2023, 1, 2)),
+            Category(name='c', is_active=True, created_at=datetime(2023, 1, 3)),
+        ]
+        for entity in entities:
+            self.repo.insert(entity)
+        self.repo.delete(entities[2].id)
+
+        # pylint: disable=protected-access
+        self.assertEqual(self.repo._is_active_mask(True).tolist(), [True, False, False])
+        self.assertEqual(self.repo._is_active_mask(False).tolist(), [False, True, False])
+        self.assertEqual(
+            self.repo._created_at_mask(datetime(2023, 1, 2)).tolist(),
+            [False, True, False]
+        )
+        self.assertEqual(
+            self.repo._created_at_mask(created_to=datetime(2023, 1, 2)).tolist(),
+            [True, True, False]
+        )
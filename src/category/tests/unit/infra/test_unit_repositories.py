@@ -1,11 +1,26 @@
-from datetime import datetime
+from datetime import datetime, timezone
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 from __seedwork.domain.exceptions import NotFoundException
-from __seedwork.domain.repository import SearchResult
+from __seedwork.domain.journal import RepositoryJournal
+from __seedwork.domain.repository import SearchCursor, SearchResult
 from __seedwork.domain.value_objects import UniqueEntityId
 from category.domain.entities import Category
-from category.domain.repositories import CategoryRepository
-from category.infra.repositories import InMemoryCategoryRepository
+from category.domain.repositories import (
+    AsyncCategoryRepository,
+    CategoryFilter,
+    CategoryRepository
+)
+from category.infra.repositories import (
+    AsyncInMemoryCategoryRepository,
+    CachedCategoryRepository,
+    InMemoryCategoryRepository,
+    JournaledCategoryRepository,
+    ThreadedCategoryRepository
+)
+from category.infra.snapshot import CategoryCodec
 
 
 class TestCategoryRepository(unittest.TestCase):
@@ -22,7 +37,8 @@ class TestCategoryRepository(unittest.TestCase):
         )
 
     def test_sortable_fields(self):
-        self.assertEqual(CategoryRepository.sortable_fields, [])
+        self.assertEqual(CategoryRepository.sortable_fields, ['name', 'created_at'])
+        self.assertEqual(CategoryRepository.sort_default, 'created_at')
 
 
 
@@ -456,3 +472,468 @@ class TestInMemoryCategoryRepository(unittest.TestCase):
             sort_dir="asc",
             filter="TEST"
         ))
+
+    def test_search_applying_filter_after_writes(self):
+        items = [
+            Category(name='Movie'),
+            Category(name='Documentary'),
+            Category(name='TV movie'),
+            Category(name='Series'),
+        ]
+        for item in items:
+            self.repo.insert(item)
+
+        items[3].update(name='Movie series', description=None)
+        self.repo.update(items[3])
+        self.repo.delete(items[0].id)
+
+        for filter_param in ['MOVIE', 'mo', 'series', 'fake']:
+            result = self.repo.search(self.repo.SearchParams(filter=filter_param))
+            self.assertEqual(
+                result.items,
+                [
+                    item for item in self.repo.items
+                    if filter_param.lower() in item.name.lower()
+                ],
+                f"The output using filter {filter_param} is different"
+            )
+
+    def test_search_by_cursor_using_default_sort(self):
+        items = [
+            Category(name='a', created_at=datetime(2023, 6, 18, 1, 0, 0)),
+            Category(name='b', created_at=datetime(2023, 6, 18, 1, 0, 2)),
+            Category(name='c', created_at=datetime(2023, 6, 18, 1, 0, 1)),
+        ]
+        for item in items:
+            self.repo.insert(item)
+
+        result = self.repo.search(self.repo.SearchParams(per_page=2))
+        self.assertEqual(result.items, [items[0], items[2]])
+
+        result = self.repo.search(self.repo.SearchParams(
+            per_page=2, after=result.next_cursor
+        ))
+        self.assertEqual(result.items, [items[1]])
+        self.assertIsNone(result.next_cursor)
+
+        result = self.repo.search(self.repo.SearchParams(
+            per_page=2, before=result.prev_cursor
+        ))
+        self.assertEqual(result.items, [items[0], items[2]])
+        self.assertIsNone(result.prev_cursor)
+
+        # a cursor value the sort field cannot be compared with is ignored
+        for sort, value in [
+                ('name', 5),
+                ('created_at', '2020'),
+                ('created_at', datetime(2023, 6, 18, 1, 0, 0, tzinfo=timezone.utc))]:
+            token = SearchCursor(sort=sort, value=value, entity_id=items[0].id).encode()
+            self.assertEqual(
+                self.repo.search(self.repo.SearchParams(per_page=2, sort=sort, after=token)),
+                self.repo.search(self.repo.SearchParams(per_page=2, sort=sort))
+            )
+
+    def test_search_with_unknown_sort_keeps_insertion_order(self):
+        items = [
+            Category(name='a', created_at=datetime(2023, 6, 18, 1, 0, 2)),
+            Category(name='b', created_at=datetime(2023, 6, 18, 1, 0, 0)),
+            Category(name='c', created_at=datetime(2023, 6, 18, 1, 0, 1)),
+        ]
+        self.repo.insert_many(items)
+
+        result = self.repo.search(self.repo.SearchParams(per_page=2, sort='fake'))
+        self.assertEqual(result.items, items[:2])
+
+        result = self.repo.search(self.repo.SearchParams(
+            per_page=2, sort='fake', after=result.next_cursor
+        ))
+        self.assertEqual(result.items, items[2:])
+
+    def test_search_applying_category_filter(self):
+        items = [
+            Category(
+                name=f'{name} {index}',
+                is_active=index % 4 > 0,
+                created_at=datetime(2023, 1, 1, 0, index // 60, index % 60)
+            )
+            for index, name in enumerate(['Movie', 'Documentary', 'TV movie', 'Series'] * 40)
+        ]
+        self.repo.insert_many(items)
+        items[5].update(name='Movie remake', description=None)
+        self.repo.update(items[5])
+        self.repo.delete(items[6].id)
+
+        arrange = [
+            CategoryFilter(name_contains='movie'),
+            CategoryFilter(name_prefix='MOVIE', is_active=True),
+            CategoryFilter(name_prefix='mo'),
+            CategoryFilter(is_active=False),
+            CategoryFilter(
+                created_at_from=datetime(2023, 1, 1, 0, 0, 3),
+                created_at_to=datetime(2023, 1, 1, 0, 0, 9)
+            ),
+            CategoryFilter(name_contains='series', created_at_from=datetime(2023, 1, 1, 0, 2)),
+        ]
+        for filter_param in arrange:
+            result = self.repo.search(self.repo.SearchParams(filter=filter_param, per_page=200))
+            self.assertEqual(
+                result.items,
+                [item for item in self.repo.items if filter_param.matches(item)],
+                filter_param
+            )
+            self.assertEqual(
+                list(self.repo.iter_search(self.repo.SearchParams(filter=filter_param))),
+                result.items[:15]
+            )
+            self.assertEqual(self.repo.count(filter_param), result.total, filter_param)
+
+        self.assertEqual(self.repo.count(), 159)
+        self.assertEqual(self.repo.count('MOVIE'), 80)
+        self.assertTrue(self.repo.exists(items[5].unique_entity_id))
+        self.assertFalse(self.repo.exists(items[6].id))
+
+    def test_plan_filter_starts_from_the_most_selective_index(self):
+        items = [
+            Category(name=f'Movie {index}', created_at=datetime(2023, 1, 1, 0, 0, index))
+            for index in range(40)
+        ]
+        items[3].deactivate()
+        self.repo.insert_many(items)
+        self.repo.search(self.repo.SearchParams())
+
+        # 4 by created_at, 40 by name: the range is where it starts from
+        candidates = self.repo._plan_filter(CategoryFilter(  # pylint: disable=protected-access
+            name_contains='movie',
+            created_at_from=datetime(2023, 1, 1, 0, 0, 2),
+            created_at_to=datetime(2023, 1, 1, 0, 0, 5)
+        ))
+        self.assertEqual(candidates, items[2:6])
+
+        candidates = self.repo._plan_filter(  # pylint: disable=protected-access
+            CategoryFilter(name_contains='movie', is_active=False))
+        self.assertEqual(candidates, [items[3]])
+
+        # no index narrows it below plan_scan_ratio, the items are scanned
+        self.assertIsNone(self.repo._plan_filter(  # pylint: disable=protected-access
+            CategoryFilter(name_contains='movie', is_active=True)))
+        with patch.object(self.repo, '_plan_filter', return_value=None):
+            result = self.repo.search(self.repo.SearchParams(
+                filter=CategoryFilter(is_active=False)))
+        self.assertEqual(result.items, [items[3]])
+
+    def test_search_by_relevance(self):
+        items = [
+            Category(name='Drama', description='Filmes de ação e drama'),
+            Category(name='Ação', description='Filmes de ação'),
+            Category(name='Comedy', description='Comédias'),
+            Category(name='Ação e drama'),
+            Category(name='Ação'),
+        ]
+        self.repo.insert_many(items)
+
+        result = self.repo.search(self.repo.SearchParams(
+            filter='ACAO', sort='relevance', per_page=2))
+        self.assertEqual(result.items, [items[4], items[1]])
+        self.assertEqual(result.total, 4)
+        self.assertEqual(result.sort, 'relevance')
+
+        result = self.repo.search(self.repo.SearchParams(
+            filter='ACAO', sort='relevance', per_page=2, after=result.next_cursor))
+        self.assertEqual(result.items, [items[3], items[0]])
+        self.assertIsNone(result.next_cursor)
+
+        result = self.repo.search(self.repo.SearchParams(
+            filter='ACAO', sort='relevance', per_page=2, before=result.prev_cursor))
+        self.assertEqual(result.items, [items[4], items[1]])
+        self.assertIsNone(result.prev_cursor)
+
+        result = self.repo.search(self.repo.SearchParams(
+            filter='acao drama', sort='relevance', sort_dir='desc'))
+        self.assertEqual(result.items, [items[3], items[0]])
+
+        # writes change every score, a cursor still follows its entity
+        result = self.repo.search(self.repo.SearchParams(
+            filter='acao', sort='relevance', per_page=2))
+        self.repo.insert_many([Category(name=f'Movie {index}') for index in range(20)])
+        result = self.repo.search(self.repo.SearchParams(
+            filter='acao', sort='relevance', per_page=2, after=result.next_cursor))
+        self.assertEqual(result.items, [items[3], items[0]])
+        self.repo.delete_many([item.id for item in self.repo.items[len(items):]])
+
+        # the index follows writes, a full-text match may come from description
+        items[2].update(name='Comedy', description='Comédias de ação')
+        self.repo.update(items[2])
+        self.repo.delete(items[4].id)
+        result = self.repo.search(self.repo.SearchParams(
+            filter='ação', sort='relevance', page=2, per_page=2))
+        self.assertEqual(result.items, [items[2], items[0]])
+        self.assertEqual(result.total, 4)
+
+        # without a filter there is nothing to rank
+        result = self.repo.search(self.repo.SearchParams(sort='relevance'))
+        self.assertEqual(result.items, self.repo.items)
+
+    def test_iter_search(self):
+        items = [
+            Category(name='Movie'),
+            Category(name='TV movie'),
+            Category(name='Series'),
+            Category(name='movies'),
+        ]
+        self.repo.insert_many(items)
+
+        arrange = [
+            self.repo.SearchParams(filter='movie'),
+            self.repo.SearchParams(filter='mo', per_page=2, page=2),
+            self.repo.SearchParams(filter='movie', sort='name', sort_dir='desc'),
+            self.repo.SearchParams(filter='movie', sort='relevance', per_page=1, page=2),
+        ]
+
+        for params in arrange:
+            self.assertEqual(
+                list(self.repo.iter_search(params)),
+                self.repo.search(params).items,
+                f"The output using {params} is different"
+            )
+
+
+class TestJournaledCategoryRepository(unittest.TestCase):
+
+    def test_restart_restores_categories_without_validating_them(self):
+        categories = [
+            Category(name='Movie', created_at=datetime(2023, 1, 1)),
+            Category(name='Series', description='some description', is_active=False),
+            Category(name='Documentary'),
+        ]
+        with tempfile.TemporaryDirectory() as directory:
+            repo = JournaledCategoryRepository(
+                RepositoryJournal(directory, CategoryCodec(), snapshot_every=2))
+            repo.insert_many(categories[:2])
+            repo.insert(categories[2])
+            categories[0].update(name='Movie updated', description=None)
+            repo.update(categories[0])
+            repo.close()
+            with open(os.path.join(directory, 'snapshot.bin'), 'rb') as snapshot:
+                self.assertEqual(snapshot.read()[16:24], b'CATSNAP\x00')
+
+            with patch.object(Category, '_validate') as validate:
+                restored = JournaledCategoryRepository(
+                    RepositoryJournal(directory, CategoryCodec()))
+                validate.assert_not_called()
+
+            restored.close()
+
+        self.assertEqual(restored.find_all(), categories)
+        params = CategoryRepository.SearchParams(sort='name', filter='e')
+        self.assertEqual(
+            restored.search(params),
+            InMemoryCategoryRepository(items=list(categories)).search(params)
+        )
+
+
+class TestCachedCategoryRepository(unittest.TestCase):
+
+    backend: InMemoryCategoryRepository
+    repo: CachedCategoryRepository
+
+    def setUp(self) -> None:
+        self.backend = InMemoryCategoryRepository()
+        self.repo = CachedCategoryRepository(self.backend, max_entities=2)
+        self.categories = [
+            Category(name='Movie', created_at=datetime(2023, 1, 1)),
+            Category(name='Documentary', created_at=datetime(2023, 1, 2)),
+            Category(name='Movie classics', created_at=datetime(2023, 1, 3)),
+        ]
+        self.backend.insert_many(self.categories)
+
+    def test_find_by_id_is_read_through(self):
+        category = self.categories[0]
+        with patch.object(self.backend, 'find_by_id', wraps=self.backend.find_by_id) as find:
+            self.assertEqual(self.repo.find_by_id(category.id), category)
+            found = self.repo.find_by_id(category.unique_entity_id)
+
+        self.assertEqual(find.call_count, 1)
+        self.assertEqual(found, category)
+        self.assertIsNot(found, category)
+        with self.assertRaises(NotFoundException):
+            self.repo.find_by_id(UniqueEntityId())
+
+        for category in self.categories:
+            self.repo.find_by_id(category.id)
+        info = self.repo.entity_cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.size), (2, 4, 1, 2))
+        self.assertGreater(info.memory, 0)
+
+    def test_writes_only_drop_the_searches_they_can_change(self):
+        params = {
+            'all': CategoryRepository.SearchParams(per_page=2),
+            'movie': CategoryRepository.SearchParams(filter='movie'),
+            'doc': CategoryRepository.SearchParams(filter='doc'),
+            'doc by name': CategoryRepository.SearchParams(filter='doc', sort='name'),
+            'all page 2': CategoryRepository.SearchParams(per_page=2, page=2),
+        }
+
+        def refreshed():
+            # the searches the backend is asked for again after a write
+            with patch.object(self.backend, 'search', wraps=self.backend.search) as search:
+                results = {name: self.repo.search(value) for name, value in params.items()}
+            for name, value in params.items():
+                self.assertEqual(results[name], self.backend.search(value), name)
+            return {
+                name for name, value in params.items()
+                if any(call.args[0] is value for call in search.call_args_list)
+            }
+
+        self.assertEqual(refreshed(), set(params))
+        self.assertEqual(refreshed(), set())
+
+        self.repo.insert(Category(name='Doc shorts', created_at=datetime(2023, 1, 4)))
+        self.assertEqual(refreshed(), {'all', 'all page 2', 'doc', 'doc by name'})
+
+        # same name and created_at, only the page holding it changes
+        documentary = Category(
+            unique_entity_id=self.categories[1].unique_entity_id,
+            name='Documentary',
+            description='some description',
+            created_at=datetime(2023, 1, 2)
+        )
+        self.repo.update(documentary)
+        self.assertEqual(refreshed(), {'all', 'doc', 'doc by name'})
+
+        renamed = Category(
+            unique_entity_id=self.categories[2].unique_entity_id,
+            name='Classics',
+            created_at=datetime(2023, 1, 3)
+        )
+        self.repo.update(renamed)
+        self.assertEqual(refreshed(), {'all', 'all page 2', 'movie'})
+
+        self.repo.delete(self.categories[0].id)
+        self.assertEqual(refreshed(), {'all', 'all page 2', 'movie'})
+
+        self.repo.delete_many([documentary.id, '1'])
+        self.assertEqual(refreshed(), {'all', 'all page 2', 'doc', 'doc by name'})
+        info = self.repo.search_cache_info()
+        self.assertEqual((info.hits, info.size, info.evictions), (13, len(params), 0))
+        self.assertEqual(info.hit_ratio, info.hits / (info.hits + info.misses))
+
+
+    def test_caches_projected_searches_apart(self):
+        params = {
+            'entities': CategoryRepository.SearchParams(per_page=1),
+            'ids': CategoryRepository.SearchParams(per_page=1, fields='id,name'),
+            'names': CategoryRepository.SearchParams(per_page=1, fields='name'),
+        }
+        results = {name: self.repo.search(value) for name, value in params.items()}
+        self.assertEqual(results['entities'].items, [self.categories[0]])
+        self.assertEqual(results['ids'].items, [{'id': self.categories[0].id, 'name': 'Movie'}])
+        self.assertEqual(results['names'].items, [{'name': 'Movie'}])
+        self.assertGreater(self.repo.search_cache_info().memory, 0)
+
+        # an update in place off the first page keeps the pages holding ids,
+        # a page without them cannot tell whether it holds the entity
+        self.repo.update(Category(
+            unique_entity_id=self.categories[1].unique_entity_id,
+            name='Documentary',
+            description='some description',
+            created_at=datetime(2023, 1, 2)
+        ))
+        with patch.object(self.backend, 'search', wraps=self.backend.search) as search:
+            for value in params.values():
+                self.assertEqual(self.repo.search(value), self.backend.search(value))
+        self.assertEqual(search.call_count, len(params) + 1)
+
+    def test_updates_of_entities_changed_in_place(self):
+        params = {
+            'movie': CategoryRepository.SearchParams(filter='movie'),
+            'zzz': CategoryRepository.SearchParams(filter='zzz'),
+        }
+        for value in params.values():
+            self.repo.search(value)
+
+        # the in-memory backend hands out the entities it holds
+        category = self.repo.search(params['movie']).items[0]
+        category.update('zzz movie', None)
+        self.repo.update(category)
+        for value in params.values():
+            self.assertEqual(self.repo.search(value), self.backend.search(value))
+        self.assertEqual(self.repo.search(params['zzz']).items, [category])
+
+        # nothing cached held it before, so no page can be trusted
+        self.repo.search(params['zzz'])
+        found = self.backend.find_by_id(self.categories[1].id)
+        found.update('zzz documentary', None)
+        self.repo.update(found)
+        self.assertEqual(self.repo.search_cache_info().size, 0)
+        self.assertEqual(self.repo.search(params['zzz']).total, 2)
+
+    def test_bulk_writes_look_up_nothing_in_the_backend(self):
+        params = CategoryRepository.SearchParams(filter='doc')
+        described = Category(
+            unique_entity_id=self.categories[0].unique_entity_id,
+            name='Movie',
+            description='some description',
+            created_at=datetime(2023, 1, 1)
+        )
+        with patch.object(self.backend, 'find_by_id', wraps=self.backend.find_by_id) as find:
+            self.repo.update_many([described])
+            self.repo.search(CategoryRepository.SearchParams(filter='movie'))
+            self.repo.search(params)
+            self.repo.update_many([described])
+            self.assertEqual(self.repo.search_cache_info().size, 1)
+            self.repo.delete_many([self.categories[1].id, '1'])
+            self.assertEqual(self.repo.search_cache_info().size, 0)
+        find.assert_not_called()
+
+        # an entity no cached page holds may have been on any of them
+        self.repo.search(params)
+        self.repo.delete_many([self.categories[2].id])
+        self.assertEqual(self.repo.search_cache_info().size, 0)
+
+    def test_writes_drop_every_search_ranked_by_relevance(self):
+        params = CategoryRepository.SearchParams(filter='movie', sort='relevance')
+        self.repo.search(params)
+        self.repo.insert(Category(name='Documentary shorts'))
+
+        with patch.object(self.backend, 'search', wraps=self.backend.search) as search:
+            self.assertEqual(self.repo.search(params), self.backend.search(params))
+        self.assertEqual(search.call_count, 2)
+
+class TestAsyncCategoryRepositories(unittest.IsolatedAsyncioTestCase):
+
+    def test_throw_error_when_methods_not_implemented(self):
+        with self.assertRaises(TypeError) as assert_error:
+            # pylint: disable=abstract-class-instantiated
+            AsyncCategoryRepository()
+
+        self.assertEqual(
+            assert_error.exception.args[0],
+            "Can't instantiate abstract class AsyncCategoryRepository with "+
+            "abstract methods delete, find_all, find_by_id, insert, search, update"
+        )
+
+    async def test_search_matches_the_sync_repository(self):
+        sync_repo = InMemoryCategoryRepository()
+        categories = [
+            Category(name=name, created_at=datetime(2023, 1, 1 + day))
+            for day, name in enumerate(['b', 'a', 'AC', 'c', 'ab', 'Ba'])
+        ]
+        sync_repo.insert_many(categories)
+        async_repo = AsyncInMemoryCategoryRepository()
+        await async_repo.insert_many(categories)
+        threaded_repo = ThreadedCategoryRepository(sync_repo)
+
+        self.assertEqual(
+            async_repo.sortable_fields, InMemoryCategoryRepository.sortable_fields)
+        arrange = [
+            CategoryRepository.SearchParams(),
+            CategoryRepository.SearchParams(per_page=2, sort='name', sort_dir='desc'),
+            CategoryRepository.SearchParams(page=2, per_page=2, filter='a'),
+        ]
+
+        for params in arrange:
+            expected = sync_repo.search(params)
+            self.assertEqual(await async_repo.search(params), expected)
+            self.assertEqual(await threaded_repo.search(params), expected)
+
+        self.assertEqual(await threaded_repo.find_by_id(categories[2].id), categories[2])
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from category.domain.entities import Category
+from category.infra.snapshot import FORMAT_VERSION, CategorySnapshot, write_category_snapshot
+
+
+class TestCategorySnapshot(unittest.TestCase):
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'categories.snapshot')
+
+    def write(self, categories) -> int:
+        with open(self.path, 'wb') as file:
+            return write_category_snapshot(file, categories)
+
+    def test_round_trip(self):
+        categories = [
+            Category(name='Movie'),
+            Category(
+                name='Série',
+                description='some description',
+                is_active=False,
+                created_at=datetime(
+                    2023, 6, 18, 1, 0, 0, 5, tzinfo=timezone(timedelta(hours=-3)))
+            ),
+            Category(name='Documentary', description=''),
+            *[Category(name=f'Kids {index}', is_active=index % 3 == 0) for index in range(10)],
+            Category(name='Old', created_at=datetime(1900, 1, 1, tzinfo=timezone.utc)),
+        ]
+        size = self.write(categories)
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertEqual(size % 8, 0)
+
+        with patch.object(Category, '_validate') as validate, \
+                CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), len(categories))
+            self.assertEqual(list(snapshot), categories)
+            self.assertEqual(snapshot[-1], categories[-1])
+            self.assertEqual(snapshot[1].created_at.utcoffset(), timedelta(hours=-3))
+            self.assertIsNone(snapshot[0].created_at.tzinfo)
+            self.assertIsNone(snapshot[0].description)
+            self.assertEqual(snapshot[2].description, '')
+            with self.assertRaises(IndexError):
+                snapshot[len(categories)]  # pylint: disable=pointless-statement
+            validate.assert_not_called()
+
+    def test_empty_snapshot(self):
+        self.write([])
+        with CategorySnapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 0)
+            self.assertEqual(list(snapshot), [])
+
+    def test_rejects_unknown_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'{"items": []}' * 4)
+        with self.assertRaises(ValueError):
+            CategorySnapshot(self.path)
+
+        buffer = io.BytesIO()
+        write_category_snapshot(buffer, [Category(name='Movie')])
+        data = bytearray(buffer.getvalue())
+        data[8] = FORMAT_VERSION + 1
+        with open(self.path, 'wb') as file:
+            file.write(data)
+        with self.assertRaises(ValueError) as assert_error:
+            CategorySnapshot(self.path)
+        self.assertEqual(
+            assert_error.exception.args[0],
+            f'Unsupported category snapshot version {FORMAT_VERSION + 1}'
+        )
+
+        with open(self.path, 'wb') as file:
+            file.write(buffer.getvalue()[:-8])
+        with self.assertRaises(ValueError):
+            CategorySnapshot(self.path)
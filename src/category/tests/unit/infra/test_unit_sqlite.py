@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import os
+import tempfile
+import unittest
+from category.domain.entities import Category
+from category.infra.sqlite import SQLiteCategoryRepository
+from category.tests.behaviors import CategoryRepositoryBehaviorMixin
+
+
+class TestSQLiteCategoryRepository(CategoryRepositoryBehaviorMixin, unittest.TestCase):
+
+    repo: SQLiteCategoryRepository
+    created_at = datetime(2023, 6, 18, 1, 0, 0, 5, tzinfo=timezone(timedelta(hours=-3)))
+
+    def setUp(self) -> None:
+        self.repo = SQLiteCategoryRepository()
+
+    def tearDown(self) -> None:
+        self.repo.close()
+
+    def test_file_database_uses_wal_and_a_connection_per_thread(self):
+        with tempfile.TemporaryDirectory() as directory:
+            repo = SQLiteCategoryRepository(os.path.join(directory, 'categories.db'))
+            try:
+                entity = Category(name='Movie')
+                repo.insert(entity)
+                # pylint: disable=protected-access
+                connection = repo._pool.connection()
+                self.assertEqual(
+                    connection.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    found = list(executor.map(lambda _: repo.find_by_id(entity.id), range(4)))
+                    connections = set(executor.map(
+                        lambda _: id(repo._pool.connection()), range(4)))
+
+                self.assertEqual(found, [entity] * 4)
+                self.assertNotIn(id(connection), connections)
+                self.assertEqual(repo.find_all(), [entity])
+            finally:
+                repo.close()
+
+            reopened = SQLiteCategoryRepository(os.path.join(directory, 'categories.db'))
+            self.assertEqual(reopened.find_all(), [entity])
+            reopened.close()
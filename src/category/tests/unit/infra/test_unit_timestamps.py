@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta, timezone
+import unittest
+from category.infra.timestamps import from_micros, to_micros, utc_offset
+
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_round_trip_keeps_the_offset(self):
+        for value in [
+                datetime(2023, 6, 18, 1, 0, 0, 5),
+                datetime(2023, 6, 18, 1, 0, 0, 5, tzinfo=timezone.utc),
+                datetime(1969, 12, 31, 23, 0, tzinfo=timezone(timedelta(hours=-3))),
+                datetime(2023, 6, 18, 1, 0, tzinfo=timezone(timedelta(hours=5, minutes=30)))]:
+            restored = from_micros(to_micros(value), utc_offset(value))
+            self.assertEqual(restored, value)
+            self.assertEqual(restored.utcoffset(), value.utcoffset())
+
+        self.assertEqual(to_micros(datetime(1970, 1, 1, 0, 0, 1)), 1_000_000)
+        self.assertEqual(
+            to_micros(datetime(1970, 1, 1, 1, tzinfo=timezone(timedelta(hours=1)))), 0)
+        self.assertIsNone(utc_offset(datetime(2023, 1, 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+from pathlib import Path
+import os
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-change-me')
+
+DEBUG = os.environ.get('DJANGO_DEBUG', '') == '1'
+
+INSTALLED_APPS = [
+    'category.infra.django_app',
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+    }
+}
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+USE_I18N = False
+
+# entities are created with naive datetimes
+USE_TZ = False